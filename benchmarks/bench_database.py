@@ -0,0 +1,198 @@
+"""Veritabanı yazma hızını eski save_to_database ile toplu yazıcı arasında karşılaştırır.
+
+Sentetik ilanlar geçici bir dizindeki veritabanlarına yazılır.
+Kullanım: python benchmarks/bench_database.py --announcements 20000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_engine.database import DatabaseWriter  # noqa: E402
+
+
+def make_announcements(count):
+    announcements = []
+    for i in range(count):
+        data = {
+            'city': 'İSTANBUL',
+            'ilan_sira_no': str(100000 + i),
+            'mersis_no': f"{i:016d}",
+            'ticaret_sicil_no': str(500000 + i),
+            'ticaret_unvani': f"ÖRNEK {i} İNŞAAT SANAYİ VE TİCARET LİMİTED ŞİRKETİ",
+            'adres': 'Merkez Mah. Cumhuriyet Cad. No:5 Şişli / İstanbul',
+            'tescil_edilen_hususlar': 'PAY DEVRİ',
+            'tescile_delil_olan_belgeler': 'Genel Kurul Kararı',
+            'details': 'Şirket ortaklarından pay devri yapılmıştır. ' * 20,
+            'persons': [
+                {'kimlik_no': "123****45 Kimlik No'lu", 'isim': f'KİŞİ {i} {j}', 'adres': 'İSTANBUL / ŞİŞLİ'}
+                for j in range(3)
+            ],
+        }
+        if i % 10 == 0:
+            data['konkordato'] = {'baslangic_tarihi': '01.02.2024', 'bitis_tarihi': '01.05.2024'}
+        announcements.append(data)
+    return announcements
+
+
+def legacy_save_to_database(parsed_announcements, db_path):
+    """Önceki save_to_database: her satır için ayrı execute, varsayılan günlük ayarları."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Tablo oluşturma
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS companies (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mersis_no TEXT,
+        ticaret_sicil_no TEXT,
+        ticaret_unvani TEXT,
+        adres TEXT,
+        city TEXT
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS announcements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id INTEGER,
+        ilan_sira_no TEXT,
+        tescil_edilen_hususlar TEXT,
+        tescile_delil_olan_belgeler TEXT,
+        details_text TEXT,
+        FOREIGN KEY(company_id) REFERENCES companies(id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS persons (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id INTEGER,
+        kimlik_no TEXT,
+        isim TEXT,
+        adres TEXT,
+        FOREIGN KEY(company_id) REFERENCES companies(id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS konkordato (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id INTEGER,
+        mahkeme_karari_tarihi TEXT,
+        baslangic_tarihi TEXT,
+        bitis_tarihi TEXT,
+        komiser_kimlik_no TEXT,
+        komiser_adres TEXT,
+        komiser_adi TEXT,
+        komiser_gorev_bitis_tarihi TEXT,
+        FOREIGN KEY(company_id) REFERENCES companies(id)
+    )
+    ''')
+
+    for data in parsed_announcements:
+        # Şirketi kaydet
+        cursor.execute('''
+        INSERT INTO companies (mersis_no, ticaret_sicil_no, ticaret_unvani, adres, city)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (
+            data.get('mersis_no'),
+            data.get('ticaret_sicil_no'),
+            data.get('ticaret_unvani'),
+            data.get('adres'),
+            data.get('city')
+        ))
+        company_id = cursor.lastrowid
+
+        # İlanı kaydet
+        cursor.execute('''
+        INSERT INTO announcements (company_id, ilan_sira_no, tescil_edilen_hususlar, tescile_delil_olan_belgeler, details_text)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (
+            company_id,
+            data.get('ilan_sira_no'),
+            data.get('tescil_edilen_hususlar'),
+            data.get('tescile_delil_olan_belgeler'),
+            data.get('details')
+        ))
+
+        # Şahısları kaydet
+        if 'persons' in data:
+            for person in data['persons']:
+                cursor.execute('''
+                INSERT INTO persons (company_id, kimlik_no, isim, adres)
+                VALUES (?, ?, ?, ?)
+                ''', (
+                    company_id,
+                    person.get('kimlik_no'),
+                    person.get('isim'),
+                    person.get('adres')
+                ))
+
+        # Konkordato detaylarını kaydet
+        if 'konkordato' in data:
+            konkordato = data['konkordato']
+            cursor.execute('''
+            INSERT INTO konkordato (company_id, mahkeme_karari_tarihi, baslangic_tarihi, bitis_tarihi, komiser_kimlik_no, komiser_adres, komiser_adi, komiser_gorev_bitis_tarihi)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                company_id,
+                konkordato.get('mahkeme_karari_tarihi'),
+                konkordato.get('baslangic_tarihi'),
+                konkordato.get('bitis_tarihi'),
+                konkordato.get('komiser_kimlik_no'),
+                konkordato.get('komiser_adres'),
+                konkordato.get('komiser_adi'),
+                konkordato.get('komiser_gorev_bitis_tarihi')
+            ))
+
+    conn.commit()
+    conn.close()
+
+
+def count_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = sum(conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+               for table in ('companies', 'announcements', 'persons', 'konkordato'))
+    conn.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--announcements', type=int, default=20000)
+    parser.add_argument('--per-call', type=int, default=50,
+                        help="Tek çağrıda yazılan ilan sayısı (bir PDF'in bir sayfası gibi)")
+    args = parser.parse_args()
+
+    announcements = make_announcements(args.announcements)
+    chunks = [announcements[i:i + args.per_call] for i in range(0, len(announcements), args.per_call)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = os.path.join(tmp_dir, 'legacy.db')
+        start = time.perf_counter()
+        for chunk in chunks:
+            legacy_save_to_database(chunk, legacy_path)
+        legacy_time = time.perf_counter() - start
+        legacy_rows = count_rows(legacy_path)
+
+        writer_path = os.path.join(tmp_dir, 'writer.db')
+        start = time.perf_counter()
+        writer = DatabaseWriter(writer_path)
+        writer.start()
+        for chunk in chunks:
+            writer.put(chunk)
+        writer.close()
+        writer_time = time.perf_counter() - start
+        writer_rows = count_rows(writer_path)
+
+    print(f"eski:    {legacy_rows} satır, {legacy_time:.2f} sn ({legacy_rows / legacy_time:.0f} satır/sn)")
+    print(f"yazıcı:  {writer_rows} satır, {writer_time:.2f} sn ({writer_rows / writer_time:.0f} satır/sn)")
+    print(f"hızlanma: {legacy_time / writer_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
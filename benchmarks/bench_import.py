@@ -0,0 +1,157 @@
+"""Motor modüllerinin içe aktarma süresi ve süreç havuzunda işçi başlatma süresi ölçümü.
+
+Her modül ayrı, yeni bir Python yorumlayıcısında ``-X importtime`` ile
+içe aktarılır ve en iyi ``--repeat`` ölçümü alınır; en pahalı alt
+modüller listelenir. İşçi başlatma, yeni bir ProcessPoolExecutor'ın
+(``spawn`` ve varsa ``fork``) ilk işi ``batch.process_chunk``'ın bulunduğu
+modülü yükleyip döndürene kadar geçen süredir; boş bir işçinin başlatma
+süresi de ölçülür, aradaki fark motorun payıdır. ``spawn`` işçisinin yüklediği
+ağır modüller (NumPy dahil) de raporlanır (``fork`` işçisi ana sürecin
+modüllerini devralır). ``spawn``'da motorun payı ``--spawn-target-ms``
+hedefini (onlarca ms; ilk ölçümde başlatma 188 ms idi) ya da herhangi bir
+yöntemde başlatma ``--budget-ms`` sınırını aşarsa çıkış kodu 1 olur; CI'da
+başlangıç süresinin gerilemesini yakalamak için.
+
+Kullanım: python benchmarks/bench_import.py --repeat 5 --budget-ms 100
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODULES = ('ocr_engine', 'ocr_engine.parser', 'ocr_engine.database', 'ocr_engine.batch',
+           'ocr_engine.convert', 'ocr_engine.__main__')
+# İçe aktarılmaması gereken ağır modüller; motor modüllerinden biri bunları yüklerse raporlanır
+HEAVY_MODULES = ('cv2', 'pdf2image', 'pytesseract', 'tesserocr', 'spacy', 'PyQt5', 'torch')
+# İşçi süreç başlatmada yüklenmemesi gerekenler; NumPy ilk sayfa işlenirken yüklenir
+WORKER_HEAVY_MODULES = HEAVY_MODULES + ('numpy',)
+SPAWN_TARGET_MS = 40
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_time(module):
+    """Modülü yeni bir yorumlayıcıda içe aktarır; toplam süreyi (ms) ve alt modül sürelerini döndürür."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stderr
+    cumulative = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2)) / 1000
+    return cumulative.get(module, 0.0), cumulative
+
+
+def _load_worker_module():
+    from ocr_engine import batch  # noqa: F401
+    return sorted(name for name in sys.modules if name in WORKER_HEAVY_MODULES)
+
+
+def _empty_worker():
+    return []
+
+
+def worker_spinup(method, function=_load_worker_module):
+    """Yeni bir havuzun ilk işi tamamlayana kadar geçen süreyi (ms) ve işçide yüklü ağır modülleri döndürür.
+
+    ``spawn`` işçisi bu betiği ``__mp_main__`` olarak yeniden içe aktarır;
+    betiğin kendi bağımlılıkları (ör. bench_pipeline üzerinden NumPy) bu
+    yüzden ``main`` içinde içe aktarılır, ölçüme karışmaz.
+    """
+    context = multiprocessing.get_context(method)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        heavy = pool.submit(function).result()
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000, heavy
+
+
+def main():
+    from benchmarks.bench_pipeline import RESULTS_DIR, git_revision
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="Her ölçümün tekrar sayısı (en iyisi alınır)")
+    parser.add_argument('--top', type=int, default=8, help="Modül başına listelenen en pahalı alt modül sayısı")
+    parser.add_argument('--budget-ms', type=float, help="İşçi başlatma için üst sınır (ms); aşılırsa çıkış kodu 1")
+    parser.add_argument('--spawn-target-ms', type=float, default=SPAWN_TARGET_MS,
+                        help=f"spawn işçi başlatmada motor payı hedefi (ms, varsayılan: {SPAWN_TARGET_MS}); "
+                             f"aşılırsa çıkış kodu 1")
+    parser.add_argument('--output', help=f"Sonuç JSON dosyası (varsayılan: {RESULTS_DIR}/import_<commit>.json)")
+    args = parser.parse_args()
+
+    imports = {}
+    for module in MODULES:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        best, cumulative = min(runs, key=lambda run: run[0])
+        heavy = sorted(name for name in cumulative if name.split('.')[0] in HEAVY_MODULES)
+        children = sorted(((name, ms) for name, ms in cumulative.items() if name != module),
+                          key=lambda item: -item[1])[:args.top]
+        imports[module] = {'ms': round(best, 2), 'heavy_modules': heavy,
+                           'slowest': {name: round(ms, 2) for name, ms in children}}
+        print(f"{module:<24} {best:8.1f} ms" + (f"  AĞIR: {', '.join(heavy)}" if heavy else ""))
+        for name, ms in children:
+            print(f"    {name:<40} {ms:8.1f} ms")
+
+    methods = [method for method in ('spawn', 'fork') if method in multiprocessing.get_all_start_methods()]
+    spinup = {}
+    engine_share = {}
+    worker_heavy = {}
+    for method in methods:
+        runs = [worker_spinup(method) for _ in range(args.repeat)]
+        empty = min(worker_spinup(method, _empty_worker)[0] for _ in range(args.repeat))
+        spinup[method] = round(min(ms for ms, _ in runs), 2)
+        engine_share[method] = round(max(spinup[method] - empty, 0.0), 2)
+        if method == 'spawn':
+            worker_heavy[method] = sorted({name for _, heavy in runs for name in heavy})
+        target = f", hedef: {args.spawn_target_ms:.0f} ms" if method == 'spawn' else ""
+        print(f"İşçi başlatma ({method}): {spinup[method]:.1f} ms (boş işçi {empty:.1f} ms, "
+              f"motor payı {engine_share[method]:.1f} ms{target})"
+              + (f"  AĞIR: {', '.join(worker_heavy[method])}" if worker_heavy.get(method) else ""))
+
+    commit, dirty = git_revision()
+    result = {
+        'benchmark': 'import',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': commit,
+        'git_dirty': dirty,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'imports': imports,
+        'worker_spinup_ms': spinup,
+        'worker_engine_ms': engine_share,
+        'spawn_target_ms': args.spawn_target_ms,
+        'worker_heavy_modules': worker_heavy,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"import_{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar yazıldı: {output}")
+
+    if args.budget_ms is not None and max(spinup.values(), default=0.0) > args.budget_ms:
+        print(f"İşçi başlatma {args.budget_ms:.0f} ms sınırını aştı", file=sys.stderr)
+        return 1
+    if engine_share.get('spawn', 0.0) > args.spawn_target_ms:
+        print(f"spawn işçi başlatmada motorun payı {args.spawn_target_ms:.0f} ms hedefini aştı", file=sys.stderr)
+        return 1
+    if worker_heavy.get('spawn'):
+        print("İşçi süreç başlatılırken ağır bir modül yükleniyor", file=sys.stderr)
+        return 1
+    if any(values['heavy_modules'] for values in imports.values()):
+        print("Motor modüllerinden biri ağır bir bağımlılığı içe aktarma anında yüklüyor", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""OCR arka uçlarını aynı sütun görüntüleri üzerinde karşılaştırır.
+
+Kullanım: python benchmarks/bench_ocr_backends.py gazete.pdf --pages 5
+"""
+import argparse
+import difflib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_engine.ocr import clean_text, get_backend  # noqa: E402
+from ocr_engine.pages import iter_pages, split_into_columns, threshold_page  # noqa: E402
+
+
+def load_columns(pdf_path, page_count):
+    """İlk sayfaları bir kez görüntüleyip threshold uygulanmış sütunları döndürür."""
+    columns = []
+    for _, image in iter_pages(pdf_path, range(page_count)):
+        columns.extend(split_into_columns(threshold_page(image)))
+    return columns
+
+
+def bench_backend(engine, columns, lang):
+    start = time.perf_counter()
+    backend = get_backend(engine, lang)
+    load_time = time.perf_counter() - start
+    texts = []
+    start = time.perf_counter()
+    for col in columns:
+        texts.append(clean_text(backend.image_to_string(col)))
+    return load_time, time.perf_counter() - start, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('pdf_path')
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--lang', default='tur')
+    args = parser.parse_args()
+
+    columns = load_columns(args.pdf_path, args.pages)
+    print(f"{args.pages} sayfa, {len(columns)} sütun")
+
+    results = {}
+    for engine in ('pytesseract', 'tesserocr'):
+        try:
+            load_time, ocr_time, texts = bench_backend(engine, columns, args.lang)
+        except ImportError as e:
+            print(f"{engine}: atlandı ({e})")
+            continue
+        results[engine] = texts
+        print(f"{engine}: yükleme {load_time * 1000:.0f} ms, OCR {ocr_time:.2f} sn "
+              f"({ocr_time / len(columns) * 1000:.0f} ms/sütun, {args.pages / ocr_time:.2f} sayfa/sn)")
+
+    if len(results) == 2:
+        ratio = difflib.SequenceMatcher(None, "".join(results['pytesseract']), "".join(results['tesserocr'])).ratio()
+        print(f"Çıktı benzerliği: %{ratio * 100:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+"""Tek geçişli alan çıkarıcıyı (ocr_engine.parser) eski alan başına regex
+ayrıştırıcısıyla gerçek OCR çıktısı üzerinde karşılaştırır.
+
+Kullanım: python benchmarks/bench_parser.py gazete_ocr_results.txt [...] --repeat 5
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_engine import parser  # noqa: E402
+
+
+class LegacyParser:
+    """PDFConverterThread'in önceki, her alan için ayrı re.search yapan ayrıştırıcısı."""
+
+    def split_announcements(self, text):
+        """Metni ilanlara böler."""
+        pattern = r"(?:T\.C\.|TC)[ ]?.+?T[İI]CARET S[İI]C[İI]L[İI] M[ÜU]D[ÜU]RL[ÜU][ĞG][ÜU]['’]?[N]?[D]?EN"
+        matches = list(re.finditer(pattern, text, re.DOTALL | re.IGNORECASE))
+        announcements = []
+        for i in range(len(matches)):
+            start = matches[i].start()
+            if i + 1 < len(matches):
+                end = matches[i + 1].start()
+            else:
+                end = len(text)
+            announcement_text = text[start:end].strip()
+            announcements.append(announcement_text)
+        return announcements
+
+    def parse_announcement(self, announcement_text):
+        """Her ilandan verileri çıkarır."""
+        data = {}
+
+        # Şehir
+        city_match = re.search(
+            r"(?:T\.C\.|TC)[ ]?(.+?)\s+T[İI][CÇ]ARET S[İI]C[İI]L[İI]\s+M[ÜU][DÐ][ÜU]RL[ÜU][ĞG][ÜU]['’]?[N]?[D]?EN",
+            announcement_text,
+            re.DOTALL | re.IGNORECASE
+        )
+        if city_match:
+            data['city'] = city_match.group(1).strip()
+
+        # İlan Sıra No
+        ilan_no_match = re.search(
+            r"İlan Sıra No\s*[:：]?\s*(\d+)",
+            announcement_text,
+            re.IGNORECASE
+        )
+        if ilan_no_match:
+            data['ilan_sira_no'] = ilan_no_match.group(1).strip()
+
+        # MERSİS No
+        mersis_no_match = re.search(
+            r"MERS[İI]S No\s*[:：]?\s*(\d+)",
+            announcement_text,
+            re.IGNORECASE
+        )
+        if mersis_no_match:
+            data['mersis_no'] = mersis_no_match.group(1).strip()
+
+        # Ticaret Sicil / Dosya No
+        ticaret_sicil_no_match = re.search(
+            r"Ticaret Sicil[ / Dosya]* No\s*[:：]?\s*(.+)",
+            announcement_text,
+            re.IGNORECASE
+        )
+        if ticaret_sicil_no_match:
+            data['ticaret_sicil_no'] = ticaret_sicil_no_match.group(1).strip()
+
+        # Ticaret Unvanı
+        ticaret_unvani_match = re.search(
+            r"Ticaret Unvan[ıi]\s*[:：]?\s*(.*?)(?:\n|$)([A-ZİĞÜŞÖÇ].+)",
+            announcement_text,
+            re.IGNORECASE
+        )
+        if ticaret_unvani_match:
+            first_line = ticaret_unvani_match.group(1).strip()
+            second_line = ticaret_unvani_match.group(2).strip()
+            if first_line:
+                data['ticaret_unvani'] = f"{first_line} {second_line}".strip()
+            else:
+                data['ticaret_unvani'] = second_line
+        else:
+            # Alternatif olarak, sadece bir satır sonraki ifadeyi al
+            ticaret_unvani_match = re.search(
+                r"Ticaret Unvan[ıi]\s*[:：]?\s*(.+)",
+                announcement_text,
+                re.IGNORECASE
+            )
+            if ticaret_unvani_match:
+                data['ticaret_unvani'] = ticaret_unvani_match.group(1).strip()
+
+        # Adres
+        adres_match = re.search(
+            r"Adres\s*[:：]?\s*(.+?)(?=\n\n|Yukarıda|Tescil Edilen Hususlar|$)",
+            announcement_text,
+            re.DOTALL | re.IGNORECASE
+        )
+        if adres_match:
+            data['adres'] = adres_match.group(1).strip()
+
+        # Tescil Edilen Hususlar
+        tescil_hususlar_match = re.search(
+            r"Tescil Edilen Hususlar\s*[:：]?\s*(.+?)(?:\n|$)",
+            announcement_text,
+            re.IGNORECASE
+        )
+        if tescil_hususlar_match:
+            data['tescil_edilen_hususlar'] = tescil_hususlar_match.group(1).strip()
+
+        # Tescile Delil Olan Belgeler
+        tescil_belgeler_match = re.search(
+            r"Tescile Delil Olan Belgeler\s*[:：]?\s*(.+?)(?=\n|$)",
+            announcement_text,
+            re.DOTALL | re.IGNORECASE
+        )
+        if tescil_belgeler_match:
+            data['tescile_delil_olan_belgeler'] = tescil_belgeler_match.group(1).strip()
+
+        # Detaylar
+        details_match = re.search(
+            r"(?:Tescil Edilen Hususlar.*?)(?:\n\n|\n)(.+)",
+            announcement_text,
+            re.DOTALL | re.IGNORECASE
+        )
+        if details_match:
+            data['details'] = details_match.group(1).strip()
+        else:
+            data['details'] = ''
+
+        # Şahıs Bilgilerini Çıkar
+        data['persons'] = self.parse_persons(announcement_text)
+
+        # Şirket ile ilgili maskelenmiş kimlik numarası ve ad-soyad varsa, bunları da persons'a ekle
+        company_persons = self.extract_company_persons(announcement_text)
+        if company_persons:
+            if 'persons' not in data:
+                data['persons'] = []
+            data['persons'].extend(company_persons)
+
+        # Özel durumlar için detaylı parça alma
+        if 'KONKORDATO' in announcement_text.upper():
+            data['konkordato'] = self.parse_konkordato_details(announcement_text)
+
+        if 'PAY DEVRİ' in announcement_text.upper():
+            data['pay_devri'] = self.parse_pay_devri_details(announcement_text)
+
+        return data
+
+    def parse_persons(self, announcement_text):
+        """Şahısların kimlik numaraları, isimleri ve adreslerini çıkarır."""
+        persons = []
+
+        # Regex deseni
+        pattern = r"Türkiye Cumhuriyeti Uyruklu\s+(\d{3}\*{4,6}\d{2,3} Kimlik No'lu),?\s*([A-ZÇŞĞÜÖİ\s/]+) adresinde ikamet eden,?\s*([A-ZÇŞĞÜÖİ\s']+)"
+        matches = re.findall(pattern, announcement_text, re.DOTALL | re.IGNORECASE)
+        for match in matches:
+            person_data = {
+                'kimlik_no': match[0].strip(),
+                'adres': match[1].strip(),
+                'isim': match[2].strip()
+            }
+            persons.append(person_data)
+
+        return persons
+
+    def extract_company_persons(self, announcement_text):
+        """Şirket ile ilgili maskelenmiş kimlik numarası ve ad-soyad bilgilerini çıkarır."""
+        persons = []
+
+        # Yönetim kurulu üyeleri ve diğer yetkilileri yakalamak için regex
+        pattern = r"(\d{3}\*{4,6}\d{2,3} Kimlik No'lu),?\s*([A-ZÇŞĞÜÖİ\s/]+) adresinde ikamet eden,?\s*([A-ZÇŞĞÜÖİ\s']+)"
+        matches = re.findall(pattern, announcement_text, re.DOTALL | re.IGNORECASE)
+        for match in matches:
+            person_data = {
+                'kimlik_no': match[0].strip(),
+                'adres': match[1].strip(),
+                'isim': match[2].strip()
+            }
+            persons.append(person_data)
+
+        # Ayrıca, 'Kimlik Numaralı' ifadesiyle verilen kişileri yakala
+        pattern2 = r"(\d{3}\*{4,6}\d{2,3} Kimlik Numaralı)\s+([A-ZÇŞĞÜÖİ\s']+) (\d[\d\.,]+ TL) sermaye karşılığı (\d+) adet payını hukuki ve mali yükümlülükleri ile (\d{3}\*{4,6}\d{2,3} Kimlik Numaralı) ([A-ZÇŞĞÜÖİ\s']+)'e devretmiştir"
+        matches2 = re.findall(pattern2, announcement_text, re.DOTALL | re.IGNORECASE)
+        for match in matches2:
+            person_data = {
+                'kimlik_no': match[0].strip(),
+                'isim': match[1].strip(),
+                'adres': ''
+            }
+            persons.append(person_data)
+
+        return persons
+
+    def parse_konkordato_details(self, announcement_text):
+        data = {}
+        # Mahkeme Kararı Tarihi
+        mahkeme_karari_tarihi_match = re.search(
+            r"\d+\. ASL[İI]YE HUKUK MAHKEMES[İI]'n[ıi]n (\d{1,2}\.\d{1,2}\.\d{4}) tarihli karar[ıi] ile",
+            announcement_text,
+            re.IGNORECASE
+        )
+        if mahkeme_karari_tarihi_match:
+            data['mahkeme_karari_tarihi'] = mahkeme_karari_tarihi_match.group(1)
+
+        # Başlangıç Tarihi
+        baslangic_tarihi_match = re.search(
+            r"Başlangıç Tarihi\s*[:：]?\s*(.+)",
+            announcement_text,
+            re.IGNORECASE
+        )
+        if baslangic_tarihi_match:
+            data['baslangic_tarihi'] = baslangic_tarihi_match.group(1).strip()
+
+        # Bitiş Tarihi
+        bitis_tarihi_match = re.search(
+            r"Bitiş Tarihi\s*[:：]?\s*(.+)",
+            announcement_text,
+            re.IGNORECASE
+        )
+        if bitis_tarihi_match:
+            data['bitis_tarihi'] = bitis_tarihi_match.group(1).strip()
+
+        # Konkordato Komiseri
+        komiser_match = re.search(
+            r"(\d{3}\*{4,6}\d{2,3} Kimlik No'lu),?\s*([A-ZÇŞĞÜÖİ\s/]+) adresinde ikamet eden,?\s*([A-ZÇŞĞÜÖİ\s']+);\s*(\d{1,2}\.\d{1,2}\.\d{4}) tarihine kadar Konkordato Komiseri olarak atanmıştır",
+            announcement_text,
+            re.DOTALL | re.IGNORECASE
+        )
+        if komiser_match:
+            data['komiser_kimlik_no'] = komiser_match.group(1).strip()
+            data['komiser_adres'] = komiser_match.group(2).strip()
+            data['komiser_adi'] = komiser_match.group(3).strip()
+            data['komiser_gorev_bitis_tarihi'] = komiser_match.group(4).strip()
+
+            # Konkordato komiserini persons listesine ekle
+            data.setdefault('persons', []).append({
+                'kimlik_no': data['komiser_kimlik_no'],
+                'isim': data['komiser_adi'],
+                'adres': data['komiser_adres']
+            })
+
+        return data
+
+    def parse_pay_devri_details(self, announcement_text):
+        data = {}
+
+        # Devir İşlemi
+        devir_eden_match = re.search(
+            r"Şirket Ortaklarından (\d{3}\*{4,6}\d{2,3} Kimlik Numaralı) ([A-ZÇŞĞÜÖİ\s']+) (\d[\d\.,]+ TL) sermaye karşılığı (\d+) adet payını hukuki ve mali yükümlülükleri ile (\d{3}\*{4,6}\d{2,3} Kimlik Numaralı) ([A-ZÇŞĞÜÖİ\s']+)'e devretmiştir",
+            announcement_text,
+            re.DOTALL | re.IGNORECASE
+        )
+        if devir_eden_match:
+            data['devir_eden_kimlik_no'] = devir_eden_match.group(1).strip()
+            data['devir_eden_adi'] = devir_eden_match.group(2).strip()
+            data['devredilen_tutar'] = devir_eden_match.group(3)
+            data['devredilen_pay_adedi'] = devir_eden_match.group(4)
+            data['devir_alici_kimlik_no'] = devir_eden_match.group(5).strip()
+            data['devir_alici_adi'] = devir_eden_match.group(6).strip()
+
+            # Devir eden ve alan kişileri persons tablosuna ekle
+            data.setdefault('persons', []).extend([
+                {
+                    'kimlik_no': data['devir_eden_kimlik_no'],
+                    'isim': data['devir_eden_adi'],
+                    'adres': ''
+                },
+                {
+                    'kimlik_no': data['devir_alici_kimlik_no'],
+                    'isim': data['devir_alici_adi'],
+                    'adres': ''
+                }
+            ])
+
+        # Yeni Ortaklık Yapısı
+        shareholding_matches = re.findall(
+            r"([A-ZÇŞĞÜÖİ\s']+)\s*:\s*Beheri ([\d\.,]+) Türk Lirası değerinde (\d+) adet paya karşılık gelen ([\d\.,]+) Türk Lirası",
+            announcement_text,
+            re.DOTALL | re.IGNORECASE
+        )
+        shareholders = []
+        for match in shareholding_matches:
+            shareholder = {
+                'adi': match[0].strip(),
+                'beher_pay_degeri': match[1],
+                'pay_adedi': match[2],
+                'toplam_tutar': match[3]
+            }
+            shareholders.append(shareholder)
+            # Ortakları persons tablosuna ekle
+            data.setdefault('persons', []).append({
+                'kimlik_no': '',  # Kimlik numarası yoksa boş bırakıyoruz
+                'isim': shareholder['adi'],
+                'adres': ''
+            })
+        data['shareholders'] = shareholders
+
+        return data
+
+
+def bench(parse_announcement, announcements, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [parse_announcement(announcement) for announcement in announcements]
+    return time.perf_counter() - start, results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('paths', nargs='+', help="_ocr_results.txt dosyaları")
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    text = ""
+    for path in args.paths:
+        with open(path, encoding='utf-8') as f:
+            text += f.read()
+    announcements = parser.split_announcements(text)
+    count = len(announcements) * args.repeat
+    print(f"{len(announcements)} ilan, {args.repeat} tekrar")
+    if not announcements:
+        return
+
+    legacy = LegacyParser()
+    legacy_time, legacy_results = bench(legacy.parse_announcement, announcements, args.repeat)
+    new_time, new_results = bench(parser.parse_announcement, announcements, args.repeat)
+    print(f"eski:  {legacy_time:.3f} sn ({count / legacy_time:.0f} ilan/sn)")
+    print(f"yeni:  {new_time:.3f} sn ({count / new_time:.0f} ilan/sn)")
+    print(f"hızlanma: {legacy_time / new_time:.2f}x")
+
+    differing = [i for i, (old, new) in enumerate(zip(legacy_results, new_results)) if old != new]
+    print(f"Farklı sonuç veren ilan: {len(differing)}/{len(announcements)}")
+    for i in differing[:5]:
+        fields = sorted(key for key in set(legacy_results[i]) | set(new_results[i])
+                        if legacy_results[i].get(key) != new_results[i].get(key))
+        print(f"  ilan {i}: {', '.join(fields)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+"""Sentetik gazete derlemi üzerinde tüm hattın aşama aşama hız ve doğruluk ölçümü.
+
+Derlem (benchmarks/gazette.py) aynı ``seed`` ile her seferinde aynı üretilir;
+görüntüleme, threshold, sütun ayırma, OCR, ayrıştırma ve veritabanı yazma
+ayrı ayrı zamanlanır. Sayfa/sn, en yüksek bellek (RSS) ve alan çıkarma
+doğruluğu JSON olarak yazılır; ``--compare`` ile önceki bir sonuç dosyasıyla
+aşama aşama karşılaştırılır.
+
+Kullanım: python benchmarks/bench_pipeline.py --pages 10 --scanned --compare benchmark_results/eski.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gazette import generate_corpus  # noqa: E402
+from ocr_engine.database import save_to_database  # noqa: E402
+from ocr_engine.ocr import get_backend, ocr_columns  # noqa: E402
+from ocr_engine.pages import DEFAULT_DPI, DPI_AUTO, iter_pages, split_into_columns, threshold_page  # noqa: E402
+from ocr_engine.parser import format_page, parse_text  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGES = ('rasterize', 'threshold', 'split_columns', 'ocr', 'parse', 'database')
+RESULTS_DIR = 'benchmark_results'
+FIELDS = ('city', 'ilan_sira_no', 'mersis_no', 'ticaret_sicil_no', 'ticaret_unvani', 'adres',
+          'tescil_edilen_hususlar', 'tescile_delil_olan_belgeler')
+NESTED_FIELDS = {
+    'konkordato': ('mahkeme_karari_tarihi', 'baslangic_tarihi', 'bitis_tarihi', 'komiser_adi'),
+    'pay_devri': ('devir_eden_adi', 'devir_alici_adi', 'devredilen_pay_adedi'),
+}
+
+
+def peak_rss_mb():
+    """Bu sürecin ve beklenmiş alt süreçlerin (pdftoppm, tesseract) en yüksek RSS'i, MB."""
+    if resource is None:
+        return None, None
+    # Linux'ta KB, macOS'ta bayt
+    unit = 1 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return round(own / 2 ** 20, 1), round(children / 2 ** 20, 1)
+
+
+def git_revision():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def run_pipeline(pdf_path, page_count, dpi, lang, engine, db_path, gray=True):
+    """Hattı sayfa sayfa çalıştırıp aşama sürelerini, sayfa metinlerini, ilanları
+    ve en büyük sayfa görüntüsünün bayt sayısını döndürür.
+
+    OCR önbelleği kullanılmaz; isabetler OCR maliyetini gizlerdi.
+    """
+    timings = dict.fromkeys(STAGES, 0.0)
+    texts = []
+    max_page_bytes = 0
+    pages = iter_pages(pdf_path, range(page_count), dpi=dpi, gray=gray)
+    while True:
+        start = time.perf_counter()
+        try:
+            page_num, image = next(pages)
+        except StopIteration:
+            break
+        timings['rasterize'] += time.perf_counter() - start
+        max_page_bytes = max(max_page_bytes, image.nbytes)
+
+        start = time.perf_counter()
+        binary = threshold_page(image)
+        timings['threshold'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        columns = split_into_columns(binary)
+        timings['split_columns'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        texts.append(format_page(page_num, ocr_columns(columns, lang, engine)))
+        timings['ocr'] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = parse_text("".join(texts))
+    timings['parse'] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    save_to_database(parsed, db_path)
+    timings['database'] += time.perf_counter() - start
+    return timings, texts, parsed, max_page_bytes
+
+
+def _normalize(value):
+    return " ".join(str(value).split()) if value is not None else None
+
+
+def score(parsed, truth):
+    """Alan bazında doğru çıkarılan değer oranlarını döndürür.
+
+    Her gerçek ilan, aynı İlan Sıra No'lu ayrıştırılmış ilanla, o yoksa aynı
+    sıradaki ilanla eşleştirilir. Kişilerde ad bazında bulunma oranı ölçülür.
+    """
+    by_sira_no = {announcement.get('ilan_sira_no'): announcement for announcement in parsed}
+    counts = {}
+
+    def count(field, ok):
+        correct, total = counts.get(field, (0, 0))
+        counts[field] = (correct + bool(ok), total + 1)
+
+    for index, expected in enumerate(truth):
+        actual = by_sira_no.get(expected['ilan_sira_no'])
+        if actual is None:
+            actual = parsed[index] if index < len(parsed) else {}
+        for field in FIELDS:
+            count(field, _normalize(actual.get(field)) == _normalize(expected[field]))
+        for section, fields in NESTED_FIELDS.items():
+            if section in expected:
+                for field in fields:
+                    count(f"{section}.{field}", _normalize((actual.get(section) or {}).get(field))
+                          == _normalize(expected[section][field]))
+        names = {_normalize(person.get('isim')) for person in actual.get('persons', [])}
+        for section in NESTED_FIELDS:
+            names.update(_normalize(person.get('isim')) for person in (actual.get(section) or {}).get('persons', []))
+        for name in expected['persons']:
+            count('persons', name in names)
+
+    correct = sum(correct for correct, _ in counts.values())
+    total = sum(total for _, total in counts.values())
+    return {
+        'overall': round(correct / total, 4) if total else None,
+        'fields': {field: round(correct / total, 4) for field, (correct, total) in sorted(counts.items())},
+    }
+
+
+def compare(result, baseline):
+    """İki sonuç dosyasının aşama sürelerini ve doğruluğunu yan yana yazdırır."""
+    print(f"\nKarşılaştırma: {baseline.get('git_commit')} -> {result.get('git_commit')}")
+    for stage in STAGES + ('total',):
+        old = baseline['stages'].get(stage, {}).get('ms_per_page')
+        new = result['stages'][stage]['ms_per_page']
+        if old:
+            print(f"  {stage:<14} {old:9.1f} -> {new:9.1f} ms/sayfa ({(new - old) / old * 100:+.1f}%)")
+    print(f"  {'sayfa/sn':<14} {baseline['pages_per_sec']:9.2f} -> {result['pages_per_sec']:9.2f}")
+    print(f"  {'doğruluk':<14} {baseline['accuracy']['overall']} -> {result['accuracy']['overall']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--columns', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scanned', action='store_true',
+                        help="Metin katmanı olmayan, gürültülü taranmış PDF üzerinde ölç")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI, help="Taranmış derlemin çözünürlüğü")
+    parser.add_argument('--render-dpi', default=None,
+                        help=f"Hattın görüntüleme çözünürlüğü ya da '{DPI_AUTO}' (varsayılan: --dpi)")
+    parser.add_argument('--rgb', action='store_true', help="Sayfaları gri yerine RGB görüntüle (eski yol)")
+    parser.add_argument('--lang', default='tur')
+    parser.add_argument('--engine', default='auto')
+    parser.add_argument('--corpus-dir', help="Derlemi bu dizine yaz ve sakla (varsayılan: geçici dizin)")
+    parser.add_argument('--output', help=f"Sonuç JSON dosyası (varsayılan: {RESULTS_DIR}/pipeline_<commit>.json)")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    args = parser.parse_args()
+    render_dpi = args.render_dpi or args.dpi
+    if render_dpi != DPI_AUTO:
+        render_dpi = int(render_dpi)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_dir = args.corpus_dir or tmp_dir
+        corpus = generate_corpus(corpus_dir, args.pages, args.columns, args.seed, args.scanned, args.dpi)
+        print(f"Derlem: {corpus['pdf_path']} ({args.pages} sayfa, {len(corpus['announcements'])} ilan)")
+
+        # Model yükleme sayfa başı OCR süresine karışmasın
+        start = time.perf_counter()
+        get_backend(args.engine, args.lang)
+        ocr_init = time.perf_counter() - start
+
+        start = time.perf_counter()
+        timings, _, parsed, max_page_bytes = run_pipeline(
+            corpus['pdf_path'], args.pages, render_dpi, args.lang, args.engine,
+            os.path.join(tmp_dir, 'bench.db'), gray=not args.rgb)
+        total = time.perf_counter() - start
+
+    # Kusursuz OCR ile aynı ayrıştırıcının ulaşabileceği doğruluk; farkı OCR ve sütun ayırmadan gelir
+    reference = score(parse_text("".join(format_page(page_num, text)
+                                         for page_num, text in enumerate(corpus['reference_texts']))),
+                      corpus['announcements'])
+    accuracy = score(parsed, corpus['announcements'])
+    accuracy['reference_overall'] = reference['overall']
+    own_rss, children_rss = peak_rss_mb()
+    commit, dirty = git_revision()
+
+    stages = {stage: {'seconds': round(seconds, 4), 'ms_per_page': round(seconds / args.pages * 1000, 2)}
+              for stage, seconds in timings.items()}
+    stages['total'] = {'seconds': round(total, 4), 'ms_per_page': round(total / args.pages * 1000, 2)}
+    result = {
+        'benchmark': 'pipeline',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': commit,
+        'git_dirty': dirty,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'params': {'pages': args.pages, 'columns': args.columns, 'seed': args.seed, 'scanned': args.scanned,
+                   'dpi': args.dpi, 'render_dpi': render_dpi, 'gray': not args.rgb,
+                   'lang': args.lang, 'engine': args.engine},
+        'announcements': len(corpus['announcements']),
+        'parsed_announcements': len(parsed),
+        'ocr_init_seconds': round(ocr_init, 4),
+        'stages': stages,
+        'pages_per_sec': round(args.pages / total, 3),
+        'max_page_mb': round(max_page_bytes / 2 ** 20, 2),
+        'peak_rss_mb': own_rss,
+        'peak_child_rss_mb': children_rss,
+        'accuracy': accuracy,
+    }
+
+    for stage, values in stages.items():
+        share = values['seconds'] / total * 100 if total else 0.0
+        print(f"  {stage:<14} {values['seconds']:8.3f} sn  {values['ms_per_page']:9.1f} ms/sayfa  %{share:5.1f}")
+    print(f"{result['pages_per_sec']:.2f} sayfa/sn, en yüksek RSS {own_rss} MB (alt süreçler {children_rss} MB), "
+          f"en büyük sayfa görüntüsü {result['max_page_mb']} MB")
+    print(f"Alan doğruluğu: {accuracy['overall']} (kusursuz OCR ile: {accuracy['reference_overall']})")
+    for field, value in accuracy['fields'].items():
+        print(f"  {field:<40} {value:.3f}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline_{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar yazıldı: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(result, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
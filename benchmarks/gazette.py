@@ -0,0 +1,350 @@
+"""Ölçümler için sentetik, çok sütunlu Türkçe ticaret sicili gazetesi üretir.
+
+PDF'ler dış kütüphane olmadan yazılır: metin sayfaları standart Helvetica
+yazı tipiyle (Türkçe harfler cp1254 kodlamasına ``/Differences`` ile
+eşlenir), taranmış sayfalar ise bu sayfaların pdftoppm görüntülerine gürültü
+eklenip gri tonlu görüntü olarak gömülmesiyle oluşturulur. Her ilanın doğru
+alan değerleri yanına JSON olarak yazılır; aynı ``seed`` her zaman aynı
+derlemi üretir.
+
+Kullanım: python benchmarks/gazette.py cikti_dizini --pages 20 --columns 2 --scanned
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import textwrap
+import zlib
+
+import numpy as np
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4, punto
+MARGIN = 36
+GUTTER = 18
+FONT_SIZE = 8
+HEADER_FONT_SIZE = 9
+LINE_HEIGHT = 10
+# Helvetica'nın ortalama karakter genişliği (yazı tipi boyutuna oranla)
+CHAR_WIDTH_RATIO = 0.52
+NBSP = '\u00a0'
+
+# cp1254'te Türkçe harflerin bulunduğu kodlar ve Type1 glif adları
+TURKISH_GLYPHS = {0xD0: 'Gbreve', 0xDD: 'Idotaccent', 0xDE: 'Scedilla',
+                  0xF0: 'gbreve', 0xFD: 'dotlessi', 0xFE: 'scedilla'}
+
+CITIES = ['İSTANBUL', 'ANKARA', 'İZMİR', 'BURSA', 'KOCAELİ', 'ESKİŞEHİR', 'MUĞLA', 'ŞANLIURFA']
+DISTRICTS = ['MERKEZ', 'ŞİŞLİ', 'ÇANKAYA', 'KARŞIYAKA', 'NİLÜFER', 'GEBZE', 'ODUNPAZARI', 'BODRUM']
+FIRST_NAMES = ['AYŞE', 'MEHMET', 'FATMA', 'MUSTAFA', 'EMİNE', 'ALİ', 'HATİCE', 'HÜSEYİN', 'ZEYNEP',
+               'İBRAHİM', 'ŞEYMA', 'ÖMER', 'GÜLŞEN', 'ÇAĞRI', 'DİLEK', 'YAĞMUR']
+LAST_NAMES = ['YILMAZ', 'KAYA', 'DEMİR', 'ŞAHİN', 'ÇELİK', 'YILDIZ', 'ÖZTÜRK', 'AYDIN', 'ÖZDEMİR',
+              'ARSLAN', 'DOĞAN', 'KILIÇ', 'ÇETİN', 'KOÇ', 'GÜNEŞ', 'ERDOĞAN']
+TRADE_WORDS = ['ÖRNEK', 'DOĞU', 'GÜNEY', 'ÇINAR', 'ATLAS', 'YEŞİL', 'MAVİ', 'İLKE', 'ŞİMŞEK', 'ÖZGÜR']
+SECTORS = ['İNŞAAT', 'GIDA', 'TEKSTİL', 'LOJİSTİK', 'YAZILIM', 'TURİZM', 'ENERJİ', 'MOBİLYA']
+COMPANY_TYPES = ['LİMİTED ŞİRKETİ', 'ANONİM ŞİRKETİ']
+STREETS = ['Cumhuriyet Cad.', 'Atatürk Bulvarı', 'İnönü Sok.', 'Gazi Mustafa Kemal Cad.', 'Çiçek Sok.']
+NEIGHBOURHOODS = ['Merkez Mah.', 'Yeşilyurt Mah.', 'Bahçelievler Mah.', 'Güzeltepe Mah.', 'Şirinevler Mah.']
+BELGELER = ['Genel Kurul Kararı', 'Müdürler Kurulu Kararı', 'Mahkeme Kararı', 'Pay Devir Sözleşmesi']
+LOWER_TR = str.maketrans('İI', 'iı')
+
+
+def _title(word):
+    """Türkçe büyük harfli kelimeyi ilk harfi büyük olacak şekilde yazar (İ/I ayrımıyla)."""
+    return word[0] + word[1:].translate(LOWER_TR).lower()
+
+
+def _kimlik(rng):
+    return f"{rng.randint(100, 999)}*****{rng.randint(10, 99)}"
+
+
+def _person_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _date(rng, year=2024):
+    return f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{year}"
+
+
+def _keep(phrase):
+    """Satır kaydırmada bölünmemesi gereken ifadeyi bağlar."""
+    return phrase.replace(' ', NBSP)
+
+
+def make_announcement(rng, index):
+    """Bir ilanın paragraflarını ve doğru alan değerlerini döndürür."""
+    city = rng.choice(CITIES)
+    kind = ('KONKORDATO', 'PAY DEVRİ', 'YÖNETİM')[index % 3]
+    # Gazetedeki gibi uzun unvanlar etiket satırından bir sonraki satıra taşar
+    unvan = (f"{rng.choice(TRADE_WORDS)} {rng.choice(SECTORS)} {rng.choice(SECTORS)} "
+             f"SANAYİ VE TİCARET {rng.choice(COMPANY_TYPES)}")
+    adres = (f"{rng.choice(NEIGHBOURHOODS)} {rng.choice(STREETS)} No:{rng.randint(1, 250)} "
+             f"{rng.choice(DISTRICTS)} / {_title(city)}")
+    truth = {
+        'city': city,
+        'ilan_sira_no': str(100000 + index),
+        'mersis_no': f"{rng.randint(0, 10 ** 16 - 1):016d}",
+        'ticaret_sicil_no': str(rng.randint(10000, 999999)),
+        'ticaret_unvani': unvan,
+        'adres': adres,
+        'tescil_edilen_hususlar': kind,
+        'tescile_delil_olan_belgeler': rng.choice(BELGELER),
+        'persons': [],
+    }
+    paragraphs = [
+        ('header', f"T.C. {city} {_keep('TİCARET SİCİLİ MÜDÜRLÜĞÜ' + chr(39) + 'NDEN')}"),
+        ('text', f"İlan Sıra No: {truth['ilan_sira_no']}"),
+        ('text', f"MERSİS No: {truth['mersis_no']}"),
+        ('text', f"Ticaret Sicil No: {truth['ticaret_sicil_no']}"),
+        ('text', f"Ticaret Unvanı: {unvan}"),
+        ('text', f"Adres: {adres}"),
+        ('blank', ''),
+        ('text', f"Tescil Edilen Hususlar: {kind}"),
+        ('text', f"Tescile Delil Olan Belgeler: {truth['tescile_delil_olan_belgeler']}"),
+    ]
+
+    if kind == 'KONKORDATO':
+        mahkeme_tarihi, baslangic, bitis = _date(rng), _date(rng), _date(rng, 2025)
+        komiser, kimlik, komiser_adresi = _person_name(rng), _kimlik(rng), rng.choice(CITIES)
+        paragraphs += [
+            ('text', f"{rng.randint(1, 20)}. ASLİYE HUKUK MAHKEMESİ'nin {_keep(mahkeme_tarihi + ' tarihli kararı ile')} "
+                     f"şirket hakkında geçici mühlet verilmiştir."),
+            ('text', f"Başlangıç Tarihi: {baslangic}"),
+            ('text', f"Bitiş Tarihi: {bitis}"),
+            ('text', f"{_keep(kimlik + ' Kimlik No' + chr(39) + 'lu')}, {komiser_adresi} "
+                     f"{_keep('adresinde ikamet eden')}, {komiser}; {_keep(bitis + ' tarihine kadar')} "
+                     f"{_keep('Konkordato Komiseri olarak atanmıştır.')}"),
+        ]
+        truth['konkordato'] = {
+            'mahkeme_karari_tarihi': mahkeme_tarihi,
+            'baslangic_tarihi': baslangic,
+            'bitis_tarihi': bitis,
+            'komiser_adi': komiser,
+        }
+        truth['persons'].append(komiser)
+    elif kind == 'PAY DEVRİ':
+        devreden, devralan = _person_name(rng), _person_name(rng)
+        pay_adedi = rng.randint(10, 5000)
+        tutar = f"{pay_adedi * 25:,}".replace(',', '.') + ',00'
+        paragraphs.append(
+            ('text', f"Şirket Ortaklarından {_keep(_kimlik(rng) + ' Kimlik Numaralı')} {devreden} "
+                     f"{_keep(tutar + ' TL sermaye karşılığı ' + str(pay_adedi) + ' adet payını')} hukuki ve mali "
+                     f"yükümlülükleri ile {_keep(_kimlik(rng) + ' Kimlik Numaralı')} {devralan}'e devretmiştir.")
+        )
+        paragraphs.append(('text', "Yeni Ortaklık Yapısı:"))
+        for name in (devralan, _person_name(rng)):
+            shares = rng.randint(10, 2000)
+            paragraphs.append(('text', f"{name} : Beheri 25,00 Türk Lirası değerinde {shares} adet paya "
+                                       f"karşılık gelen {shares * 25},00 Türk Lirası"))
+        truth['pay_devri'] = {
+            'devir_eden_adi': devreden,
+            'devir_alici_adi': devralan,
+            'devredilen_pay_adedi': str(pay_adedi),
+        }
+        truth['persons'] += [devreden, devralan]
+    else:
+        for _ in range(rng.randint(1, 3)):
+            name = _person_name(rng)
+            paragraphs.append(
+                ('text', f"Türkiye Cumhuriyeti Uyruklu {_keep(_kimlik(rng) + ' Kimlik No' + chr(39) + 'lu')}, "
+                         f"{rng.choice(CITIES)} / {rng.choice(DISTRICTS)} {_keep('adresinde ikamet eden')}, "
+                         f"{name}; 3 yıl süre ile Müdür olarak seçilmiştir.")
+            )
+            truth['persons'].append(name)
+    paragraphs.append(('text', "Yukarıdaki bilgilerin sicile kayıtlı belgelere uygun olduğunu bildiririz."))
+    paragraphs.append(('blank', ''))
+    return paragraphs, truth
+
+
+def layout_pages(announcements, page_count, columns):
+    """İlan paragraflarını sütunlara yerleştirip sayfa başına satır listesi döndürür.
+
+    Her satır ``(x, y, font_size, text)`` (boş satırlar dahil), her sütun ayırıcı çizgi
+    ``(x0, y0, x1, y1)`` biçimindedir. ``page_count`` sayfa dolunca durulur;
+    yerleştirilebilen ilan sayısı da döndürülür.
+    """
+    column_width = (PAGE_WIDTH - 2 * MARGIN - (columns - 1) * GUTTER) / columns
+    chars_per_line = int(column_width / (FONT_SIZE * CHAR_WIDTH_RATIO))
+    lines_per_column = int((PAGE_HEIGHT - 2 * MARGIN) / LINE_HEIGHT)
+
+    slots = []
+    for page in range(page_count):
+        for column in range(columns):
+            x = MARGIN + column * (column_width + GUTTER)
+            slots.extend((page, x, PAGE_HEIGHT - MARGIN - row * LINE_HEIGHT) for row in range(lines_per_column))
+
+    pages = [[] for _ in range(page_count)]
+    slot = 0
+    placed = 0
+    for paragraphs in announcements:
+        wrapped = []
+        for style, text in paragraphs:
+            if style == 'blank':
+                wrapped.append((FONT_SIZE, ''))
+                continue
+            font_size = HEADER_FONT_SIZE if style == 'header' else FONT_SIZE
+            for line in textwrap.wrap(text, chars_per_line, break_long_words=False):
+                wrapped.append((font_size, line.replace(NBSP, ' ')))
+        if slot + len(wrapped) > len(slots):
+            break
+        for font_size, line in wrapped:
+            page, x, y = slots[slot]
+            pages[page].append((x, y, font_size, line))
+            slot += 1
+        placed += 1
+
+    rules = [(MARGIN + column * (column_width + GUTTER) - GUTTER / 2, MARGIN,
+              MARGIN + column * (column_width + GUTTER) - GUTTER / 2, PAGE_HEIGHT - MARGIN)
+             for column in range(1, columns)]
+    return [(lines, rules) for lines in pages], placed
+
+
+def reference_texts(pages):
+    """Kusursuz bir OCR'ın üreteceği sayfa metinlerini döndürür (sütunlar okuma sırasıyla)."""
+    texts = []
+    for lines, _ in pages:
+        columns = {}
+        for x, _, _, text in lines:
+            columns.setdefault(x, []).append(text)
+        texts.append("\n\n".join("\n".join(column).strip() for _, column in sorted(columns.items())) + "\n\n")
+    return texts
+
+
+def _pdf_string(text):
+    data = text.encode('cp1254')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _write_pdf(path, objects):
+    """Nesne gövdelerinden (1'den numaralı, 1 = Catalog) PDF dosyası yazar."""
+    out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b'\nendobj\n'
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b''.join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def _stream(data, extra=b''):
+    return b'<< /Length %d ' % len(data) + extra + b' >>\nstream\n' + data + b'\nendstream'
+
+
+def write_text_pdf(path, pages):
+    """Metin katmanlı PDF yazar; ``pages`` ``layout_pages`` çıktısıdır."""
+    differences = b' '.join(b'%d /%s' % (code, name.encode()) for code, name in sorted(TURKISH_GLYPHS.items()))
+    encoding = b'<< /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences [' + differences + b'] >>'
+    # 1 Catalog, 2 Pages, 3 gövde yazı tipi, 4 başlık yazı tipi, sonra sayfa başına sayfa + içerik
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding ' + encoding + b' >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding ' + encoding + b' >>',
+    ]
+    kids = []
+    for lines, rules in pages:
+        content = bytearray()
+        for x0, y0, x1, y1 in rules:
+            content += b'0.6 w %.2f %.2f m %.2f %.2f l S\n' % (x0, y0, x1, y1)
+        for x, y, font_size, text in lines:
+            if not text:
+                continue
+            font = b'/F2' if font_size == HEADER_FONT_SIZE else b'/F1'
+            content += b'BT %s %d Tf %.2f %.2f Td %s Tj ET\n' % (font, font_size, x, y, _pdf_string(text))
+        page_number = len(objects) + 1
+        kids.append(page_number)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> '
+            b'/Contents %d 0 R >>' % (PAGE_WIDTH, PAGE_HEIGHT, page_number + 1)
+        )
+        objects.append(_stream(zlib.compress(bytes(content)), b'/Filter /FlateDecode'))
+    objects[1] = b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % kid for kid in kids) + b'] /Count %d >>' % len(kids)
+    _write_pdf(path, objects)
+
+
+def write_image_pdf(path, images, dpi):
+    """Gri tonlu sayfa görüntülerinden metin katmanı olmayan (taranmış) PDF yazar."""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None]
+    kids = []
+    for image in images:
+        height, width = image.shape
+        page_width, page_height = width * 72 / dpi, height * 72 / dpi
+        page_number = len(objects) + 1
+        kids.append(page_number)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /XObject << /Im0 %d 0 R >> >> '
+            b'/Contents %d 0 R >>' % (page_width, page_height, page_number + 1, page_number + 2)
+        )
+        objects.append(_stream(b'q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q' % (page_width, page_height)))
+        objects.append(_stream(
+            zlib.compress(np.ascontiguousarray(image, dtype=np.uint8).tobytes()),
+            b'/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray '
+            b'/BitsPerComponent 8 /Filter /FlateDecode' % (width, height)
+        ))
+    objects[1] = b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % kid for kid in kids) + b'] /Count %d >>' % len(kids)
+    _write_pdf(path, objects)
+
+
+def scan_pages(text_pdf_path, page_count, dpi, seed):
+    """Metin PDF'ini görüntüleyip tarayıcı gürültüsü eklenmiş gri sayfalar üretir."""
+    from ocr_engine.pages import iter_pages
+
+    noise = np.random.default_rng(seed)
+    for _, image in iter_pages(text_pdf_path, range(page_count), dpi=dpi):
+        gray = np.asarray(image, dtype=np.float32)
+        if gray.ndim == 3:
+            gray = gray @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        gray += noise.normal(0, 12, gray.shape).astype(np.float32)
+        yield np.clip(gray, 0, 255).astype(np.uint8)
+
+
+def generate_corpus(output_dir, page_count=10, columns=2, seed=0, scanned=False, dpi=200):
+    """Sentetik gazete PDF'ini ve doğru alan değerlerini ``output_dir`` içine yazar.
+
+    ``{'pdf_path', 'truth_path', 'announcements', 'reference_texts'}``
+    sözlüğü döndürülür.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    # Sayfa başına sığabilecek ilandan fazlası üretilir, sığmayanlar atılır
+    generated = [make_announcement(rng, index) for index in range(page_count * columns * 6)]
+    pages, placed = layout_pages([paragraphs for paragraphs, _ in generated], page_count, columns)
+    truth = [truth for _, truth in generated[:placed]]
+
+    name = f"gazette_{page_count}p_{columns}col_seed{seed}"
+    text_pdf_path = os.path.join(output_dir, name + '.pdf')
+    write_text_pdf(text_pdf_path, pages)
+    pdf_path = text_pdf_path
+    if scanned:
+        pdf_path = os.path.join(output_dir, name + '_scanned.pdf')
+        write_image_pdf(pdf_path, list(scan_pages(text_pdf_path, page_count, dpi, seed)), dpi)
+
+    truth_path = os.path.join(output_dir, name + '.json')
+    with open(truth_path, 'w', encoding='utf-8') as f:
+        json.dump({'seed': seed, 'pages': page_count, 'columns': columns, 'announcements': truth},
+                  f, ensure_ascii=False, indent=2)
+    return {'pdf_path': pdf_path, 'truth_path': truth_path, 'announcements': truth,
+            'reference_texts': reference_texts(pages)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output_dir')
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--columns', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scanned', action='store_true', help="Metin katmanı olmayan, gürültülü taranmış PDF üret")
+    parser.add_argument('--dpi', type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.output_dir, args.pages, args.columns, args.seed, args.scanned, args.dpi)
+    print(f"{corpus['pdf_path']}: {len(corpus['announcements'])} ilan, {args.pages} sayfa")
+    print(f"Doğru değerler: {corpus['truth_path']}")
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
@@ -0,0 +1,40 @@
+"""Ticaret Sicil Gazetesi PDF'leri için Qt'den bağımsız OCR motoru.
+
+Masaüstü arayüzü (ocr_pdf.py), başsız komut satırı (python -m ocr_engine),
+klasör izleme servisi ve HTTP servisi aynı sayfa işleme fonksiyonlarını
+kullanır. Paketi içe aktarmak hiçbir alt modülü yüklemez; aşağıdaki adlar
+ilk erişildiklerinde ilgili modülden alınır (ör. ``ocr_engine.convert_pdf``).
+OpenCV, pdf2image, pytesseract, tesserocr ve spaCy de yalnızca gerçekten
+kullanıldıklarında yüklenir.
+"""
+import importlib
+
+_EXPORTS = {
+    'convert_pdf': 'convert',
+    'run_batch': 'batch',
+    'extract_pages': 'batch',
+    'PagePipeline': 'pipeline',
+    'AnnouncementStream': 'parser',
+    'parse_text': 'parser',
+    'parse_announcement': 'parser',
+    'save_to_database': 'database',
+    'DatabaseWriter': 'database',
+    'open_exporter': 'export',
+    'watch_folder': 'watch',
+    'JobServer': 'server',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
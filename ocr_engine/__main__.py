@@ -0,0 +1,192 @@
+"""Komut satırı girişi: ``python -m ocr_engine <komut> ...``"""
+import argparse
+import os
+import sys
+import time
+
+from .batch import DEFAULT_CHUNK_SIZE, EXTRACTION_MODES, find_pdfs, run_batch
+from .cache import DEFAULT_CACHE_PATH, DEFAULT_CACHE_SIZE
+from .checkpoint import DEFAULT_CHECKPOINT_PATH
+from .database import DEFAULT_DB_PATH, connect
+from .export import DEFAULT_BATCH_SIZE as DEFAULT_EXPORT_BATCH_SIZE, EXPORT_FORMATS, export_database
+from .metrics import DEFAULT_METRICS_PATH
+from .ner import DEFAULT_NER_BATCH_SIZE, DEFAULT_NER_MODEL, DEFAULT_NER_PROCESSES, Ner
+from .ocr import DEFAULT_CONFIDENCE_THRESHOLD, OCR_ENGINES, TwoTier
+from .pages import DEFAULT_DPI, DPI_AUTO
+from .pipeline import DEFAULT_OCR_WORKERS
+from .search import DEFAULT_LIMIT, SEARCH_KINDS, search
+from .server import (DEFAULT_HOST, DEFAULT_JOBS_DIR, DEFAULT_MAX_JOBS, DEFAULT_MAX_UPLOAD, DEFAULT_PORT,
+                     DEFAULT_QUEUE_SIZE, DEFAULT_REQUEST_TIMEOUT, serve)
+from .watch import DEFAULT_POLL_INTERVAL, watch_folder
+
+
+def parse_dpi(value):
+    if value == DPI_AUTO:
+        return value
+    return int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ocr_engine', description="Gazete PDF'leri için başsız OCR araçları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch_parser = subparsers.add_parser('batch', help="PDF'leri süreç havuzunda toplu işle")
+    batch_parser.add_argument('paths', nargs='+', help="PDF dosyaları veya PDF içeren dizinler")
+    batch_parser.add_argument('--workers', type=int, default=os.cpu_count(), help="İşçi süreç sayısı (varsayılan: CPU sayısı)")
+    batch_parser.add_argument('--lang', default='tur', help="Tesseract dili (varsayılan: tur)")
+    batch_parser.add_argument('--mode', choices=EXTRACTION_MODES, default='hybrid',
+                              help="hybrid: metin katmanı varsa OCR'ı atla; ocr: her sayfayı OCR'dan geçir")
+    batch_parser.add_argument('--engine', choices=OCR_ENGINES, default='auto',
+                              help="OCR arka ucu (auto: tesserocr kuruluysa onu kullanır)")
+    batch_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                              help="Bir işçiye tek seferde verilen ardışık sayfa sayısı")
+    batch_parser.add_argument('--two-tier', action='store_true',
+                              help="Önce hızlı modelle oku, yalnızca güveni düşük satırları doğru modelle yeniden oku")
+    batch_parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE_THRESHOLD,
+                              help=f"İki aşamalı OCR'da yeniden okuma için satır güven eşiği (varsayılan: {DEFAULT_CONFIDENCE_THRESHOLD})")
+    batch_parser.add_argument('--fast-tessdata',
+                              help="Hızlı modellerin (tessdata_fast) bulunduğu dizin; verilmezse varsayılan tessdata")
+    batch_parser.add_argument('--ner', action='store_true',
+                              help="İlanlardaki kişi ve kurum adlarını spaCy NER ile bulup şahıslara ekle")
+    batch_parser.add_argument('--ner-model', default=DEFAULT_NER_MODEL, help=f"spaCy modeli (varsayılan: {DEFAULT_NER_MODEL})")
+    batch_parser.add_argument('--ner-batch-size', type=int, default=DEFAULT_NER_BATCH_SIZE,
+                              help="nlp.pipe'a tek seferde verilen ilan sayısı")
+    batch_parser.add_argument('--ner-processes', type=int, default=DEFAULT_NER_PROCESSES,
+                              help="nlp.pipe süreç sayısı")
+    batch_parser.add_argument('--dpi', type=parse_dpi, default=DEFAULT_DPI,
+                              help=f"Görüntüleme çözünürlüğü ya da sayfa başına metin yüksekliğine göre "
+                                   f"seçmek için '{DPI_AUTO}' (varsayılan: {DEFAULT_DPI})")
+    batch_parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="OCR sonuç önbelleği dosyası")
+    batch_parser.add_argument('--no-cache', action='store_true', help="OCR önbelleğini kullanma")
+    batch_parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+                              help="Önbellek boyut sınırı (MB); aşılınca en eski kayıtlar silinir")
+    batch_parser.add_argument('--db', default=DEFAULT_DB_PATH, help="İlanların yazılacağı SQLite veritabanı")
+    batch_parser.add_argument('--no-db', action='store_true', help="İlanları veritabanına yazma")
+    batch_parser.add_argument('--checkpoints', default=DEFAULT_CHECKPOINT_PATH,
+                              help="Sayfa kontrol noktası dosyası; yarıda kalan PDF'ler buradan devam eder")
+    batch_parser.add_argument('--no-checkpoints', action='store_true', help="Kontrol noktası tutma")
+    batch_parser.add_argument('--metrics', default=DEFAULT_METRICS_PATH,
+                              help="Aşama ölçümlerinin JSON satırı olarak ekleneceği dosya")
+    batch_parser.add_argument('--no-metrics', action='store_true', help="Aşama ölçümü yapma")
+    batch_parser.add_argument('--prometheus', help="Toplamların yazılacağı Prometheus textfile (.prom) yolu")
+    batch_parser.add_argument('--export', help="İlanların ayrıştırıldıkça yazılacağı .jsonl ya da .parquet dosyası")
+    batch_parser.add_argument('--export-batch-size', type=int, default=DEFAULT_EXPORT_BATCH_SIZE,
+                              help="Dışa aktarmada tek seferde yazılan ilan sayısı")
+
+    export_parser = subparsers.add_parser('export', help="Veritabanındaki ilanları JSONL ya da Parquet olarak dışa aktar")
+    export_parser.add_argument('output', help="Çıktı dosyası (.jsonl ya da .parquet)")
+    export_parser.add_argument('--db', default=DEFAULT_DB_PATH, help="SQLite veritabanı")
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS, help="Çıktı biçimi (varsayılan: uzantıdan)")
+    export_parser.add_argument('--batch-size', type=int, default=DEFAULT_EXPORT_BATCH_SIZE,
+                               help="Tek seferde okunup yazılan ilan sayısı")
+
+    watch_parser = subparsers.add_parser('watch', help="Bir klasörü izleyip gelen yeni PDF'leri işle")
+    watch_parser.add_argument('directory', help="PDF'lerin bırakıldığı klasör")
+    watch_parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                              help=f"Tarama aralığı (sn, varsayılan: {DEFAULT_POLL_INTERVAL:g})")
+    watch_parser.add_argument('--once', action='store_true',
+                              help="Klasörü bir kez tara, bulunan PDF'leri işleyip çık")
+    watch_parser.add_argument('--mode', choices=EXTRACTION_MODES, default='hybrid',
+                              help="hybrid: metin katmanı varsa OCR'ı atla; ocr: her sayfayı OCR'dan geçir")
+    watch_parser.add_argument('--ocr-workers', type=int, default=DEFAULT_OCR_WORKERS,
+                              help="Bir PDF için OCR iş parçacığı sayısı (varsayılan: CPU sayısı)")
+    watch_parser.add_argument('--ocr-processes', action='store_true',
+                              help="OCR'ı süreçlerde yap; sayfalar paylaşımlı bellekle kopyalanmadan aktarılır")
+    watch_parser.add_argument('--dpi', type=parse_dpi, default=DEFAULT_DPI,
+                              help=f"Görüntüleme çözünürlüğü ya da sayfa başına metin yüksekliğine göre "
+                                   f"seçmek için '{DPI_AUTO}' (varsayılan: {DEFAULT_DPI})")
+    watch_parser.add_argument('--db', default=DEFAULT_DB_PATH, help="İlanların ve işlenen belgelerin yazılacağı SQLite veritabanı")
+    watch_parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="OCR sonuç önbelleği dosyası")
+    watch_parser.add_argument('--checkpoints', default=DEFAULT_CHECKPOINT_PATH,
+                              help="Sayfa kontrol noktası dosyası; yarıda kalan PDF'ler buradan devam eder")
+    watch_parser.add_argument('--metrics', default=DEFAULT_METRICS_PATH,
+                              help="Aşama ölçümlerinin JSON satırı olarak ekleneceği dosya")
+    watch_parser.add_argument('--no-metrics', action='store_true', help="Aşama ölçümü yapma")
+    watch_parser.add_argument('--prometheus', help="Toplamların yazılacağı Prometheus textfile (.prom) yolu")
+
+    serve_parser = subparsers.add_parser('serve', help="OCR ve ayrıştırmayı yerel HTTP servisi olarak sun")
+    serve_parser.add_argument('--host', default=DEFAULT_HOST, help=f"Dinlenecek adres (varsayılan: {DEFAULT_HOST})")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Dinlenecek port (varsayılan: {DEFAULT_PORT})")
+    serve_parser.add_argument('--jobs', type=int, default=DEFAULT_MAX_JOBS, help="Aynı anda çalışan en fazla iş sayısı")
+    serve_parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                              help="Sırada bekleyebilecek en fazla iş; aşılınca yükleme reddedilir")
+    serve_parser.add_argument('--timeout', type=float, default=DEFAULT_REQUEST_TIMEOUT,
+                              help="İstek başlığı ve gövdesini okuma zaman aşımı (sn)")
+    serve_parser.add_argument('--max-upload', type=int, default=DEFAULT_MAX_UPLOAD // (1024 * 1024),
+                              help="En büyük PDF boyutu (MB)")
+    serve_parser.add_argument('--ocr-workers', type=int, default=DEFAULT_OCR_WORKERS,
+                              help="Toplam OCR iş parçacığı sayısı; aynı anda çalışan işler arasında bölünür")
+    serve_parser.add_argument('--ocr-processes', action='store_true',
+                              help="OCR'ı süreçlerde yap; sayfalar paylaşımlı bellekle kopyalanmadan aktarılır")
+    serve_parser.add_argument('--dpi', type=parse_dpi, default=DEFAULT_DPI,
+                              help=f"Görüntüleme çözünürlüğü ya da sayfa başına metin yüksekliğine göre "
+                                   f"seçmek için '{DPI_AUTO}' (varsayılan: {DEFAULT_DPI})")
+    serve_parser.add_argument('--jobs-dir', default=DEFAULT_JOBS_DIR, help="Yüklenen PDF'lerin ve sonuçların klasörü")
+    serve_parser.add_argument('--db', help="İlanlar ayrıca bu SQLite veritabanına da yazılır")
+    serve_parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="OCR sonuç önbelleği dosyası")
+    serve_parser.add_argument('--checkpoints', default=DEFAULT_CHECKPOINT_PATH, help="Sayfa kontrol noktası dosyası")
+    serve_parser.add_argument('--metrics', default=DEFAULT_METRICS_PATH,
+                              help="Aşama ölçümlerinin JSON satırı olarak ekleneceği dosya")
+    serve_parser.add_argument('--no-metrics', action='store_true', help="Aşama ölçümü yapma")
+    serve_parser.add_argument('--prometheus', help="Toplamların yazılacağı Prometheus textfile (.prom) yolu")
+
+    search_parser = subparsers.add_parser('search', help="İlan, şirket ve şahıslarda tam metin arama")
+    search_parser.add_argument('query', help="Aranacak kelimeler (hepsi geçmeli, önek olarak eşleşir)")
+    search_parser.add_argument('--db', default=DEFAULT_DB_PATH, help="SQLite veritabanı")
+    search_parser.add_argument('--kind', choices=SEARCH_KINDS, default='all', help="Aranacak kayıt türü")
+    search_parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help="En fazla sonuç sayısı")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'batch':
+        pdf_paths = find_pdfs(args.paths)
+        if not pdf_paths:
+            print("İşlenecek PDF bulunamadı", file=sys.stderr)
+            return 1
+        run_batch(pdf_paths, workers=args.workers, lang=args.lang, mode=args.mode,
+                  engine=args.engine, chunk_size=args.chunk_size, dpi=args.dpi,
+                  cache_path=None if args.no_cache else args.cache,
+                  cache_size=args.cache_size * 1024 * 1024,
+                  db_path=None if args.no_db else args.db,
+                  checkpoint_path=None if args.no_checkpoints else args.checkpoints,
+                  metrics_path=None if args.no_metrics else args.metrics,
+                  prometheus_path=args.prometheus, export_path=args.export,
+                  export_batch_size=args.export_batch_size,
+                  two_tier=TwoTier(args.confidence, args.fast_tessdata) if args.two_tier else None,
+                  ner=Ner(args.ner_model, args.ner_batch_size, args.ner_processes) if args.ner else None)
+    elif args.command == 'export':
+        start = time.perf_counter()
+        count = export_database(args.output, db_path=args.db, fmt=args.format, batch_size=args.batch_size)
+        print(f"{count} ilan dışa aktarıldı: {args.output} ({time.perf_counter() - start:.1f} sn)")
+    elif args.command == 'watch':
+        try:
+            watch_folder(args.directory, db_path=args.db, interval=args.interval, mode=args.mode,
+                         checkpoint_path=args.checkpoints, cache_path=args.cache,
+                         ocr_workers=args.ocr_workers, ocr_processes=args.ocr_processes, dpi=args.dpi,
+                         metrics_path=None if args.no_metrics else args.metrics,
+                         prometheus_path=args.prometheus, once=args.once)
+        except KeyboardInterrupt:
+            # Yarıda kalan PDF kontrol noktasından devam eder
+            print("İzleme durduruldu")
+    elif args.command == 'serve':
+        serve(host=args.host, port=args.port, max_jobs=args.jobs, queue_size=args.queue_size,
+              request_timeout=args.timeout, max_upload=args.max_upload * 1024 * 1024,
+              ocr_workers=args.ocr_workers, ocr_processes=args.ocr_processes, dpi=args.dpi, jobs_dir=args.jobs_dir,
+              db_path=args.db,
+              cache_path=args.cache, checkpoint_path=args.checkpoints,
+              metrics_path=None if args.no_metrics else args.metrics, prometheus_path=args.prometheus)
+    elif args.command == 'search':
+        conn = connect(args.db)
+        start = time.perf_counter()
+        results = search(conn, args.query, kind=args.kind, limit=args.limit)
+        elapsed = time.perf_counter() - start
+        conn.close()
+        for result in results:
+            print(f"{result['score']:8.2f}  {result['kind']:<13} #{result['id']:<8} "
+                  f"{result['ticaret_unvani'] or '-'} | {result['key'] or '-'} | {result['snippet']}")
+        print(f"{len(results)} sonuç, {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
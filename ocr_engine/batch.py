@@ -0,0 +1,312 @@
+"""Birden çok PDF'in sayfalarını süreç havuzunda paralel işleyen başsız toplu çalıştırıcı."""
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .cache import DEFAULT_CACHE_SIZE, format_cache_stats
+from .checkpoint import CheckpointStore, file_hash
+from .database import DatabaseWriter, connect, record_document
+from .export import DEFAULT_BATCH_SIZE as DEFAULT_EXPORT_BATCH_SIZE, open_exporter
+from .metrics import Metrics, timed
+from .ner import NerEnricher
+from .parser import AnnouncementStream
+from .pages import DEFAULT_DPI, count_pages
+from .pipeline import PagePipeline, _init_worker
+
+EXTRACTION_MODES = ('hybrid', 'ocr')
+
+# Her iş bir pdftoppm süreciyle görüntülenen ardışık sayfalardan oluşur;
+# küçük tutmak işçiler arasında yük dengesini korur
+DEFAULT_CHUNK_SIZE = 8
+
+
+def extract_pages(pdf_path, page_nums, lang='tur', mode='hybrid', engine='auto', cache_path=None,
+                  cache_size=DEFAULT_CACHE_SIZE, log=None, metrics=None, dpi=DEFAULT_DPI, two_tier=None):
+    """Verilen sayfaların metnini ``(page_num, page_text, source)`` olarak üreten hattı döndürür.
+
+    Sayfalar masaüstü arayüzüyle aynı aşamalı hattan (pipeline.PagePipeline)
+    geçer; toplu çalıştırmada her işçi süreç tek çekirdek kullandığından hat
+    bir ön işleme ve bir OCR iş parçacığıyla kurulur. ``hybrid`` kipinde önce
+    gömülü metin katmanı denenir; ``source`` metnin geldiği yoldur ('text'
+    veya 'ocr'). Sayfalar her zaman sıra ile üretilir. ``cache_path``
+    verilirse sütun OCR sonuçları önbellekten okunur ve yazılır; isabet/ıska
+    sayıları dönen hattın ``cache_stats`` metodundadır. ``dpi`` ``'auto'``
+    olabilir (bkz. pages.iter_pages); ``two_tier`` verilirse OCR iki aşamalı
+    yapılır (bkz. ocr.TwoTier).
+    """
+    return PagePipeline(pdf_path, page_nums, lang=lang, mode=mode, engine=engine, cache_path=cache_path,
+                        cache_size=cache_size, dpi=dpi, preprocess_workers=1, ocr_workers=1,
+                        metrics=metrics, log=log, two_tier=two_tier)
+
+
+def process_chunk(pdf_path, page_nums, lang='tur', mode='hybrid', engine='auto',
+                  cache_path=None, cache_size=DEFAULT_CACHE_SIZE, checkpoint_path=None, pdf_hash=None,
+                  metrics_path=None, dpi=DEFAULT_DPI, two_tier=None):
+    """Bir PDF'in ardışık sayfa grubunu işçi süreçte işler.
+
+    ``checkpoint_path`` verilirse her sayfa biter bitmez kontrol noktasına
+    yazılır; ``metrics_path`` verilirse aşama ölçümleri bu JSON satırı
+    dosyasına eklenir. Sonuçlarla birlikte bu grup için önbellek isabet/ıska
+    sayıları ve aşama toplamları döndürülür.
+    """
+    checkpoints = CheckpointStore(checkpoint_path) if checkpoint_path else None
+    metrics = Metrics(metrics_path) if metrics_path else None
+    results = []
+    try:
+        pages = extract_pages(pdf_path, page_nums, lang, mode, engine, cache_path, cache_size,
+                              metrics=metrics, dpi=dpi, two_tier=two_tier)
+        for page_num, page_text, source in pages:
+            if checkpoints is not None:
+                checkpoints.save_page(pdf_hash, page_num, page_text, source)
+            results.append((page_num, page_text, source))
+    finally:
+        if checkpoints is not None:
+            checkpoints.close()
+        if metrics is not None:
+            metrics.close()
+    stage_totals = metrics.snapshot() if metrics is not None else {}
+    return pdf_path, results, pages.cache_stats(), stage_totals
+
+
+def _chunks(page_nums, chunk_size):
+    return [page_nums[first:first + chunk_size] for first in range(0, len(page_nums), chunk_size)]
+
+
+def results_path(pdf_path):
+    return os.path.splitext(pdf_path)[0] + '_ocr_results.txt'
+
+
+def find_pdfs(paths):
+    """Verilen dosya ve dizinlerdeki PDF'leri sıralı olarak listeler."""
+    pdf_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            pdf_paths.extend(sorted(glob.glob(os.path.join(path, '**', '*.pdf'), recursive=True)))
+        else:
+            pdf_paths.append(path)
+    return pdf_paths
+
+
+def format_sources(sources):
+    """Sayfaların hangi yoldan işlendiğini özetleyen log satırı."""
+    return (f"{sources.get('text', 0)} sayfa metin katmanından, "
+            f"{sources.get('ocr', 0)} sayfa OCR ile işlendi")
+
+
+class _Document:
+    """Toplu çalıştırmada bir PDF'in sırasız gelen sayfalarını toplayan durum."""
+
+    def __init__(self, pdf_path, pdf_hash=None, db_writer=None, metrics=None, exporter=None, ner=None):
+        self.pdf_path = pdf_path
+        self.pdf_hash = pdf_hash
+        self.db_writer = db_writer
+        self.exporter = exporter
+        self.enricher = NerEnricher(self._emit, ner, metrics) if ner is not None else None
+        self.metrics = metrics
+        self.txt_path = results_path(pdf_path)
+        # Yarım kalan çalıştırma eksik bir sonuç dosyası bırakmasın
+        self.tmp_path = self.txt_path + '.part'
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        self.stream = AnnouncementStream(page_sink=self.file.write, source_hash=pdf_hash)
+        self.sources = {}
+        self.page_count = 0
+        self.announcement_count = 0
+
+    def add_page(self, page_num, page_text, source):
+        with timed(self.metrics, 'parse', pdf=self.pdf_path, page=page_num, nbytes=len(page_text)) as fields:
+            completed = self.stream.add_page(page_num, page_text)
+            fields['announcements'] = len(completed)
+        self._save(completed)
+        self.sources[source] = self.sources.get(source, 0) + 1
+        self.page_count += 1
+
+    def close(self):
+        self._save(self.stream.close())
+        if self.enricher is not None:
+            self.enricher.close()
+        self.file.close()
+        os.replace(self.tmp_path, self.txt_path)
+
+    def discard(self):
+        """Yarım kalan belgeyi bırakır: NER'i bekleyen ilanlar atılır, geçici sonuç dosyası silinir.
+
+        Sayfalar kontrol noktasında olduğundan sonraki çalıştırma belgeyi
+        yeniden ayrıştırıp atılan ilanları da yazar.
+        """
+        if self.enricher is not None:
+            self.enricher.discard()
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def _save(self, completed):
+        self.announcement_count += len(completed)
+        if not completed:
+            return
+        if self.enricher is not None:
+            self.enricher.put(completed)
+        else:
+            self._emit(completed)
+
+    def _emit(self, completed):
+        if self.db_writer is not None:
+            self.db_writer.put(completed)
+        if self.exporter is not None:
+            self.exporter.write(completed)
+
+
+def run_batch(pdf_paths, workers=None, lang='tur', mode='hybrid', engine='auto',
+              chunk_size=DEFAULT_CHUNK_SIZE, cache_path=None, cache_size=DEFAULT_CACHE_SIZE,
+              db_path=None, checkpoint_path=None, metrics_path=None, prometheus_path=None,
+              dpi=DEFAULT_DPI, export_path=None, export_batch_size=DEFAULT_EXPORT_BATCH_SIZE, two_tier=None,
+              ner=None, log=print):
+    """PDF'lerin tüm sayfalarını havuza dağıtır, sonuçları sayfa sırasıyla birleştirip yazar.
+
+    Her PDF için ``<ad>_ocr_results.txt`` dosyası sayfalar geldikçe yazılır,
+    ilanlar da sayfalar tamamlandıkça ayrıştırılır. ``db_path`` verilirse
+    ilanlar tek bir yazıcı iş parçacığı üzerinden veritabanına yazılır; işçi
+    süreçler veritabanına hiç dokunmaz. ``checkpoint_path`` verilirse biten
+    sayfalar kontrol noktasına yazılır ve yarıda kalmış bir çalıştırma
+    kaydedilmiş sayfaları yeniden işlemeden devam eder. ``metrics_path``
+    verilirse tüm süreçlerin aşama ölçümleri bu JSON satırı dosyasına,
+    ``prometheus_path`` verilirse toplamlar her belge bitişinde Prometheus
+    textfile'ına yazılır. ``dpi`` sayı ya da ``'auto'`` olabilir. ``two_tier``
+    verilirse OCR iki aşamalı yapılır (bkz. ocr.TwoTier). ``ner`` (bkz. ner.Ner)
+    verilirse ilanlar ana süreçte NER ile zenginleştirilip öyle yazılır.
+    ``export_path`` verilirse ilanlar ayrıştırıldıkça bu JSONL ya da Parquet
+    dosyasına da yazılır (veritabanı kapalıyken de). Yazılan yolların listesi
+    döndürülür.
+    """
+    workers = workers or os.cpu_count() or 1
+    metrics = Metrics(metrics_path, prometheus_path) if metrics_path or prometheus_path else None
+    checkpoints = CheckpointStore(checkpoint_path) if checkpoint_path else None
+    page_counts = {}
+    pdf_hashes = {}
+    restored = {}
+    remaining = {}
+    for pdf_path in pdf_paths:
+        page_counts[pdf_path] = count_pages(pdf_path)
+        log(f"{os.path.basename(pdf_path)}: {page_counts[pdf_path]} sayfa")
+        # Özet, ilanların kaynağı olarak veritabanına da yazılır
+        pdf_hashes[pdf_path] = file_hash(pdf_path)
+        if checkpoints is not None:
+            restored[pdf_path] = checkpoints.start(pdf_hashes[pdf_path], pdf_path, page_counts[pdf_path])
+            if restored[pdf_path]:
+                log(f"{os.path.basename(pdf_path)}: {len(restored[pdf_path])} sayfa kontrol noktasından "
+                    f"geri yüklendi, kalan sayfalardan devam ediliyor")
+        remaining[pdf_path] = [page_num for page_num in range(page_counts[pdf_path])
+                               if page_num not in restored.get(pdf_path, {})]
+    total_pages = sum(page_counts.values())
+    pending_pages = sum(len(page_nums) for page_nums in remaining.values())
+    log(f"Toplam {len(pdf_paths)} PDF, {total_pages} sayfa ({pending_pages} sayfa işlenecek), "
+        f"{workers} işçi süreç")
+
+    documents = {}
+    db_writer = None
+    if db_path:
+        db_writer = DatabaseWriter(db_path, metrics=metrics)
+        db_writer.start()
+    exporter = open_exporter(export_path, batch_size=export_batch_size) if export_path else None
+    written = []
+    finished = []
+
+    def open_document(pdf_path):
+        document = documents[pdf_path] = _Document(pdf_path, pdf_hashes[pdf_path], db_writer, metrics, exporter, ner)
+        for page_num, (page_text, source) in sorted(restored.pop(pdf_path, {}).items()):
+            document.add_page(page_num, page_text, source)
+        return document
+
+    def finish_document(pdf_path):
+        document = documents.pop(pdf_path)
+        document.close()
+        if checkpoints is not None:
+            checkpoints.finish(pdf_hashes[pdf_path])
+        written.append(document.txt_path)
+        finished.append(document)
+        log(f"Sonuçlar dosyaya yazıldı: {os.path.basename(document.txt_path)} "
+            f"({format_sources(document.sources)}, {document.announcement_count} ilan)")
+        if metrics is not None:
+            metrics.write_prometheus()
+
+    done = 0
+    cache_hits = cache_misses = 0
+    start = time.perf_counter()
+    succeeded = False
+    try:
+        # Tüm sayfaları kontrol noktasında olan belgeler havuza hiç gitmez
+        for pdf_path in pdf_paths:
+            if not remaining[pdf_path]:
+                open_document(pdf_path)
+                finish_document(pdf_path)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [
+                pool.submit(process_chunk, pdf_path, page_nums, lang, mode, engine, cache_path, cache_size,
+                            checkpoint_path, pdf_hashes[pdf_path], metrics_path, dpi, two_tier)
+                for pdf_path in pdf_paths
+                for page_nums in _chunks(remaining[pdf_path], chunk_size)
+            ]
+            try:
+                for future in as_completed(futures):
+                    pdf_path, results, (hits, misses), stage_totals = future.result()
+                    cache_hits += hits
+                    cache_misses += misses
+                    if metrics is not None:
+                        metrics.merge(stage_totals)
+                    document = documents.get(pdf_path) or open_document(pdf_path)
+                    for page_num, page_text, source in results:
+                        document.add_page(page_num, page_text, source)
+                    done += len(results)
+                    elapsed = time.perf_counter() - start
+                    log(f"[{done}/{pending_pages}] {os.path.basename(pdf_path)} sayfa "
+                        f"{results[0][0] + 1}-{results[-1][0] + 1} ({done / elapsed:.2f} sayfa/sn)")
+
+                    if document.page_count == page_counts[pdf_path]:
+                        finish_document(pdf_path)
+            except BaseException:
+                # Henüz başlamamış parçalar çalıştırılmaz; havuz yalnızca çalışanları bekler
+                for future in futures:
+                    future.cancel()
+                raise
+        succeeded = True
+    finally:
+        try:
+            # Yarım kalan belgelerin geçici sonuç dosyaları bırakılmaz; sayfaları kontrol noktasındadır
+            for document in documents.values():
+                document.discard()
+            if exporter is not None:
+                exporter.close()
+                if succeeded:
+                    log(f"{exporter.record_count} ilan dışa aktarıldı: {export_path}")
+                elif os.path.exists(export_path):
+                    # Eksik bir dışa aktarım dosyası tamamlanmış gibi görünmesin
+                    os.remove(export_path)
+            if db_writer is not None:
+                db_writer.close()
+                log(db_writer.stats())
+                # Belgeler, ilanlarının hepsi yazıldıktan sonra işlenmiş olarak kaydedilir;
+                # çalıştırma yarıda kalsa da biten belgeler kaydedilir
+                conn = connect(db_path)
+                try:
+                    for document in finished:
+                        record_document(conn, document.pdf_hash, document.pdf_path, document.page_count,
+                                        document.announcement_count)
+                finally:
+                    conn.close()
+        finally:
+            if checkpoints is not None:
+                checkpoints.close()
+            if metrics is not None and not succeeded:
+                metrics.close()
+
+    elapsed = time.perf_counter() - start
+    rate = pending_pages / elapsed if elapsed > 0 else 0.0
+    log(f"Tamamlandı: {pending_pages} sayfa {elapsed:.1f} sn'de ({rate:.2f} sayfa/sn)")
+    if cache_path:
+        log(format_cache_stats(cache_hits, cache_misses))
+    if metrics is not None:
+        for line in metrics.summary():
+            log(line)
+        metrics.close()
+    return written
@@ -0,0 +1,115 @@
+"""Eşik uygulanmış sütun görüntüsünün içeriğine göre anahtarlanan disk üstü OCR sonuç önbelleği."""
+import hashlib
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = 'ocr_cache.db'
+DEFAULT_CACHE_SIZE = 1024 * 1024 * 1024  # 1 GB
+
+# Sınır aşıldığında boyut bu orana inene kadar en eski kayıtlar silinir;
+# böylece her eklemede yeniden tahliye yapılmaz
+EVICT_TARGET_RATIO = 0.9
+
+
+class OCRCache:
+    """OCR çıktılarını SQLite dosyasında tutan, boyut sınırlı LRU önbellek.
+
+    Anahtar; görüntü pikselleri, boyutu ve OCR parametrelerinin (dil, motor,
+    psm) özetidir. Aynı dosya birden çok süreç tarafından paylaşılabilir.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_CACHE_SIZE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS ocr_cache (
+            key TEXT PRIMARY KEY,
+            text TEXT,
+            size INTEGER,
+            last_access REAL
+        )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_access ON ocr_cache(last_access)')
+        self.conn.commit()
+        self.total_bytes = self._stored_bytes()
+
+    @staticmethod
+    def make_key(image, lang, engine, psm):
+        import numpy as np
+        image = np.ascontiguousarray(image)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{lang}|{engine}|{psm}|{image.shape}|{image.dtype}".encode())
+        digest.update(memoryview(image).cast('B'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        row = self.conn.execute('SELECT text FROM ocr_cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute('UPDATE ocr_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+        self.conn.commit()
+        return row[0]
+
+    def put(self, key, text):
+        size = len(text.encode('utf-8')) + len(key)
+        # Aynı anahtar yeniden yazılırsa eski kaydın boyutu toplamdan düşülür
+        row = self.conn.execute('SELECT size FROM ocr_cache WHERE key = ?', (key,)).fetchone()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO ocr_cache (key, text, size, last_access) VALUES (?, ?, ?, ?)',
+            (key, text, size, time.time())
+        )
+        self.conn.commit()
+        self.total_bytes += size - (row[0] if row is not None else 0)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """En uzun süredir kullanılmayan kayıtları boyut sınırının altına inene kadar siler."""
+        # Diğer süreçlerin eklemelerini de hesaba katmak için gerçek boyutu yeniden oku
+        self.total_bytes = self._stored_bytes()
+        target = int(self.max_bytes * EVICT_TARGET_RATIO)
+        cursor = self.conn.execute('SELECT key, size FROM ocr_cache ORDER BY last_access')
+        evicted = []
+        for key, size in cursor:
+            if self.total_bytes <= target:
+                break
+            evicted.append((key,))
+            self.total_bytes -= size
+        self.conn.executemany('DELETE FROM ocr_cache WHERE key = ?', evicted)
+        self.conn.commit()
+
+    def _stored_bytes(self):
+        return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM ocr_cache').fetchone()[0]
+
+    def stats(self):
+        return self.hits, self.misses
+
+    def close(self):
+        self.conn.close()
+
+
+_local = threading.local()
+
+
+def open_cache(path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_CACHE_SIZE):
+    """İş parçacığı başına bir kez açılan önbelleği döndürür (SQLite bağlantıları paylaşılamaz)."""
+    caches = getattr(_local, 'caches', None)
+    if caches is None:
+        caches = _local.caches = {}
+    if path not in caches:
+        caches[path] = OCRCache(path, max_bytes)
+    return caches[path]
+
+
+def format_cache_stats(hits, misses):
+    total = hits + misses
+    ratio = hits / total * 100 if total else 0.0
+    return f"OCR önbelleği: {hits} isabet, {misses} ıska (%{ratio:.0f} isabet)"
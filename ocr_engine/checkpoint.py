@@ -0,0 +1,98 @@
+"""Uzun PDF'ler için sayfa düzeyinde kontrol noktaları (checkpoint).
+
+Her sayfanın çıkarılan metni, PDF içeriğinin özetiyle anahtarlanmış bir
+yan SQLite dosyasına yazılır. İş yarıda kalırsa (Tesseract çökmesi, bellek
+yetersizliği, pencerenin kapatılması) sonraki çalıştırma kayıtlı sayfaları
+yeniden OCR'dan geçirmeden ilk bitmemiş sayfadan devam eder.
+"""
+import hashlib
+import sqlite3
+import time
+
+DEFAULT_CHECKPOINT_PATH = 'checkpoints.db'
+
+
+def file_hash(path, block_size=1024 * 1024):
+    """Dosya içeriğinin SHA-256 özetini döndürür."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CheckpointStore:
+    """Sayfa metinlerini ve belge durumunu tutan kontrol noktası deposu.
+
+    Aynı dosya birden çok süreç ve iş parçacığı tarafından kullanılabilir;
+    her biri kendi örneğini açmalıdır.
+    """
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS checkpoint_documents (
+            pdf_hash TEXT PRIMARY KEY,
+            pdf_path TEXT,
+            total_pages INTEGER,
+            status TEXT,
+            updated_at REAL
+        )
+        ''')
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS checkpoint_pages (
+            pdf_hash TEXT,
+            page_num INTEGER,
+            page_text TEXT,
+            source TEXT,
+            updated_at REAL,
+            PRIMARY KEY (pdf_hash, page_num)
+        )
+        ''')
+        self.conn.commit()
+
+    def start(self, pdf_hash, pdf_path, total_pages):
+        """Belgeyi işleniyor olarak işaretler ve daha önce kaydedilmiş sayfaları döndürür.
+
+        Dönen sözlük ``{page_num: (page_text, source)}`` biçimindedir.
+        """
+        self.conn.execute('''
+        INSERT INTO checkpoint_documents (pdf_hash, pdf_path, total_pages, status, updated_at)
+        VALUES (?, ?, ?, 'running', ?)
+        ON CONFLICT(pdf_hash) DO UPDATE SET
+            pdf_path = excluded.pdf_path,
+            total_pages = excluded.total_pages,
+            status = 'running',
+            updated_at = excluded.updated_at
+        ''', (pdf_hash, pdf_path, total_pages, time.time()))
+        self.conn.commit()
+        return self.load_pages(pdf_hash)
+
+    def load_pages(self, pdf_hash):
+        rows = self.conn.execute(
+            'SELECT page_num, page_text, source FROM checkpoint_pages WHERE pdf_hash = ?', (pdf_hash,)
+        )
+        return {page_num: (page_text, source) for page_num, page_text, source in rows}
+
+    def save_page(self, pdf_hash, page_num, page_text, source):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO checkpoint_pages (pdf_hash, page_num, page_text, source, updated_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (pdf_hash, page_num, page_text, source, time.time())
+        )
+        self.conn.commit()
+
+    def finish(self, pdf_hash):
+        """Belge tamamlandı: durum güncellenir, sayfa metinleri artık gerekmediği için silinir."""
+        self.conn.execute('DELETE FROM checkpoint_pages WHERE pdf_hash = ?', (pdf_hash,))
+        self.conn.execute(
+            "UPDATE checkpoint_documents SET status = 'done', updated_at = ? WHERE pdf_hash = ?",
+            (time.time(), pdf_hash)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
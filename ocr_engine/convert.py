@@ -0,0 +1,124 @@
+"""Tek bir PDF'i baştan sona işleyen, Qt'den bağımsız dönüştürme akışı.
+
+Masaüstü arayüzündeki dönüştürme iş parçacığı ve klasör izleme servisi
+(bkz. watch.py) aynı fonksiyonu kullanır; arayüze özgü kısımlar (log ve
+ilerleme sinyalleri) geri çağırma fonksiyonları olarak verilir.
+"""
+import os
+
+from .batch import format_sources, results_path
+from .cache import DEFAULT_CACHE_PATH, format_cache_stats
+from .checkpoint import DEFAULT_CHECKPOINT_PATH, CheckpointStore, file_hash
+from .metrics import timed
+from .ner import NerEnricher
+from .pages import DEFAULT_DPI, count_pages
+from .parser import AnnouncementStream
+from .pipeline import DEFAULT_MEMORY_CAP, DEFAULT_OCR_WORKERS, PagePipeline
+
+
+def convert_pdf(pdf_path, mode='hybrid', save=None, metrics=None, log=print, progress=None,
+                pdf_hash=None, checkpoint_path=DEFAULT_CHECKPOINT_PATH, cache_path=DEFAULT_CACHE_PATH,
+                ocr_workers=DEFAULT_OCR_WORKERS, memory_cap=DEFAULT_MEMORY_CAP, two_tier=None, ner=None,
+                ocr_processes=False, dpi=DEFAULT_DPI):
+    """PDF'in metnini çıkarıp sonuç dosyasına yazar, tamamlanan ilanları ``save`` ile gönderir.
+
+    Her ilan sözlüğüne kaynak PDF'in özeti (``source_hash``) ve ilanın
+    yayıldığı sayfalar eklenir. ``progress(page_num, done_pages, total_pages)``
+    yeni işlenen her sayfadan sonra çağrılır. ``pdf_hash`` verilmezse
+    hesaplanır. ``two_tier`` verilirse OCR iki aşamalı yapılır (bkz.
+    ocr.TwoTier). ``ner`` (bkz. ner.Ner) verilirse ilanlar kaydedilmeden önce
+    NER ile zenginleştirilir. ``ocr_processes`` açıkken OCR iş parçacıkları yerine
+    süreçlerde yapılır (bkz. pipeline.PagePipeline). ``dpi`` sayı ya da ``'auto'``
+    olabilir (bkz. pages.iter_pages).
+    ``(txt_path, total_pages, announcement_count)`` döndürülür.
+    """
+    # Önce toplam sayfa sayısını al (görüntüleme yapmadan, PDF bilgisinden)
+    log("Toplam sayfa sayısı hesaplanıyor...")
+    total_pages = count_pages(pdf_path)
+    log(f"Toplam {total_pages} sayfa tespit edildi")
+
+    # Sonuç dosyası sayfalar geldikçe yazılır; iş yarıda kalırsa eksik dosya bırakmamak için
+    # önce geçici dosyaya yazılıp sonda yerine taşınır
+    txt_path = results_path(pdf_path)
+    tmp_path = txt_path + '.part'
+    log(f"Sonuçlar dosyaya yazılıyor: {os.path.basename(txt_path)}")
+
+    # Biten her sayfa kontrol noktasına yazılır; yarıda kalan bir PDF yeniden açıldığında
+    # kayıtlı sayfalar OCR'dan geçirilmeden ilk bitmemiş sayfadan devam edilir
+    pdf_hash = pdf_hash or file_hash(pdf_path)
+    checkpoints = CheckpointStore(checkpoint_path)
+    try:
+        restored = checkpoints.start(pdf_hash, pdf_path, total_pages)
+        if restored:
+            log(f"{len(restored)} sayfa kontrol noktasından geri yüklendi, kalan sayfalardan devam ediliyor")
+        remaining = [page_num for page_num in range(total_pages) if page_num not in restored]
+
+        sources = {}
+        announcement_count = 0
+        done_pages = 0
+
+        # NER açıksa ilanlar parça parça zenginleştirilip öyle kaydedilir
+        enricher = NerEnricher(save, ner, metrics) if ner is not None and save is not None else None
+
+        def save_completed(completed):
+            nonlocal announcement_count
+            if completed:
+                if enricher is not None:
+                    enricher.put(completed)
+                elif save is not None:
+                    save(completed)
+                announcement_count += len(completed)
+
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                # Tamamlanan ilanlar PDF'in geri kalanı beklenmeden ayrıştırılıp kaydedilir
+                stream = AnnouncementStream(page_sink=f.write, source_hash=pdf_hash)
+
+                def add_page(page_num, page_text, source):
+                    nonlocal done_pages
+                    sources[source] = sources.get(source, 0) + 1
+                    with timed(metrics, 'parse', pdf=pdf_path, page=page_num, nbytes=len(page_text)) as fields:
+                        completed = stream.add_page(page_num, page_text)
+                        fields['announcements'] = len(completed)
+                    save_completed(completed)
+                    done_pages += 1
+
+                for page_num, (page_text, source) in sorted(restored.items()):
+                    add_page(page_num, page_text, source)
+                # Görüntüleme, ön işleme ve OCR sınırlı kuyruklarla birbirine bağlanıp aynı anda çalışır
+                pipeline = PagePipeline(
+                    pdf_path, remaining, lang='tur', mode=mode, cache_path=cache_path,
+                    ocr_workers=ocr_workers, memory_cap=memory_cap, metrics=metrics, log=log, two_tier=two_tier,
+                    ocr_processes=ocr_processes, dpi=dpi)
+                for page_num, page_text, source in pipeline:
+                    checkpoints.save_page(pdf_hash, page_num, page_text, source)
+                    add_page(page_num, page_text, source)
+                    if progress is not None:
+                        progress(page_num, done_pages, total_pages)
+
+                save_completed(stream.close())
+                if enricher is not None:
+                    enricher.close()
+                    log(f"NER: {enricher.entity_count} kişi/kurum adı eklendi")
+            os.replace(tmp_path, txt_path)
+        except BaseException:
+            # Yarım kalan sonuç dosyası diskte bırakılmaz; işlenen sayfalar kontrol noktasındadır.
+            # NER'i bekleyen ilanlar da atılır, sonraki çalıştırma onları yeniden ayrıştırır
+            if enricher is not None:
+                enricher.discard()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        checkpoints.finish(pdf_hash)
+    finally:
+        checkpoints.close()
+
+    log(format_sources(sources))
+    log(format_cache_stats(*pipeline.cache_stats()))
+    log(f"{announcement_count} ilan ayrıştırılıp veritabanına gönderildi")
+    if metrics is not None:
+        log("Aşama süreleri (tüm dosyalar):")
+        for line in metrics.summary():
+            log(f"- {line}")
+        metrics.write_prometheus()
+    return txt_path, total_pages, announcement_count
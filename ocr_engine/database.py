@@ -0,0 +1,705 @@
+"""Ayrıştırılmış ilanları company_records.db veritabanına yazan bileşenler."""
+import queue
+import sqlite3
+import threading
+import time
+
+from .metrics import timed
+
+DEFAULT_DB_PATH = 'company_records.db'
+# Bir işlemde (transaction) yazılan en fazla ilan sayısı
+DEFAULT_BATCH_SIZE = 500
+# Kuyrukta bu kadar saniye yeni ilan gelmezse bekleyen satırlar yine yazılır
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_QUEUE_SIZE = 64
+
+# Her sürüm, veritabanını bir önceki sürümden getiren ifadelerdir; uygulanan
+# son sürüm PRAGMA user_version'da tutulur
+MIGRATIONS = [
+    # 1: ilk tablolar
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS companies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mersis_no TEXT,
+            ticaret_sicil_no TEXT,
+            ticaret_unvani TEXT,
+            adres TEXT,
+            city TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS announcements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER,
+            ilan_sira_no TEXT,
+            tescil_edilen_hususlar TEXT,
+            tescile_delil_olan_belgeler TEXT,
+            details_text TEXT,
+            FOREIGN KEY(company_id) REFERENCES companies(id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS persons (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER,
+            kimlik_no TEXT,
+            isim TEXT,
+            adres TEXT,
+            FOREIGN KEY(company_id) REFERENCES companies(id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS konkordato (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER,
+            mahkeme_karari_tarihi TEXT,
+            baslangic_tarihi TEXT,
+            bitis_tarihi TEXT,
+            komiser_kimlik_no TEXT,
+            komiser_adres TEXT,
+            komiser_adi TEXT,
+            komiser_gorev_bitis_tarihi TEXT,
+            FOREIGN KEY(company_id) REFERENCES companies(id)
+        )
+        ''',
+    ],
+    # 2: aynı MERSİS numaralı şirketleri ve tekrar eden ilanları birleştir,
+    # indeksleri ve pay devri tablolarını ekle
+    [
+        '''
+        CREATE TEMP TABLE company_merge AS
+        SELECT c.id AS old_id, k.keep_id
+        FROM companies c
+        JOIN (SELECT mersis_no, MIN(id) AS keep_id FROM companies
+              WHERE mersis_no IS NOT NULL GROUP BY mersis_no HAVING COUNT(*) > 1) k
+          ON c.mersis_no = k.mersis_no
+        WHERE c.id <> k.keep_id
+        ''',
+        '''
+        UPDATE announcements SET company_id = (SELECT keep_id FROM company_merge WHERE old_id = company_id)
+        WHERE company_id IN (SELECT old_id FROM company_merge)
+        ''',
+        '''
+        UPDATE persons SET company_id = (SELECT keep_id FROM company_merge WHERE old_id = company_id)
+        WHERE company_id IN (SELECT old_id FROM company_merge)
+        ''',
+        '''
+        UPDATE konkordato SET company_id = (SELECT keep_id FROM company_merge WHERE old_id = company_id)
+        WHERE company_id IN (SELECT old_id FROM company_merge)
+        ''',
+        'DELETE FROM companies WHERE id IN (SELECT old_id FROM company_merge)',
+        'DROP TABLE company_merge',
+        '''
+        DELETE FROM announcements WHERE ilan_sira_no IS NOT NULL AND id NOT IN (
+            SELECT MIN(id) FROM announcements WHERE ilan_sira_no IS NOT NULL GROUP BY company_id, ilan_sira_no
+        )
+        ''',
+        '''
+        DELETE FROM persons WHERE id NOT IN (
+            SELECT MIN(id) FROM persons GROUP BY company_id, kimlik_no, isim, adres
+        )
+        ''',
+        '''
+        DELETE FROM konkordato WHERE id NOT IN (
+            SELECT MIN(id) FROM konkordato
+            GROUP BY company_id, mahkeme_karari_tarihi, baslangic_tarihi, bitis_tarihi,
+                     komiser_kimlik_no, komiser_adres, komiser_adi, komiser_gorev_bitis_tarihi
+        )
+        ''',
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_companies_mersis_no ON companies(mersis_no)',
+        'CREATE INDEX IF NOT EXISTS idx_companies_ticaret_sicil_no ON companies(ticaret_sicil_no)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_announcements_company_ilan ON announcements(company_id, ilan_sira_no)',
+        'CREATE INDEX IF NOT EXISTS idx_announcements_ilan_sira_no ON announcements(ilan_sira_no)',
+        'CREATE INDEX IF NOT EXISTS idx_persons_company_id ON persons(company_id)',
+        'CREATE INDEX IF NOT EXISTS idx_persons_kimlik_no ON persons(kimlik_no)',
+        'CREATE INDEX IF NOT EXISTS idx_konkordato_company_id ON konkordato(company_id)',
+        '''
+        CREATE TABLE IF NOT EXISTS pay_devri (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER,
+            announcement_id INTEGER,
+            devir_eden_kimlik_no TEXT,
+            devir_eden_adi TEXT,
+            devredilen_tutar TEXT,
+            devredilen_pay_adedi TEXT,
+            devir_alici_kimlik_no TEXT,
+            devir_alici_adi TEXT,
+            FOREIGN KEY(company_id) REFERENCES companies(id),
+            FOREIGN KEY(announcement_id) REFERENCES announcements(id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS shareholders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER,
+            announcement_id INTEGER,
+            adi TEXT,
+            beher_pay_degeri TEXT,
+            pay_adedi TEXT,
+            toplam_tutar TEXT,
+            FOREIGN KEY(company_id) REFERENCES companies(id),
+            FOREIGN KEY(announcement_id) REFERENCES announcements(id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_pay_devri_company_id ON pay_devri(company_id)',
+        'CREATE INDEX IF NOT EXISTS idx_shareholders_company_id ON shareholders(company_id)',
+    ],
+]
+
+MIGRATIONS.append(
+    # 3: ilan metni, şirket unvanı ve şahıs adları için FTS5 tam metin indeksi.
+    # İndekslenen metin fold_turkish ile katlanmış halidir; satır kimlikleri
+    # (rowid) kaynak tablodaki kimliklerle aynıdır.
+    [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS announcements_fts USING fts5(text, tokenize='unicode61 remove_diacritics 2')",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(ticaret_unvani, tokenize='unicode61 remove_diacritics 2')",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS persons_fts USING fts5(isim, tokenize='unicode61 remove_diacritics 2')",
+        '''
+        INSERT INTO announcements_fts (rowid, text)
+        SELECT id, tr_fold(COALESCE(tescil_edilen_hususlar, '') || ' ' || COALESCE(details_text, ''))
+        FROM announcements
+        ''',
+        'INSERT INTO companies_fts (rowid, ticaret_unvani) SELECT id, tr_fold(ticaret_unvani) FROM companies',
+        'INSERT INTO persons_fts (rowid, isim) SELECT id, tr_fold(isim) FROM persons',
+    ]
+)
+
+MIGRATIONS.append(
+    # 4: kaynak bilgisi. İşlenen her PDF içerik özetiyle documents tablosuna
+    # yazılır; ilanlar hangi PDF'in hangi sayfalarından geldiğini tutar
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS documents (
+            file_hash TEXT PRIMARY KEY,
+            path TEXT,
+            page_count INTEGER,
+            announcement_count INTEGER,
+            processed_at REAL
+        )
+        ''',
+        'ALTER TABLE announcements ADD COLUMN source_hash TEXT',
+        'ALTER TABLE announcements ADD COLUMN page_start INTEGER',
+        'ALTER TABLE announcements ADD COLUMN page_end INTEGER',
+        'CREATE INDEX IF NOT EXISTS idx_announcements_source_hash ON announcements(source_hash)',
+    ]
+)
+
+MIGRATIONS.append(
+    # 5: MERSİS numarası olmayan şirketler için yedek doğal anahtar (sicil şehri +
+    # ticaret sicil no). Aynı anahtarlı şirketler ve tekrar eden ilanları
+    # birleştirilir; birleştirme sırasında ilan tekilliği indeksi geçici olarak kaldırılır
+    [
+        '''
+        CREATE TEMP TABLE company_merge AS
+        SELECT c.id AS old_id, k.keep_id
+        FROM companies c
+        JOIN (SELECT COALESCE(city, '') AS city_key, ticaret_sicil_no, MIN(id) AS keep_id FROM companies
+              WHERE mersis_no IS NULL AND ticaret_sicil_no IS NOT NULL
+              GROUP BY city_key, ticaret_sicil_no HAVING COUNT(*) > 1) k
+          ON COALESCE(c.city, '') = k.city_key AND c.ticaret_sicil_no = k.ticaret_sicil_no
+        WHERE c.mersis_no IS NULL AND c.id <> k.keep_id
+        ''',
+        'DROP INDEX idx_announcements_company_ilan',
+    ] + [
+        f'''
+        UPDATE {table} SET company_id = (SELECT keep_id FROM company_merge WHERE old_id = company_id)
+        WHERE company_id IN (SELECT old_id FROM company_merge)
+        '''
+        for table in ('announcements', 'persons', 'konkordato', 'pay_devri', 'shareholders')
+    ] + [
+        'DELETE FROM companies_fts WHERE rowid IN (SELECT old_id FROM company_merge)',
+        'DELETE FROM companies WHERE id IN (SELECT old_id FROM company_merge)',
+        'DROP TABLE company_merge',
+        '''
+        DELETE FROM announcements WHERE ilan_sira_no IS NOT NULL AND id NOT IN (
+            SELECT MIN(id) FROM announcements WHERE ilan_sira_no IS NOT NULL GROUP BY company_id, ilan_sira_no
+        )
+        ''',
+        'DELETE FROM announcements_fts WHERE rowid NOT IN (SELECT id FROM announcements)',
+        'DELETE FROM pay_devri WHERE announcement_id NOT IN (SELECT id FROM announcements)',
+        'DELETE FROM shareholders WHERE announcement_id NOT IN (SELECT id FROM announcements)',
+        '''
+        DELETE FROM persons WHERE id NOT IN (
+            SELECT MIN(id) FROM persons GROUP BY company_id, kimlik_no, isim, adres
+        )
+        ''',
+        'DELETE FROM persons_fts WHERE rowid NOT IN (SELECT id FROM persons)',
+        '''
+        DELETE FROM konkordato WHERE id NOT IN (
+            SELECT MIN(id) FROM konkordato
+            GROUP BY company_id, mahkeme_karari_tarihi, baslangic_tarihi, bitis_tarihi,
+                     komiser_kimlik_no, komiser_adres, komiser_adi, komiser_gorev_bitis_tarihi
+        )
+        ''',
+        'CREATE UNIQUE INDEX idx_announcements_company_ilan ON announcements(company_id, ilan_sira_no)',
+        '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_companies_city_sicil ON companies(COALESCE(city, ''), ticaret_sicil_no)
+        WHERE mersis_no IS NULL AND ticaret_sicil_no IS NOT NULL
+        ''',
+    ]
+)
+
+MIGRATIONS.append(
+    # 6: ilanın ham metninin özeti; şirket ya da ilan sıra numarası okunamamış
+    # ilanlar aynı PDF yeniden işlendiğinde (kaynak özeti, metin özeti) ile tanınır
+    [
+        'ALTER TABLE announcements ADD COLUMN text_hash TEXT',
+        'CREATE INDEX IF NOT EXISTS idx_announcements_source_text ON announcements(source_hash, text_hash)',
+    ]
+)
+
+MIGRATIONS.append(
+    # 7: şirket başına her şahıs (kimlik no + isim) bir kez tutulur
+    [
+        '''
+        DELETE FROM persons WHERE id NOT IN (
+            SELECT MIN(id) FROM persons GROUP BY company_id, kimlik_no, isim
+        )
+        ''',
+        'DELETE FROM persons_fts WHERE rowid NOT IN (SELECT id FROM persons)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_persons_company_kimlik_isim ON persons(company_id, kimlik_no, isim)',
+    ]
+)
+
+# Türkçe büyük/küçük harf ve OCR'ın karıştırdığı harf çiftleri tek biçime katlanır:
+# İ/I/ı/i -> i, Ğ/ğ -> g, Ş/ş -> s, Ç/ç -> c, Ö/ö -> o, Ü/ü -> u
+TURKISH_FOLD = str.maketrans('İIıĞğŞşÇçÖöÜü', 'iiiggssccoouu')
+
+# SQLite'ın tek sorguda kabul ettiği parametre sayısının güvenli altı
+MAX_QUERY_PARAMS = 500
+
+
+def fold_turkish(text):
+    """Metni Türkçe'ye uygun şekilde küçük harfe ve aksansız biçime katlar."""
+    if text is None:
+        return None
+    return text.translate(TURKISH_FOLD).lower()
+
+
+def migrate(conn):
+    """Uygulanmamış şema sürümlerini sırayla, her biri tek işlemde uygular."""
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for target, statements in enumerate(MIGRATIONS[version:], version + 1):
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Başka bir bağlantı kilidi beklerken şemayı güncellemiş olabilir
+            if conn.execute('PRAGMA user_version').fetchone()[0] >= target:
+                conn.execute('COMMIT')
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {target}')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+
+def connect(db_path=DEFAULT_DB_PATH):
+    """Yazma için ayarlanmış bir bağlantı açar ve şemayı günceller."""
+    conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MB
+    conn.create_function('tr_fold', 1, fold_turkish, deterministic=True)
+    migrate(conn)
+    return conn
+
+
+def _select_in(conn, query, values, params=()):
+    """``IN (...)`` sorgusunu parametre sınırını aşmayacak parçalar halinde çalıştırır.
+
+    ``params`` sorguda ``IN`` listesinden önce gelen sabit parametrelerdir.
+    """
+    rows = []
+    values = list(values)
+    for first in range(0, len(values), MAX_QUERY_PARAMS):
+        chunk = values[first:first + MAX_QUERY_PARAMS]
+        placeholders = ', '.join('?' * len(chunk))
+        rows.extend(conn.execute(query.format(placeholders), (*params, *chunk)).fetchall())
+    return rows
+
+
+def _next_id(conn, table):
+    return conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0] + 1
+
+
+def _sicil_key(data):
+    """MERSİS numarası olmayan şirketin yedek doğal anahtarı: (sicil şehri, ticaret sicil no)."""
+    ticaret_sicil_no = data.get('ticaret_sicil_no')
+    if not ticaret_sicil_no:
+        return None
+    return data.get('city') or '', ticaret_sicil_no
+
+
+def _replay_key(data):
+    """Şirket ve ilan sıra numarasıyla tanınamayan ilanın yedek anahtarı: (kaynak özeti, metin özeti).
+
+    Şirket anahtarı (MERSİS ya da sicil) ve ilan sıra numarası olan ilanlar
+    zaten bunlarla tekilleştirildiğinden None döner.
+    """
+    keyed = data.get('ilan_sira_no') is not None and (data.get('mersis_no') or _sicil_key(data) is not None)
+    if keyed or not data.get('source_hash') or not data.get('text_hash'):
+        return None
+    return data['source_hash'], data['text_hash']
+
+
+def _committed(conn, replay_keys):
+    """``replay_keys`` içinden veritabanında zaten kayıtlı olanların kümesi."""
+    text_hashes = {}
+    for source_hash, text_hash in replay_keys:
+        text_hashes.setdefault(source_hash, set()).add(text_hash)
+    committed = set()
+    for source_hash, hashes in text_hashes.items():
+        committed.update(_select_in(
+            conn, 'SELECT source_hash, text_hash FROM announcements WHERE source_hash = ? AND text_hash IN ({})',
+            hashes, (source_hash,)
+        ))
+    return committed
+
+
+def write_announcements(conn, parsed_announcements):
+    """İlanları tek bir işlemde, tablo başına tek executemany ile yazar.
+
+    MERSİS numarası olan şirketler ``mersis_no`` üzerinden güncellenir
+    (upsert); olmayanlar sicil şehri ve ticaret sicil numarasıyla eşlenip
+    güncellenir, eşleşme yoksa yeni satır olarak eklenir. Aynı şirket için
+    aynı ilan sıra numarası zaten kayıtlıysa ilan ve ona bağlı şahıs,
+    konkordato ve pay devri satırları yeniden yazılmaz; böylece aynı sayı
+    yeniden işlendiğinde hiçbir satır eklenmez. Şirket ya da ilan sıra
+    numarası okunamamış ilanlar, aynı PDF'ten (``source_hash``) aynı ham
+    metinli (``text_hash``) ilan zaten kayıtlıysa atlanır; yarıda kalan bir iş
+    kontrol noktasından devam ederken yeniden ayrıştırılan sayfaların ilanları
+    böylece ikinci kez yazılmaz. Şirkette aynı kimlik numarası ve isimle
+    kayıtlı şahıs yeniden eklenmez. Tam metin indeksi aynı işlemde
+    güncellenir. Yazılan toplam satır sayısı döndürülür.
+    """
+    if not parsed_announcements:
+        return 0
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        replay_keys = [_replay_key(data) for data in parsed_announcements]
+        committed = _committed(conn, {key for key in replay_keys if key is not None})
+        if committed:
+            parsed_announcements = [data for data, key in zip(parsed_announcements, replay_keys)
+                                    if key is None or key not in committed]
+
+        # Şirketler: MERSİS numarası olanlar upsert, olmayanlar önceden ayrılmış kimlikle eklenir
+        upserts = [data for data in parsed_announcements if data.get('mersis_no')]
+        conn.executemany('''
+        INSERT INTO companies (mersis_no, ticaret_sicil_no, ticaret_unvani, adres, city)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(mersis_no) DO UPDATE SET
+            ticaret_sicil_no = COALESCE(excluded.ticaret_sicil_no, ticaret_sicil_no),
+            ticaret_unvani = COALESCE(excluded.ticaret_unvani, ticaret_unvani),
+            adres = COALESCE(excluded.adres, adres),
+            city = COALESCE(excluded.city, city)
+        ''', [(
+            data.get('mersis_no'),
+            data.get('ticaret_sicil_no'),
+            data.get('ticaret_unvani'),
+            data.get('adres'),
+            data.get('city')
+        ) for data in upserts])
+        company_ids = dict(_select_in(
+            conn, 'SELECT mersis_no, id FROM companies WHERE mersis_no IN ({})',
+            {data['mersis_no'] for data in upserts}
+        ))
+
+        # MERSİS numarası olmayanlar: kayıtlı şirketler sicil şehri + sicil no ile bulunup güncellenir
+        sicil_keys = {_sicil_key(data) for data in parsed_announcements if not data.get('mersis_no')}
+        sicil_keys.discard(None)
+        sicil_ids = {}
+        for company_id, city, ticaret_sicil_no in _select_in(
+                conn, 'SELECT id, city, ticaret_sicil_no FROM companies '
+                      'WHERE mersis_no IS NULL AND ticaret_sicil_no IN ({})',
+                {ticaret_sicil_no for _, ticaret_sicil_no in sicil_keys}):
+            sicil_ids[(city or '', ticaret_sicil_no)] = company_id
+        matched_ids = set(sicil_ids.values())
+        updates = [(data.get('ticaret_unvani'), data.get('adres'), sicil_ids[_sicil_key(data)])
+                   for data in parsed_announcements
+                   if not data.get('mersis_no') and _sicil_key(data) in sicil_ids]
+        conn.executemany('''
+        UPDATE companies SET
+            ticaret_unvani = COALESCE(?, ticaret_unvani),
+            adres = COALESCE(?, adres)
+        WHERE id = ?
+        ''', updates)
+
+        next_company_id = _next_id(conn, 'companies')
+        companies = []
+        announcement_company_ids = []
+        for data in parsed_announcements:
+            if data.get('mersis_no'):
+                announcement_company_ids.append(company_ids[data['mersis_no']])
+                continue
+            key = _sicil_key(data)
+            if key in sicil_ids:
+                announcement_company_ids.append(sicil_ids[key])
+                continue
+            if key is not None:
+                # Aynı parçadaki sonraki ilanlar bu yeni satırı kullanır
+                sicil_ids[key] = next_company_id
+            companies.append((
+                next_company_id,
+                data.get('mersis_no'),
+                data.get('ticaret_sicil_no'),
+                data.get('ticaret_unvani'),
+                data.get('adres'),
+                data.get('city')
+            ))
+            announcement_company_ids.append(next_company_id)
+            next_company_id += 1
+
+        # Bu şirketler için zaten kayıtlı ilanlar ve şahıslar atlanır
+        existing = set(_select_in(
+            conn, 'SELECT company_id, ilan_sira_no FROM announcements WHERE company_id IN ({})',
+            set(company_ids.values()) | matched_ids
+        ))
+        existing_persons = set(_select_in(
+            conn, 'SELECT company_id, kimlik_no, isim FROM persons WHERE company_id IN ({})',
+            set(company_ids.values()) | matched_ids
+        ))
+
+        next_announcement_id = _next_id(conn, 'announcements')
+        next_person_id = _next_id(conn, 'persons')
+        announcements, persons, konkordatos, pay_devris, shareholders = [], [], [], [], []
+        for company_id, data in zip(announcement_company_ids, parsed_announcements):
+            ilan_sira_no = data.get('ilan_sira_no')
+            if ilan_sira_no is not None:
+                if (company_id, ilan_sira_no) in existing:
+                    continue
+                existing.add((company_id, ilan_sira_no))
+            announcement_id = next_announcement_id
+            next_announcement_id += 1
+            announcements.append((
+                announcement_id,
+                company_id,
+                ilan_sira_no,
+                data.get('tescil_edilen_hususlar'),
+                data.get('tescile_delil_olan_belgeler'),
+                data.get('details'),
+                data.get('source_hash'),
+                data.get('page_start'),
+                data.get('page_end'),
+                data.get('text_hash')
+            ))
+            for person in data.get('persons', ()):
+                person_key = (company_id, person.get('kimlik_no'), person.get('isim'))
+                if person_key in existing_persons:
+                    continue
+                existing_persons.add(person_key)
+                persons.append((next_person_id, company_id, person.get('kimlik_no'), person.get('isim'), person.get('adres')))
+                next_person_id += 1
+            if 'konkordato' in data:
+                konkordato = data['konkordato']
+                konkordatos.append((
+                    company_id,
+                    konkordato.get('mahkeme_karari_tarihi'),
+                    konkordato.get('baslangic_tarihi'),
+                    konkordato.get('bitis_tarihi'),
+                    konkordato.get('komiser_kimlik_no'),
+                    konkordato.get('komiser_adres'),
+                    konkordato.get('komiser_adi'),
+                    konkordato.get('komiser_gorev_bitis_tarihi')
+                ))
+            if 'pay_devri' in data:
+                pay_devri = data['pay_devri']
+                if pay_devri.get('devir_eden_kimlik_no'):
+                    pay_devris.append((
+                        company_id,
+                        announcement_id,
+                        pay_devri.get('devir_eden_kimlik_no'),
+                        pay_devri.get('devir_eden_adi'),
+                        pay_devri.get('devredilen_tutar'),
+                        pay_devri.get('devredilen_pay_adedi'),
+                        pay_devri.get('devir_alici_kimlik_no'),
+                        pay_devri.get('devir_alici_adi')
+                    ))
+                for shareholder in pay_devri.get('shareholders', ()):
+                    shareholders.append((
+                        company_id,
+                        announcement_id,
+                        shareholder.get('adi'),
+                        shareholder.get('beher_pay_degeri'),
+                        shareholder.get('pay_adedi'),
+                        shareholder.get('toplam_tutar')
+                    ))
+
+        conn.executemany('''
+        INSERT INTO companies (id, mersis_no, ticaret_sicil_no, ticaret_unvani, adres, city)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', companies)
+        conn.executemany('''
+        INSERT INTO announcements (id, company_id, ilan_sira_no, tescil_edilen_hususlar, tescile_delil_olan_belgeler, details_text,
+                                   source_hash, page_start, page_end, text_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', announcements)
+        conn.executemany('''
+        INSERT INTO persons (id, company_id, kimlik_no, isim, adres)
+        VALUES (?, ?, ?, ?, ?)
+        ''', persons)
+        conn.executemany('''
+        INSERT INTO konkordato (company_id, mahkeme_karari_tarihi, baslangic_tarihi, bitis_tarihi, komiser_kimlik_no, komiser_adres, komiser_adi, komiser_gorev_bitis_tarihi)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', konkordatos)
+        conn.executemany('''
+        INSERT INTO pay_devri (company_id, announcement_id, devir_eden_kimlik_no, devir_eden_adi, devredilen_tutar, devredilen_pay_adedi, devir_alici_kimlik_no, devir_alici_adi)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', pay_devris)
+        conn.executemany('''
+        INSERT INTO shareholders (company_id, announcement_id, adi, beher_pay_degeri, pay_adedi, toplam_tutar)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', shareholders)
+        _index_rows(conn, set(company_ids.values()) | matched_ids, companies, announcements, persons)
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return (len(upserts) + len(updates) + len(companies) + len(announcements) + len(persons)
+            + len(konkordatos) + len(pay_devris) + len(shareholders))
+
+
+def _index_rows(conn, upserted_company_ids, companies, announcements, persons):
+    """Yeni ve güncellenen satırları tam metin indeksine ekler."""
+    # Upsert edilen şirketlerin unvanı değişmiş olabilir; güncel değer tablodan okunur
+    indexed_companies = _select_in(
+        conn, 'SELECT id, ticaret_unvani FROM companies WHERE id IN ({})', set(upserted_company_ids)
+    )
+    indexed_companies.extend((row[0], row[3]) for row in companies)
+    conn.executemany(
+        'INSERT OR REPLACE INTO companies_fts (rowid, ticaret_unvani) VALUES (?, ?)',
+        [(company_id, fold_turkish(unvan)) for company_id, unvan in indexed_companies]
+    )
+    conn.executemany(
+        'INSERT INTO announcements_fts (rowid, text) VALUES (?, ?)',
+        [(row[0], fold_turkish(f"{row[3] or ''} {row[5] or ''}")) for row in announcements]
+    )
+    conn.executemany(
+        'INSERT INTO persons_fts (rowid, isim) VALUES (?, ?)',
+        [(row[0], fold_turkish(row[3])) for row in persons]
+    )
+
+
+def is_document_processed(conn, file_hash):
+    """Bu içerik özetine sahip bir PDF daha önce tamamen işlendiyse True döndürür."""
+    return conn.execute('SELECT 1 FROM documents WHERE file_hash = ?', (file_hash,)).fetchone() is not None
+
+
+def record_document(conn, file_hash, path, page_count, announcement_count):
+    """PDF'i işlenmiş olarak kaydeder; aynı içerik yeniden gelirse atlanır."""
+    conn.execute('''
+    INSERT INTO documents (file_hash, path, page_count, announcement_count, processed_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(file_hash) DO UPDATE SET
+        path = excluded.path,
+        page_count = excluded.page_count,
+        announcement_count = excluded.announcement_count,
+        processed_at = excluded.processed_at
+    ''', (file_hash, path, page_count, announcement_count, time.time()))
+
+
+def save_to_database(parsed_announcements, db_path=DEFAULT_DB_PATH):
+    """Verileri veritabanına kaydeder."""
+    conn = connect(db_path)
+    try:
+        return write_announcements(conn, parsed_announcements)
+    finally:
+        conn.close()
+
+
+class DatabaseWriter(threading.Thread):
+    """Kuyruktan ilan alıp veritabanına toplu yazan tek yazıcı iş parçacığı.
+
+    Birden çok OCR işçisi ya da dönüştürme iş parçacığı ``put`` ile ilan
+    gönderir; veritabanına yalnızca bu iş parçacığı yazar, böylece yazarlar
+    kilit için yarışmaz. İlanlar ``batch_size`` dolunca ya da kuyruk
+    ``flush_interval`` saniye boş kalınca tek işlemde yazılır. ``metrics``
+    verilirse her toplu yazma 'database' aşaması olarak ölçülür.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, queue_size=DEFAULT_QUEUE_SIZE, metrics=None):
+        super().__init__(name='DatabaseWriter', daemon=True)
+        self.db_path = db_path
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self.announcement_count = 0
+        self.row_count = 0
+        self.write_time = 0.0
+
+    def put(self, parsed_announcements):
+        """İlanları yazılmak üzere kuyruğa ekler; kuyruk doluysa bekler."""
+        if parsed_announcements:
+            self._put(list(parsed_announcements))
+
+    def close(self):
+        """Kuyruktaki tüm ilanları yazıp iş parçacığını durdurur."""
+        if self.is_alive():
+            self._put(self._STOP)
+            self.join()
+        if self.error is not None:
+            raise self.error
+
+    def _put(self, item):
+        while True:
+            if self.error is not None:
+                raise self.error
+            try:
+                self.queue.put(item, timeout=self.flush_interval)
+                return
+            except queue.Full:
+                continue
+
+    def run(self):
+        conn = None
+        pending = []
+        try:
+            conn = connect(self.db_path)
+            stopping = False
+            while not stopping:
+                try:
+                    item = self.queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+                if item is self._STOP:
+                    stopping = True
+                elif item is not None:
+                    pending.extend(item)
+                if pending and (stopping or item is None or len(pending) >= self.batch_size):
+                    self._flush(conn, pending)
+                    pending = []
+        except Exception as e:
+            self.error = e
+            # Kuyrukta bekleyen üreticiler kilitlenmesin
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _flush(self, conn, pending):
+        start = time.perf_counter()
+        for first in range(0, len(pending), self.batch_size):
+            batch = pending[first:first + self.batch_size]
+            with timed(self.metrics, 'database', announcements=len(batch)) as fields:
+                rows = write_announcements(conn, batch)
+                fields['rows'] = rows
+            self.row_count += rows
+            self.announcement_count += len(batch)
+        self.write_time += time.perf_counter() - start
+
+    def stats(self):
+        rate = self.row_count / self.write_time if self.write_time else 0.0
+        return (f"Veritabanı: {self.announcement_count} ilan, {self.row_count} satır "
+                f"({rate:.0f} satır/sn)")
@@ -0,0 +1,242 @@
+"""Ayrıştırılmış ilanları JSONL ya da Parquet olarak akış halinde dışa aktarma.
+
+Kayıtlar ``parse_announcement`` sözlükleridir (şahıslar, konkordato ve pay
+devri ortakları iç içe). Yazıcılar ilanları ``batch_size`` kayıtlık
+parçalar halinde yazar; bellekte hiçbir zaman bir parçadan fazlası
+tutulmaz. Kaynak iki türlü olabilir:
+
+- Hat: toplu çalıştırmada ``export_path`` verilirse ilanlar ayrıştırıldıkça
+  veritabanına uğramadan yazıcıya gider.
+- Veritabanı: ``iter_database`` ilanları kimlik sırasıyla parça parça okuyup
+  ilgili tablolarla birleştirerek aynı biçimde üretir. Veritabanında
+  şahıslar ve konkordato şirkete bağlı tutulduğundan bu kayıtlarda şirketin
+  tüm şahısları ve konkordato bilgisi yer alır.
+
+Parquet için pyarrow gerekir; yalnızca Parquet yazılırken yüklenir.
+"""
+import json
+import os
+
+from .database import DEFAULT_DB_PATH, _select_in, connect
+
+EXPORT_FORMATS = ('jsonl', 'parquet')
+DEFAULT_BATCH_SIZE = 10000
+
+ANNOUNCEMENT_FIELDS = (
+    'city', 'ilan_sira_no', 'mersis_no', 'ticaret_sicil_no', 'ticaret_unvani', 'adres',
+    'tescil_edilen_hususlar', 'tescile_delil_olan_belgeler', 'details', 'source_hash', 'text_hash',
+)
+# ner_label yalnızca NER ile bulunan adlarda dolu; düzenli ifadeyle bulunanlarda boş kalır
+PERSON_FIELDS = ('kimlik_no', 'isim', 'adres', 'ner_label')
+KONKORDATO_FIELDS = (
+    'mahkeme_karari_tarihi', 'baslangic_tarihi', 'bitis_tarihi', 'komiser_kimlik_no',
+    'komiser_adres', 'komiser_adi', 'komiser_gorev_bitis_tarihi',
+)
+PAY_DEVRI_FIELDS = (
+    'devir_eden_kimlik_no', 'devir_eden_adi', 'devredilen_tutar', 'devredilen_pay_adedi',
+    'devir_alici_kimlik_no', 'devir_alici_adi',
+)
+SHAREHOLDER_FIELDS = ('adi', 'beher_pay_degeri', 'pay_adedi', 'toplam_tutar')
+
+
+def export_format(path):
+    """Dosya uzantısından biçimi seçer (.parquet ise Parquet, değilse JSONL)."""
+    return 'parquet' if os.path.splitext(path)[1].lower() == '.parquet' else 'jsonl'
+
+
+def open_exporter(path, fmt=None, batch_size=DEFAULT_BATCH_SIZE):
+    fmt = fmt or export_format(path)
+    if fmt == 'parquet':
+        return ParquetExporter(path, batch_size)
+    return JsonlExporter(path, batch_size)
+
+
+class _Exporter:
+    """Ortak parçalama: ``write`` ile gelen ilanlar ``batch_size`` dolunca yazılır."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self.record_count = 0
+
+    def write(self, parsed_announcements):
+        self.pending.extend(parsed_announcements)
+        while len(self.pending) >= self.batch_size:
+            batch = self.pending[:self.batch_size]
+            del self.pending[:self.batch_size]
+            self._write_batch(batch)
+            self.record_count += len(batch)
+
+    def close(self):
+        if self.pending:
+            self._write_batch(self.pending)
+            self.record_count += len(self.pending)
+            self.pending = []
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_batch(self, batch):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class JsonlExporter(_Exporter):
+    """Her ilanı bir JSON satırı olarak yazar."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def _write_batch(self, batch):
+        self.file.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in batch)
+
+    def _close(self):
+        self.file.close()
+
+
+class ParquetExporter(_Exporter):
+    """İlanları sabit şemalı Parquet dosyasına, her parça bir satır grubu olacak şekilde yazar."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        super().__init__(path, batch_size)
+        self.pa = pa
+        self.schema = parquet_schema(pa)
+        self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+
+    def _write_batch(self, batch):
+        table = self.pa.Table.from_pylist([_normalize(record) for record in batch], schema=self.schema)
+        self.writer.write_table(table, row_group_size=self.batch_size)
+
+    def _close(self):
+        self.writer.close()
+
+
+def parquet_schema(pa):
+    strings = lambda names: [pa.field(name, pa.string()) for name in names]
+    persons = pa.list_(pa.struct(strings(PERSON_FIELDS)))
+    return pa.schema(
+        strings(ANNOUNCEMENT_FIELDS)
+        + [
+            pa.field('page_start', pa.int32()),
+            pa.field('page_end', pa.int32()),
+            pa.field('persons', persons),
+            pa.field('konkordato', pa.struct(strings(KONKORDATO_FIELDS) + [pa.field('persons', persons)])),
+            pa.field('pay_devri', pa.struct(
+                strings(PAY_DEVRI_FIELDS)
+                + [pa.field('shareholders', pa.list_(pa.struct(strings(SHAREHOLDER_FIELDS)))),
+                   pa.field('persons', persons)]
+            )),
+        ]
+    )
+
+
+def _project(data, fields):
+    return {field: data.get(field) for field in fields}
+
+
+def _persons(persons):
+    return [_project(person, PERSON_FIELDS) for person in persons or ()]
+
+
+def _normalize(data):
+    """İlan sözlüğünü şemadaki alanlara indirger; eksik alanlar boş (null) olur."""
+    record = _project(data, ANNOUNCEMENT_FIELDS + ('page_start', 'page_end'))
+    record['persons'] = _persons(data.get('persons'))
+    konkordato = data.get('konkordato')
+    record['konkordato'] = None
+    if konkordato is not None:
+        record['konkordato'] = _project(konkordato, KONKORDATO_FIELDS)
+        record['konkordato']['persons'] = _persons(konkordato.get('persons'))
+    pay_devri = data.get('pay_devri')
+    record['pay_devri'] = None
+    if pay_devri is not None:
+        record['pay_devri'] = _project(pay_devri, PAY_DEVRI_FIELDS)
+        record['pay_devri']['shareholders'] = [_project(shareholder, SHAREHOLDER_FIELDS)
+                                               for shareholder in pay_devri.get('shareholders', ())]
+        record['pay_devri']['persons'] = _persons(pay_devri.get('persons'))
+    return record
+
+
+def iter_database(conn, batch_size=DEFAULT_BATCH_SIZE):
+    """Veritabanındaki ilanları ``parse_announcement`` biçiminde, parça parça üretir.
+
+    İlanlar kimlik sırasıyla ``batch_size`` kadar okunur; her parça için
+    şahıs, konkordato, pay devri ve ortak satırları tablo başına tek sorguyla
+    getirilir. Sayfalama kimlik üzerinden yapılır (OFFSET kullanılmaz).
+    """
+    last_id = 0
+    while True:
+        rows = conn.execute('''
+        SELECT a.id, a.company_id, c.city, a.ilan_sira_no, c.mersis_no, c.ticaret_sicil_no,
+               c.ticaret_unvani, c.adres, a.tescil_edilen_hususlar, a.tescile_delil_olan_belgeler,
+               a.details_text, a.source_hash, a.text_hash, a.page_start, a.page_end
+        FROM announcements a LEFT JOIN companies c ON c.id = a.company_id
+        WHERE a.id > ? ORDER BY a.id LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        company_ids = {row[1] for row in rows}
+        announcement_ids = [row[0] for row in rows]
+
+        persons = {}
+        for company_id, kimlik_no, isim, adres in _select_in(
+                conn, 'SELECT company_id, kimlik_no, isim, adres FROM persons WHERE company_id IN ({}) ORDER BY id',
+                company_ids):
+            persons.setdefault(company_id, []).append({'kimlik_no': kimlik_no, 'isim': isim, 'adres': adres})
+        konkordatos = {}
+        for row in _select_in(
+                conn, f"SELECT company_id, {', '.join(KONKORDATO_FIELDS)} FROM konkordato "
+                      f"WHERE company_id IN ({{}}) ORDER BY id", company_ids):
+            konkordatos.setdefault(row[0], dict(zip(KONKORDATO_FIELDS, row[1:])))
+        pay_devris = {}
+        for row in _select_in(
+                conn, f"SELECT announcement_id, {', '.join(PAY_DEVRI_FIELDS)} FROM pay_devri "
+                      f"WHERE announcement_id IN ({{}}) ORDER BY id", announcement_ids):
+            pay_devris.setdefault(row[0], dict(zip(PAY_DEVRI_FIELDS, row[1:])))
+        shareholders = {}
+        for row in _select_in(
+                conn, f"SELECT announcement_id, {', '.join(SHAREHOLDER_FIELDS)} FROM shareholders "
+                      f"WHERE announcement_id IN ({{}}) ORDER BY id", announcement_ids):
+            shareholders.setdefault(row[0], []).append(dict(zip(SHAREHOLDER_FIELDS, row[1:])))
+
+        for row in rows:
+            announcement_id, company_id = row[0], row[1]
+            # Sütunlar SELECT'te ANNOUNCEMENT_FIELDS sırasıyla okunur
+            data = {field: value for field, value in zip(ANNOUNCEMENT_FIELDS + ('page_start', 'page_end'), row[2:])
+                    if value is not None}
+            data['details'] = data.get('details', '')
+            data['persons'] = persons.get(company_id, [])
+            if company_id in konkordatos:
+                data['konkordato'] = konkordatos[company_id]
+            if announcement_id in pay_devris or announcement_id in shareholders:
+                data['pay_devri'] = pay_devris.get(announcement_id, {})
+                data['pay_devri']['shareholders'] = shareholders.get(announcement_id, [])
+            yield data
+
+
+def export_database(output_path, db_path=DEFAULT_DB_PATH, fmt=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Veritabanındaki tüm ilanları ``output_path``'e yazar ve kayıt sayısını döndürür."""
+    conn = connect(db_path)
+    try:
+        with open_exporter(output_path, fmt, batch_size) as exporter:
+            batch = []
+            for data in iter_database(conn, batch_size):
+                batch.append(data)
+                if len(batch) >= batch_size:
+                    exporter.write(batch)
+                    batch = []
+            exporter.write(batch)
+    finally:
+        conn.close()
+    return exporter.record_count
@@ -0,0 +1,89 @@
+"""Mürekkep izdüşüm profilleriyle sütun ve metin bloğu tespiti.
+
+Eşik uygulanmış sayfada (metin siyah, zemin beyaz) satır ve sütun başına
+düşen mürekkep pikselleri sayılır. Dikey profildeki boş bantlar sütun
+aralıklarını, her sütunun yatay profilindeki geniş boş bantlar da metin
+blokları arasındaki boşlukları verir. Kenar boşlukları ve boş alanlar
+OCR'a hiç gönderilmez.
+"""
+
+INK_THRESHOLD = 128
+# Satır/sütun başına bu kadar mürekkep pikselinin altı gürültü sayılır
+NOISE_RATIO = 0.002
+# Sütun aralığı: içerik yüksekliğinin bu oranından az mürekkep içeren,
+# en az sayfa genişliğinin MIN_GUTTER_RATIO'su kadar geniş bant
+GUTTER_INK_RATIO = 0.03
+MIN_GUTTER_RATIO = 0.012
+# Profilin bu oranından fazlası doluysa satır/sütun bir çizgidir (sütun çizgisi, ayraç)
+RULE_INK_RATIO = 0.6
+MIN_COLUMN_RATIO = 0.05
+MIN_BLOCK_GAP_RATIO = 0.025
+PADDING = 8
+
+
+def _runs(mask):
+    """Boolean dizideki True koşularını [başlangıç, bitiş) satırları olarak döndürür."""
+    import numpy as np
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges.reshape(-1, 2)
+
+
+def _merge_runs(runs, min_gap):
+    """Aralarındaki boşluk min_gap'ten küçük koşuları birleştirir."""
+    import numpy as np
+    gaps = runs[1:, 0] - runs[:-1, 1]
+    breaks = np.flatnonzero(gaps >= min_gap)
+    starts = runs[np.r_[0, breaks + 1], 0]
+    ends = runs[np.r_[breaks, len(runs) - 1], 1]
+    return np.stack([starts, ends], axis=1)
+
+
+def detect_layout(image):
+    """Okuma sırasına göre (soldan sağa sütunlar, yukarıdan aşağı bloklar)
+    metin bölgelerini ``(y0, y1, x0, x1)`` kutuları olarak döndürür.
+
+    Boş sayfada boş liste döner.
+    """
+    import numpy as np
+    height, width = image.shape[:2]
+    ink = image < INK_THRESHOLD
+
+    # İçerik sınırları: kenar boşluklarını at
+    rows = _runs(ink.sum(axis=1) > max(1, NOISE_RATIO * width))
+    cols = _runs(ink.sum(axis=0) > max(1, NOISE_RATIO * height))
+    if not len(rows) or not len(cols):
+        return []
+    top, bottom = rows[0, 0], rows[-1, 1]
+    left, right = cols[0, 0], cols[-1, 1]
+    content = ink[top:bottom, left:right]
+    content_height = bottom - top
+
+    # Dikey profil: çizgileri boşluk say, az mürekkepli geniş bantlar sütun aralığıdır
+    profile = content.sum(axis=0)
+    profile[profile > RULE_INK_RATIO * content_height] = 0
+    gutters = _runs(profile <= GUTTER_INK_RATIO * content_height)
+    gutters = gutters[(gutters[:, 1] - gutters[:, 0]) >= MIN_GUTTER_RATIO * width]
+    edges = np.r_[0, gutters.ravel(), right - left].reshape(-1, 2)
+    edges = edges[(edges[:, 1] - edges[:, 0]) >= MIN_COLUMN_RATIO * width]
+
+    boxes = []
+    min_gap = max(1, int(MIN_BLOCK_GAP_RATIO * height))
+    for x0, x1 in edges:
+        column = content[:, x0:x1]
+        row_profile = column.sum(axis=1)
+        row_profile[row_profile > RULE_INK_RATIO * (x1 - x0)] = 0
+        text_rows = _runs(row_profile > max(1, NOISE_RATIO * (x1 - x0)))
+        if not len(text_rows):
+            continue
+        for y0, y1 in _merge_runs(text_rows, min_gap):
+            boxes.append((
+                int(max(0, top + y0 - PADDING)), int(min(height, top + y1 + PADDING)),
+                int(max(0, left + x0 - PADDING)), int(min(width, left + x1 + PADDING)),
+            ))
+    return boxes
+
+
+def crop_regions(image, boxes):
+    """Kutuları kopyalamadan görüntü görünümleri (view) olarak keser."""
+    return [image[y0:y1, x0:x1] for y0, y1, x0, x1 in boxes]
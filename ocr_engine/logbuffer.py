@@ -0,0 +1,56 @@
+"""Arayüz için tamponlanmış log modeli.
+
+İşçi iş parçacıkları mesajları doğrudan ``append`` ile ekler; arayüz
+zamanlayıcısı birikenleri ``drain`` ile tek parça olarak alıp ekrana yazar.
+Ekranda yalnızca son ``max_lines`` satır tutulur (halka tampon), tam log
+dosyaya yazılır.
+"""
+import collections
+import threading
+
+DEFAULT_LOG_PATH = 'ocr_log.txt'
+DEFAULT_MAX_LINES = 5000
+
+
+class LogBuffer:
+    """İş parçacıkları arasında güvenli, sınırlı boyutlu log tamponu."""
+
+    def __init__(self, path=DEFAULT_LOG_PATH, max_lines=DEFAULT_MAX_LINES):
+        self.path = path
+        self.max_lines = max_lines
+        # Arayüz geride kalırsa en eski bekleyen satırlar düşer, dosyaya yine yazılmıştır
+        self.pending = collections.deque(maxlen=max_lines)
+        self.skipped = 0
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8') if path else None
+
+    def append(self, message):
+        with self.lock:
+            if len(self.pending) == self.max_lines:
+                self.skipped += 1
+            self.pending.append(message)
+            if self.file is not None:
+                self.file.write(message + '\n')
+
+    def drain(self):
+        """Son çağrıdan bu yana gelen mesajları ve ekrana sığmadığı için atlananların sayısını döndürür."""
+        with self.lock:
+            pending, skipped = list(self.pending), self.skipped
+            self.pending.clear()
+            self.skipped = 0
+            if self.file is not None:
+                self.file.flush()
+        return pending, skipped
+
+    def drain_lines(self):
+        """``drain`` gibi; atlanan satır varsa başa bir not satırı ekleyip ekrana yazılacak satırları döndürür."""
+        lines, skipped = self.drain()
+        if skipped:
+            lines.insert(0, f"... {skipped} satır atlandı (tam log: {self.path})")
+        return lines
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,212 @@
+"""Aşama bazında süre ve kaynak ölçümü.
+
+Her aşama çağrısı (görüntüleme, threshold, sütun ayırma, OCR, ayrıştırma,
+veritabanı yazma) süresi, işlenen piksel/bayt miktarı ve o anki RSS ile
+birlikte JSON satırı olarak yazılır; böylece zamanın nereye gittiği ve hangi
+PDF'lerin sorunlu olduğu sonradan sorgulanabilir. Toplamlar istenirse yerel
+node exporter'ın okuyacağı bir Prometheus textfile'ına da yazılır.
+
+Ölçüm kapalıyken (``metrics=None``) aşamalar ``timed`` üzerinden boş bir
+bağlam yöneticisiyle çalışır.
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_METRICS_PATH = 'ocr_metrics.jsonl'
+METRIC_PREFIX = 'ocr_engine'
+
+# Aşama başına tutulan toplamlar
+_COUNT, _SECONDS, _MAX_SECONDS, _PIXELS, _BYTES = range(5)
+
+
+def current_rss():
+    """Sürecin o anki yerleşik bellek miktarı (bayt); ölçülemezse en yüksek değer."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    # Linux'ta KB, macOS'ta bayt
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+
+class Metrics:
+    """Aşama ölçümlerini toplayan ve JSON satırı olarak yazan kaydedici.
+
+    Aynı örnek birden çok iş parçacığından kullanılabilir. İşçi süreçler
+    kendi örneklerini açar (aynı JSON satırı dosyasına ekleme kipinde yazar)
+    ve ``snapshot`` ile toplamlarını ana sürece döndürür; ana süreç bunları
+    ``merge`` ile birleştirir.
+    """
+
+    def __init__(self, path=None, prometheus_path=None):
+        self.path = path
+        self.prometheus_path = prometheus_path
+        self.file = open(path, 'a', encoding='utf-8', buffering=1) if path else None
+        self.stages = {}
+        self.gauges = {}
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name, **fields):
+        """Bloğun süresini ``name`` aşaması olarak kaydeder.
+
+        Dönen sözlüğe blok içinde ``pixels``, ``nbytes`` ya da başka alanlar
+        eklenebilir; kayıtla birlikte yazılırlar.
+        """
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(name, time.perf_counter() - start, **fields)
+
+    def record(self, name, seconds, pixels=0, nbytes=0, **fields):
+        with self.lock:
+            totals = self.stages.setdefault(name, [0, 0.0, 0.0, 0, 0])
+            totals[_COUNT] += 1
+            totals[_SECONDS] += seconds
+            totals[_MAX_SECONDS] = max(totals[_MAX_SECONDS], seconds)
+            totals[_PIXELS] += pixels
+            totals[_BYTES] += nbytes
+            if self.file is not None:
+                event = {'ts': round(time.time(), 3), 'pid': os.getpid(), 'stage': name,
+                         'seconds': round(seconds, 6), 'pixels': pixels, 'bytes': nbytes,
+                         'rss': current_rss()}
+                event.update(fields)
+                self.file.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+    def gauge(self, name, value, **labels):
+        """Anlık bir değeri (ör. kuyruk doluluğu) kaydeder; Prometheus'a son değer yazılır."""
+        with self.lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+            if self.file is not None:
+                event = {'ts': round(time.time(), 3), 'pid': os.getpid(), 'gauge': name, 'value': value}
+                event.update(labels)
+                self.file.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+    def snapshot(self):
+        """Aşama toplamlarının süreçler arası taşınabilir kopyası."""
+        with self.lock:
+            return {name: list(totals) for name, totals in self.stages.items()}
+
+    def merge(self, snapshot):
+        with self.lock:
+            for name, other in snapshot.items():
+                totals = self.stages.setdefault(name, [0, 0.0, 0.0, 0, 0])
+                totals[_COUNT] += other[_COUNT]
+                totals[_SECONDS] += other[_SECONDS]
+                totals[_MAX_SECONDS] = max(totals[_MAX_SECONDS], other[_MAX_SECONDS])
+                totals[_PIXELS] += other[_PIXELS]
+                totals[_BYTES] += other[_BYTES]
+
+    def summary(self):
+        """Aşamaları toplam süreye göre sıralayan log satırları."""
+        lines = []
+        for name, totals in sorted(self.snapshot().items(), key=lambda item: -item[1][_SECONDS]):
+            mean = totals[_SECONDS] / totals[_COUNT] * 1000 if totals[_COUNT] else 0.0
+            lines.append(f"{name}: {totals[_COUNT]} kez, toplam {totals[_SECONDS]:.2f} sn, "
+                         f"ortalama {mean:.1f} ms, en uzun {totals[_MAX_SECONDS] * 1000:.0f} ms")
+        return lines
+
+    def write_prometheus(self, path=None):
+        """Toplamları Prometheus textfile biçiminde yazar.
+
+        Dosya önce geçici adla yazılıp yerine taşınır; node exporter yarım
+        dosya okumaz.
+        """
+        path = path or self.prometheus_path
+        if not path:
+            return
+        metrics = (
+            ('stage_calls_total', 'counter', "Aşama çağrı sayısı", _COUNT),
+            ('stage_seconds_total', 'counter', "Aşamada geçen toplam süre (sn)", _SECONDS),
+            ('stage_max_seconds', 'gauge', "Aşamanın en uzun tek çağrısı (sn)", _MAX_SECONDS),
+            ('stage_pixels_total', 'counter', "Aşamada işlenen piksel sayısı", _PIXELS),
+            ('stage_bytes_total', 'counter', "Aşamada işlenen bayt sayısı", _BYTES),
+        )
+        snapshot = self.snapshot()
+        lines = []
+        for suffix, kind, help_text, index in metrics:
+            name = f"{METRIC_PREFIX}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage, totals in sorted(snapshot.items()):
+                lines.append(f'{name}{{stage="{stage}"}} {totals[index]}')
+        with self.lock:
+            gauges = sorted(self.gauges.items())
+        described = set()
+        for (gauge, labels), value in gauges:
+            name = f"{METRIC_PREFIX}_{gauge}"
+            if name not in described:
+                described.add(name)
+                lines.append(f"# TYPE {name} gauge")
+            label_text = ",".join(f'{key}="{label}"' for key, label in labels)
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        rss = current_rss()
+        if rss is not None:
+            lines.append(f"# HELP {METRIC_PREFIX}_rss_bytes Ana sürecin yerleşik bellek miktarı")
+            lines.append(f"# TYPE {METRIC_PREFIX}_rss_bytes gauge")
+            lines.append(f"{METRIC_PREFIX}_rss_bytes {rss}")
+        lines.append(f"# HELP {METRIC_PREFIX}_last_update_seconds Son yazma zamanı (unix)")
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_update_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_last_update_seconds {time.time():.3f}")
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+    def close(self):
+        self.write_prometheus()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def timed(metrics, name, **fields):
+    """``metrics`` verilmişse aşamayı ölçen, yoksa hiçbir şey yapmayan bağlam yöneticisi."""
+    if metrics is None:
+        return contextlib.nullcontext(fields)
+    return metrics.stage(name, **fields)
+
+
+def timed_iter(metrics, name, iterable, **fields):
+    """Yinelemenin her adımını (ör. pdftoppm'den sıradaki sayfayı okumak) aşama olarak ölçer.
+
+    Numpy dizisi içeren öğelerde piksel ve bayt sayısı da kaydedilir.
+    """
+    if metrics is None:
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            seconds = time.perf_counter() - start
+            image = item
+            if isinstance(item, tuple):
+                # (page_num, image) çiftleri
+                fields['page'], image = item[0], item[-1]
+            metrics.record(name, seconds, pixels=int(getattr(image, 'size', 0)),
+                           nbytes=int(getattr(image, 'nbytes', 0)), **fields)
+            yield item
+    finally:
+        # Erken bırakılırsa alttaki üretecin temizliği (ör. pdftoppm'i sonlandırma) hemen çalışsın
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
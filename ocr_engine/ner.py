@@ -0,0 +1,145 @@
+"""İlanlardaki kişi ve kurum adlarını spaCy NER ile bulan isteğe bağlı zenginleştirme adımı.
+
+Model yalnızca adım açıkken ve ilk ilan geldiğinde, süreç başına bir kez
+yüklenir; adım kapalıyken spaCy hiç içe aktarılmaz. İlanlar
+``batch_size`` kadar biriktirilip ``nlp.pipe`` ile toplu işlenir; bulunan
+PERSON/ORG varlıkları, düzenli ifadelerle bulunmamışsa ``persons``
+listesine eklenir. ``n_process`` birden büyükse parçalar süreç başına bir
+kez açılan ve modeli her işçide bir kez yükleyen kalıcı bir süreç havuzunda
+işlenir; ``nlp.pipe``'a ``n_process`` verilmez, çünkü o her çağrıda yeni
+süreçler açıp modeli yeniden yükler.
+"""
+import collections
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from .database import fold_turkish
+from .metrics import timed
+
+DEFAULT_NER_MODEL = 'tr_core_news_trf'
+DEFAULT_NER_BATCH_SIZE = 32
+DEFAULT_NER_PROCESSES = 1
+# Bazı modeller kişi etiketi olarak PER kullanır
+NER_LABELS = ('PERSON', 'PER', 'ORG')
+
+# model: spaCy model adı; batch_size: nlp.pipe parça boyutu; n_process: NER süreç havuzundaki işçi sayısı
+Ner = collections.namedtuple('Ner', 'model batch_size n_process',
+                             defaults=(DEFAULT_NER_MODEL, DEFAULT_NER_BATCH_SIZE, DEFAULT_NER_PROCESSES))
+
+_models = {}
+_models_lock = threading.Lock()
+_pipe_lock = threading.Lock()
+# (model, süreç sayısı) -> NER süreç havuzu; süreç kapanana kadar yeniden kullanılır
+_pools = {}
+
+
+def get_nlp(model=DEFAULT_NER_MODEL):
+    """Modeli süreç başına bir kez yükleyip paylaşır."""
+    with _models_lock:
+        if model not in _models:
+            # Transformer modelinin tokenizer'ı kendi iş parçacıklarını açıp süreç havuzuyla yarışmasın
+            os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+            import spacy
+            _models[model] = spacy.load(model)
+        return _models[model]
+
+
+def announcement_text(data):
+    return '\n'.join(filter(None, (data.get('tescil_edilen_hususlar'), data.get('details'))))
+
+
+def find_entities(texts, model=DEFAULT_NER_MODEL, batch_size=DEFAULT_NER_BATCH_SIZE):
+    """Metinlerdeki varlıkları ``[(metin, etiket), ...]`` listeleri olarak döndürür.
+
+    Süreç havuzundaki işçilerde de çalışır; spaCy belgeleri yerine yalnızca
+    varlıklar süreçler arasında taşınır.
+    """
+    nlp = get_nlp(model)
+    return [[(ent.text, ent.label_) for ent in doc.ents] for doc in nlp.pipe(texts, batch_size=batch_size)]
+
+
+def _pool(ner):
+    with _models_lock:
+        key = ner.model, ner.n_process
+        if key not in _pools:
+            _pools[key] = ProcessPoolExecutor(max_workers=ner.n_process)
+        return _pools[key]
+
+
+def merge_entities(data, entities):
+    """``(metin, etiket)`` varlıklarından PERSON/ORG olanları ilanın ``persons`` listesine ekler.
+
+    Eklenen sayıyı döndürür.
+    """
+    persons = data.setdefault('persons', [])
+    # Şirketin kendi unvanı ve zaten bulunmuş adlar yeniden eklenmez
+    known = {fold_turkish(person.get('isim') or '').strip() for person in persons}
+    known.add(fold_turkish(data.get('ticaret_unvani') or '').strip())
+    added = 0
+    for text, label in entities:
+        if label not in NER_LABELS:
+            continue
+        name = ' '.join(text.split())
+        key = fold_turkish(name)
+        if not name or key in known:
+            continue
+        known.add(key)
+        persons.append({'kimlik_no': '', 'isim': name, 'adres': '', 'ner_label': label})
+        added += 1
+    return added
+
+
+def enrich(announcements, ner=Ner()):
+    """İlanları ``nlp.pipe`` ile toplu işleyip varlıkları yerinde ekler; eklenen toplam sayıyı döndürür."""
+    if not announcements:
+        return 0
+    texts = [announcement_text(data) for data in announcements]
+    if ner.n_process > 1:
+        # Parça işçiler arasında bölünür; sıralama map ile korunur
+        size = -(-len(texts) // ner.n_process)
+        chunks = [texts[first:first + size] for first in range(0, len(texts), size)]
+        entities = [found for part in _pool(ner).map(find_entities, chunks, repeat(ner.model), repeat(ner.batch_size))
+                    for found in part]
+    else:
+        # Paylaşılan model aynı anda tek iş parçacığından kullanılır (arayüzde eşzamanlı dosyalar)
+        with _pipe_lock:
+            entities = find_entities(texts, ner.model, ner.batch_size)
+    return sum(merge_entities(data, found) for data, found in zip(announcements, entities))
+
+
+class NerEnricher:
+    """İlanları biriktirip parça parça zenginleştiren ve ``sink``'e aktaran ara adım.
+
+    ``put`` ile gelen ilanlar ``ner.batch_size`` dolunca işlenir; ``close``
+    kalanları işler, ``discard`` ise atar. ``metrics`` verilirse her parça 'ner' aşaması olarak
+    ölçülür.
+    """
+
+    def __init__(self, sink, ner=Ner(), metrics=None):
+        self.sink = sink
+        self.ner = ner
+        self.metrics = metrics
+        self.pending = []
+        self.entity_count = 0
+
+    def put(self, parsed_announcements):
+        self.pending.extend(parsed_announcements)
+        if len(self.pending) >= self.ner.batch_size:
+            self._flush()
+
+    def close(self):
+        if self.pending:
+            self._flush()
+
+    def discard(self):
+        """İş yarıda kaldığında bekleyen ilanları işlemeden ve aktarmadan bırakır."""
+        self.pending = []
+
+    def _flush(self):
+        batch, self.pending = self.pending, []
+        with timed(self.metrics, 'ner', announcements=len(batch)) as fields:
+            fields['entities'] = enrich(batch, self.ner)
+        self.entity_count += fields['entities']
+        self.sink(batch)
@@ -0,0 +1,243 @@
+"""Sütun görüntülerinden metin çıkaran OCR adımları.
+
+OCR kütüphaneleri (pytesseract, tesserocr) arka uç ilk oluşturulduğunda,
+NumPy da ilk görüntü verildiğinde içe aktarılır; modülü içe aktarmak bu
+maliyeti ödemez.
+"""
+import collections
+import functools
+import re
+import threading
+
+ILLEGAL_CHARACTERS_RE = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+OCR_ENGINES = ('auto', 'tesserocr', 'pytesseract')
+DEFAULT_PSM = 3
+
+# İki aşamalı OCR: önce hızlı model (LSTM, sütunu tek blok olarak okuyan psm 4)
+# kelime güvenleriyle çalışır, güveni eşiğin altında kalan satırlar doğru
+# modelle tek satır (psm 7) olarak yeniden okunur
+FAST_PSM = 4
+FAST_OEM = 1  # yalnızca LSTM
+LINE_PSM = 7
+DEFAULT_CONFIDENCE_THRESHOLD = 80
+# Yeniden okunan satır kutusunun çevresine eklenen pay (piksel)
+LINE_PADDING = 4
+
+# threshold: satır güven eşiği (0-100); fast_tessdata: hızlı modellerin
+# (tessdata_fast) bulunduğu dizin, None ise varsayılan tessdata kullanılır
+TwoTier = collections.namedtuple('TwoTier', 'threshold fast_tessdata', defaults=(DEFAULT_CONFIDENCE_THRESHOLD, None))
+
+
+class PytesseractBackend:
+    """Her çağrıda ayrı bir tesseract süreci başlatan yedek arka uç."""
+    name = 'pytesseract'
+
+    def __init__(self, lang='tur', psm=DEFAULT_PSM, tessdata=None, oem=None):
+        import pytesseract
+        self.pytesseract = pytesseract
+        self.lang = lang
+        self.psm = psm
+        self.config = f'--psm {psm}'
+        if oem is not None:
+            self.config += f' --oem {oem}'
+        if tessdata is not None:
+            self.config += f' --tessdata-dir "{tessdata}"'
+
+    def image_to_string(self, image):
+        return self.pytesseract.image_to_string(image, lang=self.lang, config=self.config)
+
+    def recognize_lines(self, image):
+        """Satırları ``(paragraf, metin, güven, (x0, y0, x1, y1))`` olarak okuma sırasıyla döndürür.
+
+        Satır güveni, ``image_to_data`` kelime güvenlerinin ortalamasıdır.
+        """
+        data = self.pytesseract.image_to_data(image, lang=self.lang, config=self.config,
+                                              output_type=self.pytesseract.Output.DICT)
+        lines = {}
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if confidence < 0 or not word.strip():
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            x0, y0 = data['left'][i], data['top'][i]
+            x1, y1 = x0 + data['width'][i], y0 + data['height'][i]
+            line = lines.get(key)
+            if line is None:
+                lines[key] = [[word], [confidence], [x0, y0, x1, y1]]
+                continue
+            line[0].append(word)
+            line[1].append(confidence)
+            box = line[2]
+            box[:] = [min(box[0], x0), min(box[1], y0), max(box[2], x1), max(box[3], y1)]
+        return [(key[:2], ' '.join(words), sum(confidences) / len(confidences), tuple(box))
+                for key, (words, confidences, box) in lines.items()]
+
+    def close(self):
+        pass
+
+
+class TesserocrBackend:
+    """Dil modelini bir kez yükleyip süreç içinde tutan libtesseract arka ucu.
+
+    Görüntüler NumPy tamponundan doğrudan verilir; geçici dosya, süreç
+    başlatma ve stdout ayrıştırma maliyeti yoktur.
+    """
+    name = 'tesserocr'
+
+    def __init__(self, lang='tur', psm=DEFAULT_PSM, tessdata=None, oem=None):
+        import tesserocr
+        self.tesserocr = tesserocr
+        self.lang = lang
+        self.psm = psm
+        options = {}
+        if tessdata is not None:
+            options['path'] = tessdata
+        if oem is not None:
+            options['oem'] = oem
+        self.api = tesserocr.PyTessBaseAPI(lang=lang, psm=psm, **options)
+
+    def _set_image(self, image):
+        import numpy as np
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        self.api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+
+    def image_to_string(self, image):
+        self._set_image(image)
+        return self.api.GetUTF8Text()
+
+    def recognize_lines(self, image):
+        """Satırları ``(paragraf, metin, güven, (x0, y0, x1, y1))`` olarak okuma sırasıyla döndürür."""
+        RIL = self.tesserocr.RIL
+        self._set_image(image)
+        self.api.Recognize()
+        iterator = self.api.GetIterator()
+        if iterator is None:
+            return []
+        lines = []
+        paragraph = 0
+        for line in self.tesserocr.iterate_level(iterator, RIL.TEXTLINE):
+            if line.IsAtBeginningOf(RIL.PARA):
+                paragraph += 1
+            text = line.GetUTF8Text(RIL.TEXTLINE)
+            if text and text.strip():
+                lines.append((paragraph, text.strip(), line.Confidence(RIL.TEXTLINE), line.BoundingBox(RIL.TEXTLINE)))
+        return lines
+
+    def close(self):
+        self.api.End()
+
+
+_local = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def backend_name(engine='auto'):
+    """``get_backend``'in kullanacağı arka ucun adını, arka ucu oluşturmadan döndürür.
+
+    ``auto`` tesserocr kuruluysa onu, değilse pytesseract'ı seçer.
+    """
+    if engine != 'auto':
+        return engine
+    try:
+        import tesserocr  # noqa: F401
+    except ImportError:
+        return PytesseractBackend.name
+    return TesserocrBackend.name
+
+
+def get_backend(engine='auto', lang='tur', psm=DEFAULT_PSM, tessdata=None, oem=None):
+    """İş parçacığı başına bir kez oluşturulan ve sonra yeniden kullanılan OCR arka ucunu döndürür."""
+    backends = getattr(_local, 'backends', None)
+    if backends is None:
+        backends = _local.backends = {}
+    key = (engine, lang, psm, tessdata, oem)
+    if key not in backends:
+        backend_class = TesserocrBackend if backend_name(engine) == TesserocrBackend.name else PytesseractBackend
+        backends[key] = backend_class(lang, psm, tessdata, oem)
+    return backends[key]
+
+
+def clean_text(text):
+    """Metindeki yasadışı karakterleri temizler."""
+    return ILLEGAL_CHARACTERS_RE.sub('', text)
+
+
+def preprocess_text(text):
+    """OCR hatalarını düzeltmek için metni ön işler."""
+    corrections = {
+        # OCR hataları düzeltmeleri (örneğin, 'l' yerine 'I' gibi)
+    }
+    for wrong, correct in corrections.items():
+        text = text.replace(wrong, correct)
+    return text
+
+
+def two_tier_text(column, lang='tur', engine='auto', two_tier=TwoTier(), stats=None):
+    """Sütunu hızlı modelle okur, güveni düşük satırları doğru modelle yeniden okuyup yerine koyar.
+
+    Satırlar paragraf içinde tek satır sonu, paragraflar arasında boş satırla
+    birleştirilir (``image_to_string`` çıktısı gibi). ``stats`` verilirse
+    satır sayısı, yeniden okunan satır ve piksel sayısı ona eklenir.
+    """
+    fast = get_backend(engine, lang, FAST_PSM, two_tier.fast_tessdata, FAST_OEM)
+    accurate = get_backend(engine, lang, LINE_PSM)
+    height, width = column.shape[:2]
+    parts = []
+    previous_paragraph = None
+    reocr_lines = reocr_pixels = 0
+    lines = fast.recognize_lines(column)
+    for paragraph, text, confidence, (x0, y0, x1, y1) in lines:
+        if confidence < two_tier.threshold and x1 > x0 and y1 > y0:
+            crop = column[max(y0 - LINE_PADDING, 0):min(y1 + LINE_PADDING, height),
+                          max(x0 - LINE_PADDING, 0):min(x1 + LINE_PADDING, width)]
+            reocr_lines += 1
+            reocr_pixels += crop.size
+            # Doğru model satırı okuyamazsa hızlı modelin sonucu kalır
+            text = accurate.image_to_string(crop).strip() or text
+        if previous_paragraph is not None:
+            parts.append('\n' if paragraph == previous_paragraph else '\n\n')
+        parts.append(text)
+        previous_paragraph = paragraph
+    if stats is not None:
+        stats['lines'] = stats.get('lines', 0) + len(lines)
+        stats['reocr_lines'] = stats.get('reocr_lines', 0) + reocr_lines
+        stats['reocr_pixels'] = stats.get('reocr_pixels', 0) + reocr_pixels
+    return ''.join(parts) + '\n'
+
+
+def ocr_column(column, lang='tur', engine='auto', cache=None, two_tier=None, stats=None):
+    """Tek bir sütunu OCR'dan geçirip temizlenmiş metni döndürür.
+
+    ``cache`` verilirse aynı görüntü ve parametrelerle daha önce üretilmiş ham
+    OCR çıktısı önbellekten alınır ve Tesseract hiç çalıştırılmaz.
+    ``two_tier`` (bkz. TwoTier) verilirse sütun iki aşamalı okunur; ``stats``
+    sözlüğüne yeniden okunan piksel sayısı eklenir. Arka uç yalnızca önbellekte
+    sonuç yoksa oluşturulur.
+    """
+    if two_tier is None:
+        read = lambda image: get_backend(engine, lang).image_to_string(image)
+        name, psm = backend_name(engine), DEFAULT_PSM
+    else:
+        read = lambda image: two_tier_text(image, lang, engine, two_tier, stats)
+        name = f"{backend_name(engine)}-two-tier-{two_tier.threshold}-{two_tier.fast_tessdata}"
+        psm = FAST_PSM
+    if cache is None:
+        col_text = read(column)
+    else:
+        key = cache.make_key(column, lang, name, psm)
+        col_text = cache.get(key)
+        if col_text is None:
+            col_text = read(column)
+            cache.put(key, col_text)
+    return preprocess_text(clean_text(col_text))
+
+
+def ocr_columns(columns, lang='tur', engine='auto', cache=None, two_tier=None, stats=None):
+    """Sütunları sırayla OCR'dan geçirip sayfa metnini birleştirir."""
+    page_text = ""
+    for col in columns:
+        page_text += ocr_column(col, lang, engine, cache, two_tier, stats) + "\n\n"
+    return page_text
@@ -0,0 +1,212 @@
+"""Sayfa görüntüleme ve ön işleme adımları.
+
+NumPy, OpenCV ve pdf2image yalnızca kullanıldıkları fonksiyonlarda içe
+aktarılır; modülü içe aktarmak (ör. işçi süreç başlatmak) bu maliyeti ödemez.
+"""
+import subprocess
+
+from .layout import crop_regions, detect_layout
+
+
+def count_pages(pdf_path):
+    """PDF'in sayfa sayısını görüntüleme yapmadan döndürür."""
+    from pdf2image import pdfinfo_from_path
+    return int(pdfinfo_from_path(pdf_path)['Pages'])
+
+
+DEFAULT_DPI = 200
+DPI_AUTO = 'auto'
+
+# Otomatik DPI: sayfa önce düşük çözünürlükte görüntülenip metin satırı
+# yüksekliği ölçülür, DPI bu yükseklik hedefe ulaşacak şekilde seçilir
+PROBE_DPI = 72
+PROBE_STRIPS = 8
+PROBE_INK_THRESHOLD = 160
+TARGET_TEXT_HEIGHT_PX = 24
+MIN_DPI = 150
+MAX_DPI = 400
+DPI_STEP = 25
+
+
+def render_page(pdf_path, page_num, dpi=DEFAULT_DPI):
+    """Tek bir sayfayı (0 tabanlı) PIL görüntüsü olarak yükler."""
+    from pdf2image import convert_from_path
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_num + 1, last_page=page_num + 1)
+    return images[0]
+
+
+def _read_token(stream):
+    """PPM başlığından boşluk ve yorumları atlayarak bir alan okur."""
+    token = b''
+    while True:
+        char = stream.read(1)
+        if not char:
+            return token
+        if char == b'#':
+            stream.readline()
+            continue
+        if char.isspace():
+            if token:
+                return token
+            continue
+        token += char
+
+
+def _read_ppm(stream):
+    """Akıştan bir PPM (P6) veya PGM (P5) görüntüsü okur; akış bittiyse None döner.
+
+    Pikseller doğrudan numpy dizisinin belleğine okunur, ara kopya oluşmaz.
+    """
+    import numpy as np
+    magic = _read_token(stream)
+    if not magic:
+        return None
+    width = int(_read_token(stream))
+    height = int(_read_token(stream))
+    maxval = int(_read_token(stream))
+    # pdftoppm 255 yazar; 255'ten büyük değerler piksel başına iki bayt demektir
+    if maxval > 255:
+        raise IOError(f"16 bitlik PPM desteklenmiyor (maxval {maxval})")
+    shape = (height, width, 3) if magic == b'P6' else (height, width)
+    image = np.empty(shape, dtype=np.uint8)
+    buffer = memoryview(image).cast('B')
+    filled = 0
+    while filled < len(buffer):
+        count = stream.readinto(buffer[filled:])
+        if not count:
+            raise IOError("pdftoppm çıktısı yarıda kesildi")
+        filled += count
+    return image
+
+
+def _contiguous_runs(page_nums):
+    """Sıralı sayfa numaralarını ardışık [ilk, son] aralıklarına ayırır."""
+    runs = []
+    for page_num in sorted(page_nums):
+        if runs and runs[-1][1] == page_num - 1:
+            runs[-1][1] = page_num
+        else:
+            runs.append([page_num, page_num])
+    return runs
+
+
+def _render_runs(pdf_path, runs, gray):
+    """Her ``(ilk, son, dpi)`` aralığını tek bir pdftoppm süreciyle görüntüler."""
+    for first, last, dpi in runs:
+        command = ['pdftoppm', '-r', str(dpi), '-f', str(first + 1), '-l', str(last + 1)]
+        if gray:
+            command.append('-gray')
+        process = subprocess.Popen(command + [pdf_path], stdout=subprocess.PIPE)
+        try:
+            for page_num in range(first, last + 1):
+                image = _read_ppm(process.stdout)
+                if image is None:
+                    raise IOError(f"pdftoppm {page_num + 1}. sayfayı üretmedi")
+                yield page_num, image
+        finally:
+            process.stdout.close()
+            process.kill()
+            process.wait()
+
+
+def estimate_text_height(image, dpi):
+    """Gri sayfa görüntüsünde tipik metin satırı yüksekliğini punto cinsinden tahmin eder.
+
+    Sayfa dikey şeritlere bölünür (sütunların satırları birbirine karışmasın),
+    her şeritte mürekkep içeren satır dizilerinin yükseklikleri toplanır ve
+    ortancası alınır. Metin bulunamazsa None döner.
+    """
+    import numpy as np
+    ink = np.asarray(image) < PROBE_INK_THRESHOLD
+    heights = []
+    for strip in np.array_split(ink, PROBE_STRIPS, axis=1):
+        rows = strip.any(axis=1)
+        if not rows.any():
+            continue
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], rows, [False])).astype(np.int8)))
+        run_heights = edges[1::2] - edges[::2]
+        # Tek piksellik diziler çizgi ya da gürültüdür
+        heights.extend(run_heights[run_heights > 1])
+    if not heights:
+        return None
+    return float(np.median(heights)) * 72 / dpi
+
+
+def dpi_for_text_height(text_height):
+    """Metin yüksekliği (punto) ``TARGET_TEXT_HEIGHT_PX`` piksele denk gelecek DPI'yı seçer."""
+    if not text_height:
+        return DEFAULT_DPI
+    dpi = TARGET_TEXT_HEIGHT_PX * 72 / text_height
+    dpi = round(dpi / DPI_STEP) * DPI_STEP
+    return int(min(MAX_DPI, max(MIN_DPI, dpi)))
+
+
+def _render_auto_dpi(pdf_path, first, last, gray):
+    """``[ilk, son]`` aralığını her sayfanın DPI'ını o sayfaya gelince seçerek görüntüler.
+
+    Ön görüntüleme tek bir düşük çözünürlüklü pdftoppm sürecinden sayfa sayfa
+    okunur. Asıl görüntüleme süreci sayfadan aralığın sonuna kadar açılır ve
+    DPI değişmedikçe sürdürülür; değişince kapatılıp yeni DPI'la o sayfadan
+    yeniden açılır. Böylece ilk sayfa tüm aralık ön görüntülenmeden üretilir.
+    """
+    probes = _render_runs(pdf_path, [(first, last, PROBE_DPI)], True)
+    dpi = pages = None
+    try:
+        for page_num, probe in probes:
+            page_dpi = dpi_for_text_height(estimate_text_height(probe, PROBE_DPI))
+            if page_dpi != dpi:
+                if pages is not None:
+                    pages.close()
+                dpi = page_dpi
+                pages = _render_runs(pdf_path, [(page_num, last, dpi)], gray)
+            yield next(pages)
+    finally:
+        probes.close()
+        if pages is not None:
+            pages.close()
+
+
+def iter_pages(pdf_path, page_nums=None, dpi=DEFAULT_DPI, gray=True):
+    """Sayfaları (0 tabanlı) tek tek görüntüleyip ``(page_num, image)`` olarak üretir.
+
+    Her ardışık sayfa aralığı için tek bir uzun ömürlü pdftoppm süreci açılır ve
+    sayfalar stdout üzerinden okundukça üretilir; her sayfa yalnızca bir kez
+    görüntülenir ve bellekte aynı anda yalnızca tüketilmekte olan sayfa tutulur.
+    ``gray`` açıkken pdftoppm doğrudan 8 bit gri (P5) üretir; RGB'ye göre üç kat
+    az bellek kullanılır ve gri tona çevirme adımı gerekmez.
+
+    ``dpi`` olarak ``'auto'`` verilirse her sayfanın DPI'ı, sayfa sırası
+    gelince düşük çözünürlüklü ön görüntülemesindeki metin yüksekliğinden
+    seçilir (bkz. ``_render_auto_dpi``); aynı DPI'lı ardışık sayfalar yine tek
+    süreçte görüntülenir.
+    """
+    if page_nums is None:
+        page_nums = range(count_pages(pdf_path))
+    if dpi == DPI_AUTO:
+        for first, last in _contiguous_runs(page_nums):
+            yield from _render_auto_dpi(pdf_path, first, last, gray)
+    else:
+        yield from _render_runs(pdf_path, [(first, last, dpi) for first, last in _contiguous_runs(page_nums)], gray)
+
+
+def threshold_page(image, out=None):
+    """Görsele adaptive threshold uygular; RGB ise önce gri tonlamaya çevirir.
+
+    ``out`` verilirse sonuç doğrudan bu (sayfa şeklindeki uint8) diziye
+    yazılır, ör. paylaşımlı bellekteki bir sayfa tamponuna.
+    """
+    import cv2
+    import numpy as np
+    gray_image = np.asarray(image)
+    if gray_image.ndim == 3:
+        gray_image = cv2.cvtColor(gray_image, cv2.COLOR_RGB2GRAY)
+    return cv2.adaptiveThreshold(gray_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2, out)
+
+
+def split_into_columns(image):
+    """Sayfayı okuma sırasındaki metin bölgelerine (sütun blokları) ayırır.
+
+    Sütun sayısı sabit değildir; izdüşüm profillerinden tespit edilir ve boş
+    alanlar kırpılır (bkz. layout.detect_layout).
+    """
+    return crop_regions(image, detect_layout(image))
@@ -0,0 +1,418 @@
+"""OCR metnini ilanlara bölen ve ilan alanlarını çıkaran ayrıştırıcı.
+
+Tüm desenler modül yüklenirken bir kez derlenir. Alan etiketleri ("MERSİS No",
+"Ticaret Unvanı", "Adres" ...) sabit önekli desenlerle bulunur; değerler
+etiket bitişine çapalı desenlerle ya da sonraki etiket konumuna kadar
+dilimlenerek okunur, böylece metin her alan için baştan DOTALL ile taranmaz.
+Kimlik ve pay devri desenleri ilan başına bir kez çalıştırılıp ilgili
+fonksiyonlar arasında paylaşılır.
+
+Sonuçlar eski alan başına regex ayrıştırıcısıyla (benchmarks/bench_parser.py
+içindeki LegacyParser) aynıdır; bilinçli iki fark vardır:
+
+- Art arda gelen "Türkiye Cumhuriyeti Uyruklu ..." şahıslarında eski
+  ayrıştırıcının açgözlü isim grubu sonraki öneki yutup o şahsı atlıyordu;
+  burada her şahıs ``persons`` listesine girer (ilk şahsın adında yutulan
+  önek eskisi gibi kalır).
+- Metin "Adres:" etiketiyle bitiyorsa eski ayrıştırıcı adres olarak ``':'``
+  döndürüyordu; burada adres alanı hiç yazılmaz.
+- "Türkiye Cumhuriyeti Uyruklu" şahıslar eski ayrıştırıcıda hem
+  ``parse_persons`` hem ``extract_company_persons`` tarafından verilip
+  ``persons`` listesine iki kez giriyordu; burada yalnızca ``parse_persons``
+  verir, liste sırası ilk geçişleriyle aynıdır.
+"""
+import bisect
+import hashlib
+import re
+
+HEADER_RE = re.compile(
+    r"(?:T\.C\.|TC)[ ]?.+?T[İI]CARET S[İI]C[İI]L[İI] M[ÜU]D[ÜU]RL[ÜU][ĞG][ÜU]['’]?[N]?[D]?EN",
+    re.DOTALL | re.IGNORECASE
+)
+CITY_RE = re.compile(
+    r"(?:T\.C\.|TC)[ ]?(.+?)\s+T[İI][CÇ]ARET S[İI]C[İI]L[İI]\s+M[ÜU][DÐ][ÜU]RL[ÜU][ĞG][ÜU]['’]?[N]?[D]?EN",
+    re.DOTALL | re.IGNORECASE
+)
+
+# CPython'da tek bir birleşik alternatif desenle tarama, sabit önekli ayrı
+# desenlerden yavaş çıkıyor; bu yüzden her etiketin kendi derlenmiş deseni var
+LABEL_RES = {
+    'ilan_sira_no': re.compile(r"İlan Sıra No", re.IGNORECASE),
+    'mersis_no': re.compile(r"MERS[İI]S No", re.IGNORECASE),
+    'ticaret_sicil_no': re.compile(r"Ticaret Sicil[ / Dosya]* No", re.IGNORECASE),
+    'ticaret_unvani': re.compile(r"Ticaret Unvan[ıi]", re.IGNORECASE),
+    'adres': re.compile(r"Adres", re.IGNORECASE),
+    'tescil_edilen_hususlar': re.compile(r"Tescil Edilen Hususlar", re.IGNORECASE),
+    'tescile_delil_olan_belgeler': re.compile(r"Tescile Delil Olan Belgeler", re.IGNORECASE),
+}
+ADRES_END_RE = re.compile(r"\n\n|Yukarıda|Tescil Edilen Hususlar", re.IGNORECASE)
+
+# Etiketten sonraki değer desenleri; etiket bitişine çapalı olarak uygulanır
+_SEP = r"\s*[:：]?\s*"
+SEP_RE = re.compile(_SEP)
+NUMBER_VALUE_RE = re.compile(_SEP + r"(\d+)")
+LINE_VALUE_RE = re.compile(_SEP + r"(.+)")
+TWO_LINE_VALUE_RE = re.compile(_SEP + r"(.*?)(?:\n|$)([A-ZİĞÜŞÖÇ].+)", re.IGNORECASE)
+FIRST_LINE_VALUE_RE = re.compile(_SEP + r"(.+?)(?:\n|$)")
+
+# Şahıs ve pay devri desenleri; birden çok fonksiyon aynı eşleşmeleri paylaşır
+_KIMLIK_NO = r"\d{3}\*{4,6}\d{2,3}"
+_ISIM = r"[A-ZÇŞĞÜÖİ\s']+"
+_PERSON = rf"({_KIMLIK_NO} Kimlik No'lu),?\s*([A-ZÇŞĞÜÖİ\s/]+) adresinde ikamet eden,?\s*({_ISIM})"
+_TRANSFER = (
+    rf"({_KIMLIK_NO} Kimlik Numaralı)\s+({_ISIM}) (\d[\d\.,]+ TL) sermaye karşılığı (\d+) adet payını "
+    rf"hukuki ve mali yükümlülükleri ile ({_KIMLIK_NO} Kimlik Numaralı) ({_ISIM})'e devretmiştir"
+)
+PERSON_RE = re.compile(_PERSON, re.DOTALL | re.IGNORECASE)
+CITIZEN_PREFIX_RE = re.compile(r"Türkiye Cumhuriyeti Uyruklu\s+$", re.IGNORECASE)
+TRANSFER_RE = re.compile(_TRANSFER, re.DOTALL | re.IGNORECASE)
+PAY_DEVRI_PREFIX_RE = re.compile(r"Şirket Ortaklarından $", re.IGNORECASE)
+# Önek kontrolü için eşleşmenin hemen öncesinde bakılacak karakter sayısı
+PREFIX_WINDOW = 64
+
+MAHKEME_KARARI_RE = re.compile(
+    r"\d+\. ASL[İI]YE HUKUK MAHKEMES[İI]'n[ıi]n (\d{1,2}\.\d{1,2}\.\d{4}) tarihli karar[ıi] ile",
+    re.IGNORECASE
+)
+BASLANGIC_TARIHI_RE = re.compile(r"Başlangıç Tarihi\s*[:：]?\s*(.+)", re.IGNORECASE)
+BITIS_TARIHI_RE = re.compile(r"Bitiş Tarihi\s*[:：]?\s*(.+)", re.IGNORECASE)
+KOMISER_RE = re.compile(
+    _PERSON + r";\s*(\d{1,2}\.\d{1,2}\.\d{4}) tarihine kadar Konkordato Komiseri olarak atanmıştır",
+    re.DOTALL | re.IGNORECASE
+)
+# Ortak satırları "Beheri" sabitinden bulunur, ortak adı geriye doğru okunur;
+# ad sınıfıyla başlayan desen her konumda denendiğinde çok yavaş kalıyor
+SHAREHOLDING_RE = re.compile(
+    r":\s*Beheri ([\d\.,]+) Türk Lirası değerinde (\d+) adet paya karşılık gelen ([\d\.,]+) Türk Lirası",
+    re.IGNORECASE
+)
+NAME_CHAR_RE = re.compile(r"[A-ZÇŞĞÜÖİ\s']", re.IGNORECASE)
+
+
+def format_page(page_num, page_text):
+    """Sayfa metnini sonuç dosyasındaki biçime getirir."""
+    return f"Sayfa {page_num + 1} için çıkarılan metin:\n" + page_text + "\n\n"
+
+
+class AnnouncementStream:
+    """Sayfa metinlerini geldikçe alıp tamamlanan ilanları ayrıştıran akış.
+
+    Bir ilan, ondan sonraki "T.C. ... TİCARET SİCİLİ MÜDÜRLÜĞÜ" başlığı
+    görüldüğünde tamamlanmış sayılır; sayfa sınırında yarım kalan ilan ve
+    başlık bir sonraki sayfayla birleştirilir. Sayfalar sırasız gelebilir,
+    sıradaki sayfa gelene kadar bekletilir. Sonuçlar, tüm metin birleştirilip
+    ``parse_text`` ile ayrıştırılmış gibidir.
+
+    ``page_sink`` verilirse sayfalar sırayla, sonuç dosyası biçiminde ona
+    aktarılır (örneğin açık bir dosyanın ``write`` metodu).
+
+    Akıştan çıkan her ilana, metninin yayıldığı ilk ve son sayfa
+    (``page_start``, ``page_end``; sonuç dosyasındaki gibi 1'den başlar) ve
+    ``source_hash`` verildiyse kaynak PDF'in özeti eklenir. ``text_hash``
+    ilanın ham metninin SHA-256 özetidir; aynı PDF yeniden işlendiğinde aynı
+    ilanı tanımak için kullanılır.
+    """
+
+    def __init__(self, first_page=0, page_sink=None, source_hash=None):
+        self.next_page = first_page
+        self.pending = {}
+        self.buffer = ""
+        self.page_sink = page_sink
+        self.source_hash = source_hash
+        # Tampondaki sayfa metinlerinin başlangıç konumları (akışın başından itibaren) ve sayfa numaraları
+        self.buffer_start = 0
+        self.page_offsets = []
+        self.page_nums = []
+
+    def add_page(self, page_num, page_text):
+        """Sayfayı ekler ve bu sayfayla tamamlanan ilanları döndürür."""
+        self.pending[page_num] = page_text
+        completed = []
+        while self.next_page in self.pending:
+            completed.extend(self._feed_page(self.next_page, self.pending.pop(self.next_page)))
+            self.next_page += 1
+        return completed
+
+    def close(self):
+        """Bekleyen sayfaları ve son ilanı ayrıştırıp döndürür."""
+        completed = []
+        for page_num in sorted(self.pending):
+            completed.extend(self._feed_page(page_num, self.pending.pop(page_num)))
+        match = HEADER_RE.search(self.buffer)
+        if match:
+            completed.append(self._parse(match.start(), len(self.buffer)))
+        self.buffer_start += len(self.buffer)
+        self.buffer = ""
+        return completed
+
+    def _feed_page(self, page_num, page_text):
+        text = format_page(page_num, page_text)
+        if self.page_sink is not None:
+            self.page_sink(text)
+        # "Sayfa N için çıkarılan metin:" satırı sayfanın kendisine değil, sınırına sayılır
+        self.page_offsets.append(self.buffer_start + len(self.buffer) + len(text) - len(page_text) - 2)
+        self.page_nums.append(page_num)
+        self.buffer += text
+        starts = [match.start() for match in HEADER_RE.finditer(self.buffer)]
+        if not starts:
+            # Başlık henüz tamamlanmamış olabilir, tamponun tamamı tutulur
+            return []
+        completed = [self._parse(start, end) for start, end in zip(starts, starts[1:])]
+        # Son başlıktan önceki kısım artık gerekmiyor
+        self.buffer = self.buffer[starts[-1]:]
+        self.buffer_start += starts[-1]
+        keep = max(bisect.bisect_right(self.page_offsets, self.buffer_start) - 1, 0)
+        del self.page_offsets[:keep], self.page_nums[:keep]
+        return completed
+
+    def _parse(self, start, end):
+        """Tampondaki ``[start:end]`` aralığını ayrıştırıp kaynak bilgisini ekler."""
+        text = self.buffer[start:end]
+        first = start + len(text) - len(text.lstrip())
+        last = start + len(text.rstrip()) - 1
+        data = parse_announcement(text.strip())
+        data['text_hash'] = hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+        data['page_start'] = self._page_at(first) + 1
+        data['page_end'] = self._page_at(last) + 1
+        if self.source_hash is not None:
+            data['source_hash'] = self.source_hash
+        return data
+
+    def _page_at(self, index):
+        position = bisect.bisect_right(self.page_offsets, self.buffer_start + index) - 1
+        return self.page_nums[max(position, 0)]
+
+
+def parse_text(text):
+    """Metni parse eder ve verileri çıkarır."""
+    return [parse_announcement(announcement) for announcement in split_announcements(text)]
+
+
+def split_announcements(text):
+    """Metni ilanlara böler."""
+    starts = [match.start() for match in HEADER_RE.finditer(text)]
+    ends = starts[1:] + [len(text)]
+    return [text[start:end].strip() for start, end in zip(starts, ends)]
+
+
+def _first_value(text, label_re, value_re):
+    """Değer deseni etiket bitişinde eşleşen ilk etiketin değerini döndürür."""
+    for label in label_re.finditer(text):
+        match = value_re.match(text, label.end())
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def _adres_value(text):
+    """Adresi etiket sonundan ilk boş satıra ya da sonraki "Yukarıda" /
+    "Tescil Edilen Hususlar" ifadesine kadar dilimler."""
+    text_end = len(text) - 1 if text.endswith('\n') else len(text)
+    for label in LABEL_RES['adres'].finditer(text):
+        start = SEP_RE.match(text, label.end()).end()
+        if start >= len(text):
+            continue
+        end_match = ADRES_END_RE.search(text, start + 1)
+        value_end = end_match.start() if end_match else len(text)
+        if start < text_end:
+            value_end = min(value_end, text_end)
+        return text[start:value_end].strip()
+    return None
+
+
+def parse_announcement(announcement_text):
+    """Her ilandan verileri çıkarır."""
+    data = {}
+
+    # Şehir
+    city_match = CITY_RE.search(announcement_text)
+    if city_match:
+        data['city'] = city_match.group(1).strip()
+
+    # Tek satırlık alanlar
+    for field, value_re in (('ilan_sira_no', NUMBER_VALUE_RE),
+                            ('mersis_no', NUMBER_VALUE_RE),
+                            ('ticaret_sicil_no', LINE_VALUE_RE)):
+        value = _first_value(announcement_text, LABEL_RES[field], value_re)
+        if value is not None:
+            data[field] = value
+
+    # Ticaret Unvanı: ikinci satıra taşmışsa iki satırı birleştir
+    for label in LABEL_RES['ticaret_unvani'].finditer(announcement_text):
+        match = TWO_LINE_VALUE_RE.match(announcement_text, label.end())
+        if match:
+            first_line = match.group(1).strip()
+            second_line = match.group(2).strip()
+            data['ticaret_unvani'] = f"{first_line} {second_line}".strip() if first_line else second_line
+            break
+    else:
+        # Alternatif olarak, sadece bir satır sonraki ifadeyi al
+        value = _first_value(announcement_text, LABEL_RES['ticaret_unvani'], LINE_VALUE_RE)
+        if value is not None:
+            data['ticaret_unvani'] = value
+
+    adres = _adres_value(announcement_text)
+    if adres is not None:
+        data['adres'] = adres
+
+    for field in ('tescil_edilen_hususlar', 'tescile_delil_olan_belgeler'):
+        value = _first_value(announcement_text, LABEL_RES[field], FIRST_LINE_VALUE_RE)
+        if value is not None:
+            data[field] = value
+
+    # Detaylar: "Tescil Edilen Hususlar" satırından sonraki her şey
+    data['details'] = ''
+    hususlar_match = LABEL_RES['tescil_edilen_hususlar'].search(announcement_text)
+    if hususlar_match:
+        newline = announcement_text.find('\n', hususlar_match.end())
+        if newline != -1:
+            data['details'] = announcement_text[newline + 1:].strip()
+
+    # Şahıs bilgileri; kimlik desenleri tek sefer taranıp paylaşılır
+    person_matches = list(PERSON_RE.finditer(announcement_text))
+    transfer_matches = list(TRANSFER_RE.finditer(announcement_text))
+    data['persons'] = parse_persons(announcement_text, person_matches)
+    # Uyruk önekli şahıslar parse_persons'tan geldi; diğer şahıslar ve pay devredenler eklenir
+    company_matches = [match for match in person_matches
+                       if not _has_prefix(announcement_text, match, CITIZEN_PREFIX_RE)]
+    data['persons'].extend(extract_company_persons(announcement_text, company_matches, transfer_matches))
+
+    # Özel durumlar için detaylı parça alma
+    upper_text = announcement_text.upper()
+    if 'KONKORDATO' in upper_text:
+        data['konkordato'] = parse_konkordato_details(announcement_text)
+
+    if 'PAY DEVRİ' in upper_text:
+        data['pay_devri'] = parse_pay_devri_details(announcement_text, transfer_matches)
+
+    return data
+
+
+def _has_prefix(text, match, prefix_re):
+    return prefix_re.search(text, max(0, match.start() - PREFIX_WINDOW), match.start()) is not None
+
+
+def _person(match):
+    return {
+        'kimlik_no': match.group(1).strip(),
+        'adres': match.group(2).strip(),
+        'isim': match.group(3).strip()
+    }
+
+
+def parse_persons(announcement_text, person_matches=None):
+    """Şahısların kimlik numaraları, isimleri ve adreslerini çıkarır."""
+    if person_matches is None:
+        person_matches = PERSON_RE.finditer(announcement_text)
+    return [_person(match) for match in person_matches
+            if _has_prefix(announcement_text, match, CITIZEN_PREFIX_RE)]
+
+
+def extract_company_persons(announcement_text, person_matches=None, transfer_matches=None):
+    """Şirket ile ilgili maskelenmiş kimlik numarası ve ad-soyad bilgilerini çıkarır."""
+    if person_matches is None:
+        person_matches = PERSON_RE.finditer(announcement_text)
+    if transfer_matches is None:
+        transfer_matches = TRANSFER_RE.finditer(announcement_text)
+
+    # Yönetim kurulu üyeleri ve diğer yetkililer
+    persons = [_person(match) for match in person_matches]
+
+    # Ayrıca, 'Kimlik Numaralı' ifadesiyle verilen kişileri yakala
+    for match in transfer_matches:
+        persons.append({
+            'kimlik_no': match.group(1).strip(),
+            'isim': match.group(2).strip(),
+            'adres': ''
+        })
+    return persons
+
+
+def parse_konkordato_details(announcement_text):
+    data = {}
+    mahkeme_karari_tarihi_match = MAHKEME_KARARI_RE.search(announcement_text)
+    if mahkeme_karari_tarihi_match:
+        data['mahkeme_karari_tarihi'] = mahkeme_karari_tarihi_match.group(1)
+
+    baslangic_tarihi_match = BASLANGIC_TARIHI_RE.search(announcement_text)
+    if baslangic_tarihi_match:
+        data['baslangic_tarihi'] = baslangic_tarihi_match.group(1).strip()
+
+    bitis_tarihi_match = BITIS_TARIHI_RE.search(announcement_text)
+    if bitis_tarihi_match:
+        data['bitis_tarihi'] = bitis_tarihi_match.group(1).strip()
+
+    # Konkordato Komiseri
+    komiser_match = KOMISER_RE.search(announcement_text)
+    if komiser_match:
+        data['komiser_kimlik_no'] = komiser_match.group(1).strip()
+        data['komiser_adres'] = komiser_match.group(2).strip()
+        data['komiser_adi'] = komiser_match.group(3).strip()
+        data['komiser_gorev_bitis_tarihi'] = komiser_match.group(4).strip()
+
+        # Konkordato komiserini persons listesine ekle
+        data.setdefault('persons', []).append({
+            'kimlik_no': data['komiser_kimlik_no'],
+            'isim': data['komiser_adi'],
+            'adres': data['komiser_adres']
+        })
+
+    return data
+
+
+def parse_pay_devri_details(announcement_text, transfer_matches=None):
+    data = {}
+    if transfer_matches is None:
+        transfer_matches = TRANSFER_RE.finditer(announcement_text)
+
+    # Devir İşlemi: "Şirket Ortaklarından" ile başlayan ilk devir
+    devir_eden_match = next((match for match in transfer_matches
+                             if _has_prefix(announcement_text, match, PAY_DEVRI_PREFIX_RE)), None)
+    if devir_eden_match:
+        data['devir_eden_kimlik_no'] = devir_eden_match.group(1).strip()
+        data['devir_eden_adi'] = devir_eden_match.group(2).strip()
+        data['devredilen_tutar'] = devir_eden_match.group(3)
+        data['devredilen_pay_adedi'] = devir_eden_match.group(4)
+        data['devir_alici_kimlik_no'] = devir_eden_match.group(5).strip()
+        data['devir_alici_adi'] = devir_eden_match.group(6).strip()
+
+        # Devir eden ve alan kişileri persons tablosuna ekle
+        data.setdefault('persons', []).extend([
+            {
+                'kimlik_no': data['devir_eden_kimlik_no'],
+                'isim': data['devir_eden_adi'],
+                'adres': ''
+            },
+            {
+                'kimlik_no': data['devir_alici_kimlik_no'],
+                'isim': data['devir_alici_adi'],
+                'adres': ''
+            }
+        ])
+
+    # Yeni Ortaklık Yapısı
+    shareholders = []
+    previous_end = 0
+    for match in SHAREHOLDING_RE.finditer(announcement_text):
+        start = match.start()
+        while start > previous_end and NAME_CHAR_RE.match(announcement_text, start - 1):
+            start -= 1
+        if start == match.start():
+            continue
+        previous_end = match.end()
+        shareholder = {
+            'adi': announcement_text[start:match.start()].strip(),
+            'beher_pay_degeri': match.group(1),
+            'pay_adedi': match.group(2),
+            'toplam_tutar': match.group(3)
+        }
+        shareholders.append(shareholder)
+        # Ortakları persons tablosuna ekle
+        data.setdefault('persons', []).append({
+            'kimlik_no': '',  # Kimlik numarası yoksa boş bırakıyoruz
+            'isim': shareholder['adi'],
+            'adres': ''
+        })
+    data['shareholders'] = shareholders
+
+    return data
@@ -0,0 +1,402 @@
+"""Görüntüleme, ön işleme ve OCR'ı sınırlı kuyruklarla bağlayan aşamalı hat.
+
+Bir PDF'in sayfaları üç aşamadan geçer ve aşamalar aynı anda çalışır:
+
+    görüntüleme (1 iş parçacığı, pdftoppm akışı)
+        -> [ön işleme kuyruğu] -> threshold + sütun ayırma (N iş parçacığı)
+        -> [OCR kuyruğu] -> OCR (M iş parçacığı)
+        -> [çıktı kuyruğu] -> sayfa sırasına dizilip tüketiciye
+
+Kuyrukların hepsi sınırlıdır; ilerideki bir aşama yavaşsa gerideki aşamalar
+bekler (backpressure). Ayrıca hatta aynı anda bulunan sayfa görüntülerinin
+toplam boyutu ``memory_cap`` ile sınırlanır; PDF ne kadar uzun olursa olsun
+görüntüleme bu sınırı aşacak kadar öne geçemez. Kuyruk dolulukları belirli
+aralıklarla raporlanır: önü dolu olan aşama darboğazdır.
+
+``ocr_processes`` açıkken OCR iş parçacıkları işi bir süreç havuzuna
+devreder. Eşik uygulanmış sayfa bu durumda paylaşımlı bellekteki bir sayfa
+tamponuna (bkz. shm.PageBufferPool) doğrudan yazılır; OCR sürecine yalnızca
+tampon tanıtıcısı ve sütun kutuları gider, sayfa pickle edilmez.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .cache import DEFAULT_CACHE_SIZE, open_cache
+from .layout import crop_regions, detect_layout
+from .metrics import timed, timed_iter
+from .ocr import ocr_columns
+from .pages import DEFAULT_DPI, iter_pages, split_into_columns, threshold_page
+from .shm import PageBufferPool, attach_page
+from .textlayer import page_text_layer
+
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_MEMORY_CAP = 512 * 1024 * 1024
+DEFAULT_PREPROCESS_WORKERS = 1
+DEFAULT_OCR_WORKERS = os.cpu_count() or 1
+# Kuyruk doluluklarının log'a ve ölçümlere yazılma aralığı (sn)
+DEFAULT_REPORT_INTERVAL = 5.0
+# Bekleyen iş parçacıklarının durdurma isteğini ne sıklıkla kontrol ettiği (sn)
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+def _init_worker():
+    # Her süreç tek çekirdek kullanıyor; Tesseract'ın kendi OpenMP iş parçacıkları
+    # havuzla yarışıp makineyi aşırı yüklemesin
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def file_resources(concurrent_files, ocr_workers=DEFAULT_OCR_WORKERS, memory_cap=DEFAULT_MEMORY_CAP):
+    """Aynı anda işlenen dosya sayısına göre dosya başına ``(ocr_workers, memory_cap, ocr_processes)``.
+
+    Tek dosya tüm çekirdekleri ve bellek sınırının tamamını kullanır. Birden
+    çok dosya varsa OCR süreçlerde yapılır; Tesseract'ın OpenMP iş parçacıkları
+    her işçide ``_init_worker`` ile sınırlanır, ana sürecin ortamı değişmez.
+    """
+    concurrent_files = max(1, concurrent_files)
+    return max(1, ocr_workers // concurrent_files), memory_cap // concurrent_files, concurrent_files > 1
+
+
+def format_reocr_stats(stats, pixels):
+    """İki aşamalı OCR'da bir sayfanın yeniden okunan kısmını özetleyen log satırı."""
+    if 'lines' not in stats:
+        return "sayfa OCR önbelleğinden alındı"
+    share = stats['reocr_pixels'] / pixels * 100 if pixels else 0.0
+    return (f"doğru modelle yeniden okunan: {stats['reocr_lines']}/{stats['lines']} satır, "
+            f"{stats['reocr_pixels']} piksel (%{share:.1f})")
+
+
+class _Stopped(Exception):
+    """Hat durdurulurken bekleyen iş parçacıklarını çıkarmak için kullanılır."""
+
+
+class MemoryBudget:
+    """Hatta aynı anda tutulan sayfa görüntülerinin toplam bayt sayısını sınırlar."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.in_use = 0
+        self.peak = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, nbytes, stop):
+        with self.condition:
+            # Tek başına sınırı aşan bir sayfa, hat boşaldığında yine kabul edilir
+            while self.in_use and self.in_use + nbytes > self.max_bytes:
+                if stop.is_set():
+                    raise _Stopped()
+                self.condition.wait(POLL_INTERVAL)
+            self.in_use += nbytes
+            self.peak = max(self.peak, self.in_use)
+
+    def release(self, nbytes):
+        with self.condition:
+            self.in_use -= nbytes
+            self.condition.notify_all()
+
+
+def _region_pixels(regions, shared):
+    if shared is None:
+        return sum(column.size for column in regions)
+    return sum((y1 - y0) * (x1 - x0) for y0, y1, x0, x1 in regions)
+
+
+def ocr_shared_page(shared, boxes, lang='tur', engine='auto', cache_path=None, cache_size=DEFAULT_CACHE_SIZE,
+                    two_tier=None):
+    """İşçi süreçte paylaşımlı bellekteki sayfanın ``boxes`` sütunlarını OCR'dan geçirir.
+
+    ``(page_text, stats, (isabet, ıska))`` döndürür; sütunlar kopyalanmadan
+    tampon üzerindeki görünümlerden kesilir.
+    """
+    cache = open_cache(cache_path, cache_size) if cache_path else None
+    before = cache.stats() if cache else (0, 0)
+    stats = {}
+    columns = crop_regions(attach_page(shared), boxes)
+    try:
+        page_text = ocr_columns(columns, lang, engine, cache, two_tier, stats)
+    finally:
+        # Tampon havuza dönmeden önce görünümler bırakılır
+        del columns
+    after = cache.stats() if cache else (0, 0)
+    return page_text, stats, (after[0] - before[0], after[1] - before[1])
+
+
+class PagePipeline:
+    """Bir PDF'in sayfalarını aşamalı hatta işleyip ``(page_num, page_text, source)`` üretir.
+
+    Aşamalar örtüşür ve bellek kullanımı sınırlıdır; toplu çalıştırmanın
+    işçi süreçleri de sayfaları bu hattan geçirir (bkz. batch.extract_pages). OCR
+    önbelleği iş parçacığı başına açıldığından nesne yerine ``cache_path``
+    alınır. ``two_tier`` verilirse OCR iki aşamalı yapılır (bkz. ocr.TwoTier).
+    ``ocr_processes`` açıkken OCR ``ocr_workers`` süreçte, sayfalar paylaşımlı
+    bellek üzerinden aktarılarak yapılır. Yineleme yarıda bırakılırsa iş
+    parçacıkları ve süreçler durdurulur.
+    """
+
+    def __init__(self, pdf_path, page_nums, lang='tur', mode='hybrid', engine='auto',
+                 cache_path=None, cache_size=DEFAULT_CACHE_SIZE, dpi=DEFAULT_DPI,
+                 preprocess_workers=DEFAULT_PREPROCESS_WORKERS, ocr_workers=DEFAULT_OCR_WORKERS,
+                 queue_size=DEFAULT_QUEUE_SIZE, memory_cap=DEFAULT_MEMORY_CAP,
+                 metrics=None, log=None, report_interval=DEFAULT_REPORT_INTERVAL, two_tier=None,
+                 ocr_processes=False):
+        self.pdf_path = pdf_path
+        self.page_nums = list(page_nums)
+        self.lang = lang
+        self.mode = mode
+        self.engine = engine
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.dpi = dpi
+        self.two_tier = two_tier
+        self.preprocess_workers = max(1, preprocess_workers)
+        self.ocr_workers = max(1, ocr_workers)
+        self.metrics = metrics
+        self.log = log or (lambda message: None)
+        self.report_interval = report_interval
+
+        self.queues = {
+            'preprocess': queue.Queue(maxsize=queue_size),
+            'ocr': queue.Queue(maxsize=queue_size),
+            'output': queue.Queue(maxsize=queue_size),
+        }
+        self.budget = MemoryBudget(memory_cap)
+        self.stop = threading.Event()
+        self.error = None
+        self.lock = threading.Lock()
+        self.running = {'preprocess': self.preprocess_workers, 'ocr': self.ocr_workers}
+        self.cache_counts = [0, 0]
+        self.threads = []
+        self.executor = None
+        self.buffers = None
+        if ocr_processes:
+            # Sınır: ön işlenen, OCR kuyruğunda bekleyen ve OCR'da olan sayfalar
+            self.buffers = PageBufferPool(self.preprocess_workers + queue_size + self.ocr_workers)
+
+    def __iter__(self):
+        self._start()
+        pending = {}
+        next_index = 0
+        last_report = time.monotonic()
+        try:
+            while next_index < len(self.page_nums):
+                page_num = self.page_nums[next_index]
+                if page_num in pending:
+                    yield (page_num,) + pending.pop(page_num)
+                    next_index += 1
+                    continue
+                if time.monotonic() - last_report >= self.report_interval:
+                    self.report()
+                    last_report = time.monotonic()
+                try:
+                    item = self.queues['output'].get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    if self.error is not None:
+                        raise self.error
+                    continue
+                if item is _DONE:
+                    if self.error is not None:
+                        raise self.error
+                    raise RuntimeError(f"Hat {page_num + 1}. sayfayı üretmeden bitti")
+                pending[item[0]] = item[1:]
+        finally:
+            self.stop.set()
+            for thread in self.threads:
+                thread.join()
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+            if self.buffers is not None:
+                self.buffers.close()
+        self.report()
+
+    def queue_depths(self):
+        """Her kuyruğun ``(doluluk, kapasite)`` değerleri ve bellek kullanımı."""
+        depths = {name: (q.qsize(), q.maxsize) for name, q in self.queues.items()}
+        depths['memory'] = (self.budget.in_use, self.budget.max_bytes)
+        return depths
+
+    def report(self):
+        depths = self.queue_depths()
+        used, cap = depths.pop('memory')
+        message = ("Kuyruklar: " + ", ".join(f"{name} {size}/{maxsize}" for name, (size, maxsize) in depths.items())
+                   + f", bellek {used / 2 ** 20:.0f}/{cap / 2 ** 20:.0f} MB (en yüksek {self.budget.peak / 2 ** 20:.0f} MB)")
+        if self.buffers is not None:
+            count, shared_bytes, peak, created, reused = self.buffers.stats()
+            message += (f", paylaşımlı bellek {count} tampon {shared_bytes / 2 ** 20:.0f} MB "
+                        f"(en yüksek {peak / 2 ** 20:.0f} MB, {created} oluşturuldu, {reused} yeniden kullanıldı)")
+        self.log(message)
+        if self.metrics is not None:
+            for name, (size, _) in depths.items():
+                self.metrics.gauge('queue_depth', size, queue=name)
+            self.metrics.gauge('pipeline_memory_bytes', used)
+            if self.buffers is not None:
+                self.metrics.gauge('pipeline_shared_memory_bytes', shared_bytes)
+
+    def cache_stats(self):
+        """Bu hattın OCR iş parçacıklarının önbellek isabet/ıska toplamları."""
+        with self.lock:
+            return tuple(self.cache_counts)
+
+    def _start(self):
+        if self.buffers is not None:
+            self.executor = ProcessPoolExecutor(max_workers=self.ocr_workers, initializer=_init_worker)
+        targets = [self._render] + [self._preprocess] * self.preprocess_workers + [self._ocr] * self.ocr_workers
+        for index, target in enumerate(targets):
+            thread = threading.Thread(target=self._guard, args=(target,), daemon=True,
+                                      name=f"PagePipeline-{target.__name__.strip('_')}-{index}")
+            self.threads.append(thread)
+            thread.start()
+
+    def _guard(self, target):
+        try:
+            target()
+        except _Stopped:
+            pass
+        except BaseException as e:
+            with self.lock:
+                if self.error is None:
+                    self.error = e
+            self.stop.set()
+
+    def _put(self, name, item):
+        while True:
+            if self.stop.is_set():
+                raise _Stopped()
+            try:
+                self.queues[name].put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, name):
+        while True:
+            if self.stop.is_set():
+                raise _Stopped()
+            try:
+                return self.queues[name].get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+    def _finish_stage(self, stage, next_queue, next_workers):
+        """Aşamanın son iş parçacığı çıkarken sonraki aşamanın her işçisine bitiş işareti gönderir."""
+        with self.lock:
+            self.running[stage] -= 1
+            last = self.running[stage] == 0
+        if last:
+            for _ in range(next_workers):
+                self._put(next_queue, _DONE)
+
+    def _render(self):
+        # Sayfalar sırayla dolaşılır; OCR gereken ardışık sayfalar tek pdftoppm akışında görüntülenir
+        run = []
+        for page_num in self.page_nums:
+            if self.stop.is_set():
+                raise _Stopped()
+            page_text = None
+            if self.mode == 'hybrid':
+                with timed(self.metrics, 'text_layer', pdf=self.pdf_path, page=page_num) as fields:
+                    page_text = page_text_layer(self.pdf_path, page_num)
+                    fields['usable'] = page_text is not None
+            if page_text is None:
+                run.append(page_num)
+                continue
+            self._render_run(run)
+            run = []
+            self._put('output', (page_num, page_text, 'text'))
+        self._render_run(run)
+        for _ in range(self.preprocess_workers):
+            self._put('preprocess', _DONE)
+
+    def _render_run(self, run):
+        if not run:
+            return
+        pages = timed_iter(self.metrics, 'rasterize', iter_pages(self.pdf_path, run, self.dpi), pdf=self.pdf_path)
+        try:
+            for page_num, image in pages:
+                # Threshold sırasında sayfa ve ikili kopyası birlikte bellekte durur
+                nbytes = image.nbytes * 2
+                self.budget.acquire(nbytes, self.stop)
+                try:
+                    self._put('preprocess', (page_num, image, nbytes))
+                except _Stopped:
+                    self.budget.release(nbytes)
+                    raise
+        finally:
+            pages.close()
+
+    def _preprocess(self):
+        while True:
+            item = self._get('preprocess')
+            if item is _DONE:
+                break
+            page_num, image, nbytes = item
+            shared = binary = None
+            try:
+                if self.buffers is not None:
+                    acquired = self.buffers.acquire(image.shape[:2], self.stop)
+                    if acquired is None:
+                        raise _Stopped()
+                    shared, binary = acquired
+                with timed(self.metrics, 'threshold', pdf=self.pdf_path, page=page_num,
+                           pixels=image.size, nbytes=image.nbytes):
+                    # Paylaşımlı bellekte sayfa tampona bir kez yazılır, sonra hiç kopyalanmaz
+                    binary = threshold_page(image, binary)
+                del image, item
+                with timed(self.metrics, 'split_columns', pdf=self.pdf_path, page=page_num,
+                           pixels=binary.size) as fields:
+                    # Süreçlere yalnızca sütun kutuları gider; görünümler işçide kesilir
+                    regions = split_into_columns(binary) if shared is None else detect_layout(binary)
+                    fields['columns'] = len(regions)
+                del binary
+                self._put('ocr', (page_num, regions, shared, nbytes))
+            except BaseException:
+                # Hata izi tampon görünümünü tutmasın; havuz kapanırken bölüt kapatılabilsin
+                binary = None
+                self.budget.release(nbytes)
+                if shared is not None:
+                    self.buffers.release(shared)
+                raise
+        self._finish_stage('preprocess', 'ocr', self.ocr_workers)
+
+    def _ocr(self):
+        # Süreç kipinde önbellek işçi süreçlerde açılır
+        cache = open_cache(self.cache_path, self.cache_size) if self.cache_path and self.executor is None else None
+        before = cache.stats() if cache else (0, 0)
+        try:
+            while True:
+                item = self._get('ocr')
+                if item is _DONE:
+                    break
+                page_num, regions, shared, nbytes = item
+                pixels = _region_pixels(regions, shared)
+                try:
+                    with timed(self.metrics, 'ocr', pdf=self.pdf_path, page=page_num, pixels=pixels) as fields:
+                        if shared is None:
+                            page_text = ocr_columns(regions, self.lang, self.engine, cache, self.two_tier, fields)
+                        else:
+                            page_text, stats, (hits, misses) = self.executor.submit(
+                                ocr_shared_page, shared, regions, self.lang, self.engine, self.cache_path,
+                                self.cache_size, self.two_tier).result()
+                            fields.update(stats)
+                            with self.lock:
+                                self.cache_counts[0] += hits
+                                self.cache_counts[1] += misses
+                        fields['chars'] = len(page_text)
+                    if self.two_tier is not None:
+                        self.log(f"Sayfa {page_num + 1}, iki aşamalı OCR: " + format_reocr_stats(fields, pixels))
+                finally:
+                    del regions, item
+                    self.budget.release(nbytes)
+                    if shared is not None:
+                        self.buffers.release(shared)
+                self._put('output', (page_num, page_text, 'ocr'))
+        finally:
+            if cache is not None:
+                after = cache.stats()
+                with self.lock:
+                    self.cache_counts[0] += after[0] - before[0]
+                    self.cache_counts[1] += after[1] - before[1]
+        self._finish_stage('ocr', 'output', 1)
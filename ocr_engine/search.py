@@ -0,0 +1,71 @@
+"""company_records.db üzerindeki FTS5 indeksinde sıralı arama."""
+import re
+
+from .database import fold_turkish
+
+SEARCH_KINDS = ('all', 'announcements', 'companies', 'persons')
+DEFAULT_LIMIT = 20
+
+WORD_RE = re.compile(r"\w+")
+
+# Her tür için: indeks tablosu ve sonucu kaynak tablolarla birleştiren sorgu.
+# bm25 küçüldükçe eşleşme daha iyidir.
+QUERIES = {
+    'announcements': '''
+        SELECT 'announcements', a.id, a.company_id, c.ticaret_unvani, a.ilan_sira_no,
+               snippet(announcements_fts, 0, '[', ']', '…', 12), bm25(announcements_fts)
+        FROM announcements_fts
+        JOIN announcements a ON a.id = announcements_fts.rowid
+        LEFT JOIN companies c ON c.id = a.company_id
+        WHERE announcements_fts MATCH ?
+        ORDER BY bm25(announcements_fts)
+        LIMIT ?
+    ''',
+    'companies': '''
+        SELECT 'companies', c.id, c.id, c.ticaret_unvani, c.mersis_no,
+               snippet(companies_fts, 0, '[', ']', '…', 12), bm25(companies_fts)
+        FROM companies_fts
+        JOIN companies c ON c.id = companies_fts.rowid
+        WHERE companies_fts MATCH ?
+        ORDER BY bm25(companies_fts)
+        LIMIT ?
+    ''',
+    'persons': '''
+        SELECT 'persons', p.id, p.company_id, c.ticaret_unvani, p.isim,
+               snippet(persons_fts, 0, '[', ']', '…', 12), bm25(persons_fts)
+        FROM persons_fts
+        JOIN persons p ON p.id = persons_fts.rowid
+        LEFT JOIN companies c ON c.id = p.company_id
+        WHERE persons_fts MATCH ?
+        ORDER BY bm25(persons_fts)
+        LIMIT ?
+    ''',
+}
+RESULT_FIELDS = ('kind', 'id', 'company_id', 'ticaret_unvani', 'key', 'snippet', 'score')
+
+
+def build_match_query(query):
+    """Kullanıcı sorgusunu Türkçe katlanmış, önek eşleşmeli bir FTS5 ifadesine çevirir.
+
+    Tüm kelimeler geçmelidir (AND); her kelime önek olarak aranır.
+    """
+    words = WORD_RE.findall(fold_turkish(query))
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(conn, query, kind='all', limit=DEFAULT_LIMIT):
+    """Sorguyla eşleşen kayıtları sıralı olarak sözlük listesi halinde döndürür.
+
+    ``key`` alanı ilanlarda ilan sıra numarası, şirketlerde MERSİS numarası,
+    şahıslarda isimdir. ``all`` türünde sonuçlar bm25 skoruna göre birleştirilir.
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    kinds = SEARCH_KINDS[1:] if kind == 'all' else (kind,)
+    rows = []
+    for name in kinds:
+        rows.extend(conn.execute(QUERIES[name], (match, limit)).fetchall())
+    rows.sort(key=lambda row: row[-1])
+    return [dict(zip(RESULT_FIELDS, row)) for row in rows[:limit]]
+
@@ -0,0 +1,337 @@
+"""OCR ve ayrıştırmayı yerel bir HTTP servisi olarak sunan asyncio sunucusu.
+
+Uç noktalar:
+
+    POST /jobs                         gövde: PDF baytları -> 202 {"job_id": ...}
+    GET  /jobs/<id>                    durum ve ilerleme yüzdesi
+    GET  /jobs/<id>/announcements      ayrıştırılmış ilanlar (parse_announcement sözlükleri)
+
+Yüklenen PDF'ler ``jobs_dir`` altına yazılır ve sıraya alınır; en fazla
+``max_jobs`` iş aynı anda, masaüstü arayüzüyle aynı dönüştürme akışında
+(convert.convert_pdf) iş parçacığı havuzunda çalışır. Sıra doluysa yeni
+yüklemeler 503 ile reddedilir. Her isteğin başlık ve gövde okuması
+``request_timeout`` saniyeyle sınırlıdır. Sunucu yalnızca standart
+kütüphaneyi kullanır ve varsayılan olarak yalnızca 127.0.0.1'i dinler.
+"""
+import asyncio
+import collections
+import json
+import os
+import re
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .batch import EXTRACTION_MODES
+from .cache import DEFAULT_CACHE_PATH
+from .checkpoint import DEFAULT_CHECKPOINT_PATH
+from .convert import convert_pdf
+from .database import DatabaseWriter
+from .metrics import Metrics
+from .pages import DEFAULT_DPI
+from .pipeline import DEFAULT_OCR_WORKERS
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_JOBS_DIR = 'jobs'
+DEFAULT_MAX_JOBS = 2
+# Sırada bekleyebilecek en fazla iş; aşılırsa yükleme 503 ile reddedilir
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_REQUEST_TIMEOUT = 30.0
+DEFAULT_MAX_UPLOAD = 200 * 1024 * 1024
+# Bellekte tutulan en fazla iş sayısı; aşılınca en eski biten işler ve dosyaları silinir
+DEFAULT_MAX_RETAINED_JOBS = 1000
+MAX_HEADER_BYTES = 64 * 1024
+
+JOB_PATH_RE = re.compile(r'^/jobs/([0-9a-f]{32})(/announcements)?$')
+
+HTTP_REASONS = {
+    200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    408: 'Request Timeout', 409: 'Conflict', 411: 'Length Required', 413: 'Payload Too Large',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Job:
+    """Bir yüklemenin durumu; yalnızca bir iş parçacığı yazar, olay döngüsü okur."""
+
+    def __init__(self, job_id, name, pdf_path, mode):
+        self.job_id = job_id
+        self.name = name
+        self.pdf_path = pdf_path
+        self.mode = mode
+        self.status = 'queued'
+        self.progress = 0
+        self.pages_done = 0
+        self.total_pages = None
+        self.announcements = []
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def describe(self):
+        return {
+            'job_id': self.job_id,
+            'name': self.name,
+            'status': self.status,
+            'progress': self.progress,
+            'pages_done': self.pages_done,
+            'total_pages': self.total_pages,
+            'announcement_count': len(self.announcements),
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobServer:
+    """İşleri sıraya alan, çalıştıran ve HTTP üzerinden sunan sunucu."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, jobs_dir=DEFAULT_JOBS_DIR,
+                 max_jobs=DEFAULT_MAX_JOBS, queue_size=DEFAULT_QUEUE_SIZE,
+                 request_timeout=DEFAULT_REQUEST_TIMEOUT, max_upload=DEFAULT_MAX_UPLOAD,
+                 max_retained_jobs=DEFAULT_MAX_RETAINED_JOBS, ocr_workers=DEFAULT_OCR_WORKERS,
+                 checkpoint_path=DEFAULT_CHECKPOINT_PATH, cache_path=DEFAULT_CACHE_PATH,
+                 db_path=None, metrics_path=None, prometheus_path=None, ocr_processes=False, dpi=DEFAULT_DPI,
+                 log=print):
+        self.host = host
+        self.port = port
+        self.jobs_dir = jobs_dir
+        self.max_jobs = max(1, max_jobs)
+        self.request_timeout = request_timeout
+        self.max_upload = max_upload
+        self.max_retained_jobs = max_retained_jobs
+        # Aynı anda çalışan işler çekirdekleri paylaşır
+        self.ocr_workers = max(1, ocr_workers // self.max_jobs)
+        self.ocr_processes = ocr_processes
+        self.dpi = dpi
+        self.checkpoint_path = checkpoint_path
+        self.cache_path = cache_path
+        self.db_path = db_path
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
+        self.log = log
+        self.jobs = collections.OrderedDict()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.executor = None
+        self.metrics = None
+        self.db_writer = None
+        self.server = None
+        self.workers = []
+
+    async def start(self):
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix='JobWorker')
+        if self.metrics_path or self.prometheus_path:
+            self.metrics = Metrics(self.metrics_path, self.prometheus_path)
+        if self.db_path:
+            self.db_writer = DatabaseWriter(self.db_path, metrics=self.metrics)
+            self.db_writer.start()
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.max_jobs)]
+        self.server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER_BYTES)
+        # Port 0 verildiyse işletim sisteminin seçtiği port
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.log(f"http://{self.host}:{self.port} dinleniyor ({self.max_jobs} iş aynı anda)")
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        if self.executor is not None:
+            # Çalışan işler bitirilir; yarıda kesilenler kontrol noktasından devam edebilir
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+        if self.db_writer is not None:
+            self.db_writer.close()
+        if self.metrics is not None:
+            self.metrics.close()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    # İşler
+
+    async def submit(self, body, name, mode):
+        if self.queue.full():
+            raise HTTPError(503, "İş sırası dolu, daha sonra yeniden deneyin")
+        job_id = uuid.uuid4().hex
+        pdf_path = os.path.join(self.jobs_dir, f"{job_id}.pdf")
+        job = Job(job_id, name, pdf_path, mode)
+        # Dosya sıraya almadan önce yazılır (işçi yazılmamış dosyayı almasın); yazma olay
+        # döngüsünü bloklamasın diye varsayılan iş parçacığı havuzunda yapılır
+        await asyncio.get_running_loop().run_in_executor(None, self._write_upload, pdf_path, body)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            # Yazma sürerken sıra dolmuş olabilir
+            self._remove_files(job)
+            raise HTTPError(503, "İş sırası dolu, daha sonra yeniden deneyin")
+        self.jobs[job_id] = job
+        self._evict()
+        self.log(f"[{job_id}] {name} sıraya alındı ({len(body)} bayt)")
+        return job
+
+    @staticmethod
+    def _write_upload(pdf_path, body):
+        with open(pdf_path, 'wb') as f:
+            f.write(body)
+
+    def _evict(self):
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_retained_jobs:
+                break
+            job = self.jobs[job_id]
+            if job.status in ('done', 'failed'):
+                del self.jobs[job_id]
+                self._remove_files(job)
+
+    @staticmethod
+    def _remove_files(job):
+        for path in (job.pdf_path, os.path.splitext(job.pdf_path)[0] + '_ocr_results.txt'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            try:
+                await loop.run_in_executor(self.executor, self._run_job, job)
+            finally:
+                self.queue.task_done()
+
+    def _run_job(self, job):
+        job.status = 'running'
+
+        def save(completed):
+            job.announcements.extend(completed)
+            if self.db_writer is not None:
+                self.db_writer.put(completed)
+
+        def progress(page_num, done_pages, total_pages):
+            # Masaüstü arayüzünün ilerleme çubuğuyla aynı yüzde
+            job.pages_done = done_pages
+            job.total_pages = total_pages
+            job.progress = int(done_pages / total_pages * 100)
+
+        try:
+            _, total_pages, _ = convert_pdf(
+                job.pdf_path, mode=job.mode, save=save, metrics=self.metrics,
+                log=lambda message: self.log(f"[{job.job_id}] {message}"), progress=progress,
+                checkpoint_path=self.checkpoint_path, cache_path=self.cache_path,
+                ocr_workers=self.ocr_workers, ocr_processes=self.ocr_processes, dpi=self.dpi)
+            job.total_pages = job.pages_done = total_pages
+            job.progress = 100
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            self.log(f"[{job.job_id}] HATA: {e}\n{traceback.format_exc()}")
+        finally:
+            job.finished_at = time.time()
+
+    # HTTP
+
+    async def _handle(self, reader, writer):
+        try:
+            try:
+                method, target, headers = await asyncio.wait_for(self._read_head(reader), self.request_timeout)
+                status, payload = await self._dispatch(reader, method, target, headers)
+            except HTTPError as e:
+                status, payload = e.status, {'error': e.message}
+            except asyncio.TimeoutError:
+                status, payload = 408, {'error': "İstek zaman aşımına uğradı"}
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                status, payload = 400, {'error': "Geçersiz istek"}
+            except Exception as e:
+                self.log(f"HTTP isteği işlenemedi: {e}\n{traceback.format_exc()}")
+                status, payload = 500, {'error': str(e)}
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await asyncio.wait_for(writer.drain(), self.request_timeout)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_head(reader):
+        head = await reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        method, target, _ = lines[0].split(' ', 2)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+        return method, target, headers
+
+    async def _dispatch(self, reader, method, target, headers):
+        url = urlsplit(target)
+        if url.path == '/jobs':
+            if method != 'POST':
+                raise HTTPError(405, "Yalnızca POST desteklenir")
+            query = parse_qs(url.query)
+            mode = query.get('mode', ['hybrid'])[0]
+            if mode not in EXTRACTION_MODES:
+                raise HTTPError(400, f"Geçersiz mod: {mode}")
+            name = query.get('name', ['upload.pdf'])[0]
+            body = await asyncio.wait_for(self._read_body(reader, headers), self.request_timeout)
+            job = await self.submit(body, name, mode)
+            return 202, {'job_id': job.job_id, 'status_url': f"/jobs/{job.job_id}",
+                         'announcements_url': f"/jobs/{job.job_id}/announcements"}
+
+        match = JOB_PATH_RE.match(url.path)
+        if not match:
+            raise HTTPError(404, "Bulunamadı")
+        if method != 'GET':
+            raise HTTPError(405, "Yalnızca GET desteklenir")
+        job = self.jobs.get(match.group(1))
+        if job is None:
+            raise HTTPError(404, "İş bulunamadı")
+        if not match.group(2):
+            return 200, job.describe()
+        if job.status != 'done':
+            raise HTTPError(409, f"İş henüz tamamlanmadı (durum: {job.status})")
+        return 200, {'job_id': job.job_id, 'announcements': job.announcements}
+
+    async def _read_body(self, reader, headers):
+        if 'content-length' not in headers:
+            raise HTTPError(411, "Content-Length gerekli")
+        length = int(headers['content-length'])
+        if length > self.max_upload:
+            raise HTTPError(413, f"Dosya en fazla {self.max_upload // (1024 * 1024)} MB olabilir")
+        body = await reader.readexactly(length)
+        if not body.startswith(b'%PDF'):
+            raise HTTPError(400, "Gövde bir PDF dosyası değil")
+        return body
+
+
+def serve(log=print, **options):
+    """Sunucuyu başlatır ve Ctrl+C'ye kadar çalıştırır."""
+    try:
+        asyncio.run(JobServer(log=log, **options).serve_forever())
+    except KeyboardInterrupt:
+        log("Sunucu durduruldu")
@@ -0,0 +1,161 @@
+"""Süreçler arasında sayfa görüntülerini kopyalamadan aktaran paylaşımlı bellek havuzu.
+
+Eşik uygulanmış sayfa bir kez paylaşımlı bellek bölütüne yazılır; OCR
+işçisine yalnızca küçük bir tanıtıcı (``SharedPage``: bölüt adı ve şekil) ile
+sütun kutuları gönderilir. İşçi bölüte bağlanıp numpy görünümü üzerinden
+sütunları keser, piksel verisi hiç pickle edilmez. Bölütler sınırlı sayıda
+oluşturulur ve sayfa bitince boş listeye dönüp sonraki sayfa için yeniden
+kullanılır; böylece hem IPC maliyeti hem de en yüksek bellek sabit kalır.
+Her tanıtıcı havuzun o anki bölüt adlarını da taşır; işçi, havuzun sildiği
+bölütlere ait bağlantıları bir sonraki sayfada kapatır.
+"""
+import collections
+import threading
+from multiprocessing import shared_memory
+
+# Bölüt boyutları bu katlara yuvarlanır; otomatik DPI'da boyutu biraz
+# değişen sayfalar da aynı bölütü kullanabilsin
+BUFFER_ALIGN = 1024 * 1024
+# İşçi süreçte açık tutulan en fazla bölüt bağlantısı
+MAX_ATTACHED = 16
+POLL_INTERVAL = 0.1
+
+# name: paylaşımlı bellek bölütünün adı; shape: sayfa görüntüsünün şekli (uint8);
+# serial: havuzun tanıtıcıya verdiği artan sıra numarası; live: o anda havuzdaki bölüt adları
+SharedPage = collections.namedtuple('SharedPage', 'name shape serial live', defaults=(0, ()))
+
+
+def _aligned(nbytes):
+    return max(BUFFER_ALIGN, -(-nbytes // BUFFER_ALIGN) * BUFFER_ALIGN)
+
+
+class PageBufferPool:
+    """Sayfa görüntüleri için yeniden kullanılan, sayısı sınırlı paylaşımlı bellek bölütleri.
+
+    ``acquire`` boş listeden sayfaya yeten en küçük bölütü verir; yoksa ve
+    sınıra ulaşılmamışsa yenisini oluşturur. Sınırdayken boş bölütlerin hiçbiri
+    yetmiyorsa en küçüğü silinip yerine yeterince büyüğü açılır; boş bölüt
+    yoksa biri ``release`` ile geri verilene kadar beklenir. ``close`` tüm
+    bölütleri siler.
+    """
+
+    def __init__(self, max_buffers):
+        self.max_buffers = max(1, max_buffers)
+        self.segments = {}
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        self.issued = 0
+        self.peak_bytes = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, shape, stop=None):
+        """``shape`` boyutunda bir sayfa için bölüt ayırır; ``(SharedPage, görünüm)`` döndürür.
+
+        Beklerken ``stop`` olayı kurulursa None döner.
+        """
+        import numpy as np
+        shape = tuple(int(size) for size in shape)
+        nbytes = int(np.prod(shape))
+        with self.condition:
+            while True:
+                fitting = [name for name in self.free if self.segments[name].size >= nbytes]
+                if fitting:
+                    name = min(fitting, key=lambda name: self.segments[name].size)
+                    self.free.remove(name)
+                    self.reused += 1
+                    break
+                if len(self.segments) >= self.max_buffers and self.free:
+                    smallest = min(self.free, key=lambda name: self.segments[name].size)
+                    self.free.remove(smallest)
+                    self._unlink(smallest)
+                if len(self.segments) < self.max_buffers:
+                    segment = shared_memory.SharedMemory(create=True, size=_aligned(nbytes))
+                    name = segment.name
+                    self.segments[name] = segment
+                    self.created += 1
+                    self.peak_bytes = max(self.peak_bytes, self.total_bytes())
+                    break
+                if stop is not None and stop.is_set():
+                    return None
+                self.condition.wait(POLL_INTERVAL)
+            self.issued += 1
+            page = SharedPage(name, shape, self.issued, tuple(self.segments))
+        return page, self.view(page)
+
+    def view(self, page):
+        """Bölüt üzerinde kopyasız numpy görünümü."""
+        import numpy as np
+        return np.ndarray(page.shape, dtype=np.uint8, buffer=self.segments[page.name].buf)
+
+    def release(self, page):
+        with self.condition:
+            if page.name in self.segments:
+                self.free.append(page.name)
+            self.condition.notify_all()
+
+    def total_bytes(self):
+        return sum(segment.size for segment in self.segments.values())
+
+    def stats(self):
+        """``(bölüt sayısı, toplam bayt, en yüksek bayt, oluşturulan, yeniden kullanılan)``"""
+        with self.condition:
+            return len(self.segments), self.total_bytes(), self.peak_bytes, self.created, self.reused
+
+    def close(self):
+        with self.condition:
+            for name in list(self.segments):
+                self._unlink(name)
+            self.free = []
+
+    def _unlink(self, name):
+        segment = self.segments.pop(name)
+        # Ad önce silinir; kapatma başarısız olsa da bölüt sızmaz
+        segment.unlink()
+        segment.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# İşçi süreçte bölüt adı -> [bağlantı, bölütün görüldüğü en büyük tanıtıcı sıra numarası];
+# havuz bölütleri yeniden kullandığından aynı bölüte her sayfada yeniden bağlanılmaz
+_attached = collections.OrderedDict()
+
+
+def _close_retired(page):
+    """Havuzun bu tanıtıcıdan önce sildiği bölütlerin bağlantılarını kapatır.
+
+    Bölüt adları yeniden kullanılmaz: daha önceki bir tanıtıcıda görülüp bu
+    tanıtıcının ``live`` listesinde olmayan bölüt silinmiştir. Daha yeni bir
+    tanıtıcıda görülen bölüt bu sayfadan sonra açılmış olabilir, dokunulmaz.
+    """
+    if not page.live:
+        return
+    for name, (segment, serial) in list(_attached.items()):
+        if serial < page.serial and name not in page.live:
+            del _attached[name]
+            segment.close()
+
+
+def attach_page(page):
+    """İşçi süreçte ``SharedPage``'in numpy görünümünü döndürür.
+
+    Bağlantılar süreç başına saklanır; havuzdan silinmiş bölütlerin
+    bağlantıları kapatılır, ``MAX_ATTACHED`` aşılırsa da en eski bağlantı
+    kapatılır. Görünüm, sayfa işlenip bırakıldıktan sonra tutulmamalıdır.
+    """
+    import numpy as np
+    _close_retired(page)
+    entry = _attached.get(page.name)
+    if entry is None:
+        while len(_attached) >= MAX_ATTACHED:
+            _attached.popitem(last=False)[1][0].close()
+        entry = _attached[page.name] = [shared_memory.SharedMemory(name=page.name), page.serial]
+    else:
+        entry[1] = max(entry[1], page.serial)
+        _attached.move_to_end(page.name)
+    return np.ndarray(page.shape, dtype=np.uint8, buffer=entry[0].buf)
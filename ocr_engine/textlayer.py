@@ -0,0 +1,45 @@
+"""Doğrudan dijital üretilmiş PDF'lerde gömülü metin katmanını okuma."""
+import re
+import subprocess
+
+from .ocr import clean_text, preprocess_text
+
+WORD_RE = re.compile(r"[A-Za-zÇĞİÖŞÜçğıöşü]{2,}")
+
+# Bu eşiklerin altındaki metin katmanı taranmış sayfanın kötü OCR katmanı
+# ya da boş sayfa kabul edilir ve sayfa yeniden OCR'dan geçirilir
+MIN_TEXT_CHARS = 200
+MIN_WORD_RATIO = 0.5
+MAX_REPLACEMENT_RATIO = 0.01
+
+
+def extract_text_layer(pdf_path, page_num):
+    """Sayfanın (0 tabanlı) gömülü metnini pdftotext ile okur; okunamazsa boş döner."""
+    try:
+        result = subprocess.run(
+            ['pdftotext', '-f', str(page_num + 1), '-l', str(page_num + 1), '-enc', 'UTF-8', pdf_path, '-'],
+            capture_output=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return result.stdout.decode('utf-8', errors='replace')
+
+
+def is_usable_text(text):
+    """Metin katmanının OCR yerine kullanılabilecek kadar iyi olup olmadığını döndürür."""
+    stripped = text.strip()
+    if len(stripped) < MIN_TEXT_CHARS:
+        return False
+    if stripped.count('�') / len(stripped) > MAX_REPLACEMENT_RATIO:
+        return False
+    tokens = stripped.split()
+    words = sum(1 for token in tokens if WORD_RE.search(token))
+    return words / len(tokens) >= MIN_WORD_RATIO
+
+
+def page_text_layer(pdf_path, page_num):
+    """Kullanılabilir metin katmanını temizlenmiş halde döndürür, yoksa None döner."""
+    text = extract_text_layer(pdf_path, page_num)
+    if not is_usable_text(text):
+        return None
+    return preprocess_text(clean_text(text)) + "\n\n"
@@ -0,0 +1,103 @@
+"""Bir klasörü izleyip gelen PDF'leri arayüz olmadan işleyen servis.
+
+Klasör belirli aralıklarla taranır; boyutu ve değişiklik zamanı iki tarama
+arasında değişmeyen (kopyalanması bitmiş) her PDF'in içerik özeti alınır.
+Özeti veritabanındaki ``documents`` tablosunda olan PDF'ler, adı ya da yeri
+değişmiş olsa bile yeniden işlenmez. Yeni PDF'ler masaüstü arayüzüyle aynı
+dönüştürme akışından (convert.convert_pdf) geçer; ilanlar kaynak PDF'in
+özeti ve sayfa numaralarıyla yazılır, belge ancak tüm ilanları yazıldıktan
+sonra işlenmiş olarak kaydedilir.
+"""
+import os
+import time
+import traceback
+
+from .batch import find_pdfs
+from .cache import DEFAULT_CACHE_PATH
+from .checkpoint import DEFAULT_CHECKPOINT_PATH, file_hash
+from .convert import convert_pdf
+from .database import DEFAULT_DB_PATH, connect, is_document_processed, record_document, write_announcements
+from .metrics import Metrics, timed
+from .pages import DEFAULT_DPI
+from .pipeline import DEFAULT_OCR_WORKERS
+
+DEFAULT_POLL_INTERVAL = 10.0
+
+
+def watch_folder(directory, db_path=DEFAULT_DB_PATH, interval=DEFAULT_POLL_INTERVAL, mode='hybrid',
+                 checkpoint_path=DEFAULT_CHECKPOINT_PATH, cache_path=DEFAULT_CACHE_PATH,
+                 ocr_workers=DEFAULT_OCR_WORKERS, metrics_path=None, prometheus_path=None,
+                 once=False, ocr_processes=False, dpi=DEFAULT_DPI, log=print):
+    """``directory`` altındaki PDF'leri ``interval`` saniyede bir tarayıp yenilerini işler.
+
+    ``once`` verilirse klasör bir kez taranır, o anda bulunan tüm PDF'ler
+    beklemeden işlenir ve fonksiyon döner (ör. zamanlanmış görev olarak
+    çalıştırmak için). Dosyalar sırayla işlenir; bir PDF'in hatası sonraki
+    dosyaları durdurmaz, aynı içerik klasörde kaldığı sürece yeniden denenmez.
+    ``ocr_processes`` açıkken OCR süreçlerde yapılır; ``dpi`` sayı ya da
+    ``'auto'`` olabilir. İşlenen PDF sayısı döndürülür.
+    """
+    metrics = Metrics(metrics_path, prometheus_path) if metrics_path or prometheus_path else None
+    conn = connect(db_path)
+    # Önceki taramada görülen dosya imzaları; özeti alınmış dosyaların imzası ve özeti.
+    # Hepsi her taramada klasördeki dosyalarla sınırlanır, silinen dosyalar unutulur
+    signatures = {}
+    handled = {}
+    failed = set()
+    processed = 0
+
+    def save(completed):
+        with timed(metrics, 'database', announcements=len(completed)) as fields:
+            fields['rows'] = write_announcements(conn, completed)
+
+    log(f"{directory} izleniyor ({interval:g} sn aralıkla)")
+    try:
+        while True:
+            current = {}
+            for pdf_path in find_pdfs([directory]):
+                try:
+                    stat = os.stat(pdf_path)
+                except OSError:
+                    # Tarama sırasında silinmiş ya da taşınmış
+                    continue
+                signature = current[pdf_path] = (stat.st_size, stat.st_mtime_ns)
+                # Hâlâ kopyalanan bir dosya yarım haliyle işlenmesin
+                if not once and signatures.get(pdf_path) != signature:
+                    continue
+                if pdf_path in handled and handled[pdf_path][0] == signature:
+                    continue
+
+                pdf_hash = file_hash(pdf_path)
+                handled[pdf_path] = signature, pdf_hash
+                name = os.path.basename(pdf_path)
+                if pdf_hash in failed:
+                    continue
+                if is_document_processed(conn, pdf_hash):
+                    log(f"{name}: daha önce işlenmiş, atlanıyor")
+                    continue
+
+                log(f"{name}: işleniyor")
+                try:
+                    _, page_count, announcement_count = convert_pdf(
+                        pdf_path, mode=mode, save=save, metrics=metrics, log=lambda message: log(f"[{name}] {message}"),
+                        pdf_hash=pdf_hash, checkpoint_path=checkpoint_path, cache_path=cache_path,
+                        ocr_workers=ocr_workers, ocr_processes=ocr_processes, dpi=dpi)
+                    record_document(conn, pdf_hash, pdf_path, page_count, announcement_count)
+                    processed += 1
+                    log(f"{name}: tamamlandı ({page_count} sayfa, {announcement_count} ilan)")
+                except Exception as e:
+                    failed.add(pdf_hash)
+                    log(f"{name}: HATA: {e}\n{traceback.format_exc()}")
+                    log(f"{name}: tamamlanan sayfalar kaydedildi; servis yeniden başlatıldığında kaldığı yerden devam edilecek")
+            # Silinen dosyaların imzaları ve özetleri tutulmaz
+            signatures = current
+            handled = {pdf_path: handled[pdf_path] for pdf_path in current if pdf_path in handled}
+            failed &= {pdf_hash for _, pdf_hash in handled.values()}
+            if once:
+                break
+            time.sleep(interval)
+    finally:
+        conn.close()
+        if metrics is not None:
+            metrics.close()
+    return processed
@@ -1,22 +1,27 @@
 import sys
 import os
-from PyQt5.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QFileDialog, QLabel, QProgressBar, QTextEdit
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QFileDialog, QLabel, QProgressBar, QPlainTextEdit
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal, Qt
 from PyQt5.QtGui import QMovie
-from pdf2image import convert_from_path
-import pytesseract
-import re
 import subprocess
-import spacy
-import cv2
-import numpy as np
 import traceback
-import sqlite3
 import gc
-
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
-# spaCy modelini yükleyelim (Türkçe model)
-nlp = spacy.load("tr_core_news_trf")
+import collections
+
+from ocr_engine import ocr as ocr_steps
+from ocr_engine import database
+from ocr_engine import pages
+from ocr_engine import parser
+from ocr_engine.convert import convert_pdf
+from ocr_engine.logbuffer import LogBuffer
+from ocr_engine.metrics import DEFAULT_METRICS_PATH, Metrics
+from ocr_engine.ner import Ner
+from ocr_engine.pipeline import DEFAULT_MEMORY_CAP, file_resources
+
+# OCR_NER_MODEL ile bir spaCy modeli verilirse ilanlar NER ile zenginleştirilir;
+# verilmezse model hiç yüklenmez
+NER = Ner(os.environ['OCR_NER_MODEL']) if os.environ.get('OCR_NER_MODEL') else None
+CPU_COUNT = os.cpu_count() or 1
 
 class PDFConverterThread(QThread):
     progress = pyqtSignal(int)
@@ -24,531 +29,89 @@ class PDFConverterThread(QThread):
     progress_value = pyqtSignal(int)  # Her sayfanın ilerlemesini iletmek için yeni sinyal
     log_signal = pyqtSignal(str)  # Yeni log sinyali
 
-    def __init__(self, pdf_path):
+    def __init__(self, pdf_path, extraction_mode='hybrid', db_writer=None, metrics=None,
+                 ocr_workers=CPU_COUNT, memory_cap=DEFAULT_MEMORY_CAP, ocr_processes=False):
         super().__init__()
         self.pdf_path = pdf_path
-        self.nlp = None
+        self.extraction_mode = extraction_mode
+        self.db_writer = db_writer
+        self.metrics = metrics
+        self.ocr_workers = ocr_workers
+        self.memory_cap = memory_cap
+        self.ocr_processes = ocr_processes
 
     def run(self):
         try:
             self.log_signal.emit(f"PDF işleme başlatılıyor: {os.path.basename(self.pdf_path)}")
-            self.nlp = spacy.load("tr_core_news_trf")
-            self.log_signal.emit("Türkçe NLP modeli yüklendi")
-            output_text = ""
-
-            # Önce toplam sayfa sayısını al
-            self.log_signal.emit("Toplam sayfa sayısı hesaplanıyor...")
-            images = convert_from_path(self.pdf_path)
-            total_pages = len(images)
-            self.log_signal.emit(f"Toplam {total_pages} sayfa tespit edildi")
-            del images
+
+            # Sayfa çıkarma, ayrıştırma ve kontrol noktaları arayüzden bağımsız dönüştürme akışındadır;
+            # aynı anda işlenen dosyalar çekirdekleri ve bellek sınırını paylaşır
+            txt_path, _, _ = convert_pdf(
+                self.pdf_path, mode=self.extraction_mode, save=self.save_to_database,
+                metrics=self.metrics, log=self.log_signal.emit, progress=self.emit_page_progress,
+                ocr_workers=self.ocr_workers, memory_cap=self.memory_cap, ner=NER,
+                ocr_processes=self.ocr_processes)
             gc.collect()
 
-            # Sayfaları tek tek işle
-            for page_num in range(total_pages):
-                self.log_signal.emit(f"\nSayfa {page_num + 1} işleniyor...")
-                
-                # Her seferinde sadece bir sayfa yükle
-                self.log_signal.emit("- Sayfa yükleniyor...")
-                images = convert_from_path(self.pdf_path, first_page=page_num + 1, last_page=page_num + 1)
-                image = images[0]
-
-                # Görseli numpy array'e dönüştür
-                self.log_signal.emit("- Görsel işleniyor...")
-                img_np = np.array(image)
-
-                # Görseli gri tonlamaya çevir
-                self.log_signal.emit("- Gri tonlamaya dönüştürülüyor...")
-                gray_image = cv2.cvtColor(img_np, cv2.COLOR_RGB2GRAY)
-
-                # Adaptive threshold uygula
-                self.log_signal.emit("- Threshold uygulanıyor...")
-                thresh_image = cv2.adaptiveThreshold(gray_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-
-                # Sayfayı sütunlara ayır
-                self.log_signal.emit("- Sayfa sütunlara ayrılıyor...")
-                columns = self.split_into_columns(thresh_image)
-
-                page_text = ""
-                self.log_signal.emit("- OCR işlemi başlatılıyor...")
-                for i, col in enumerate(columns, 1):
-                    self.log_signal.emit(f"  * Sütun {i} işleniyor...")
-                    # Her sütun için OCR uygula
-                    col_text = pytesseract.image_to_string(col, lang='tur')
-                    cleaned_text = self.clean_text(col_text)
-
-                    # Ön işleme tabi tut
-                    preprocessed_text = self.preprocess_text(cleaned_text)
-                    page_text += preprocessed_text + "\n\n"
-
-                output_text += f"Sayfa {page_num + 1} için çıkarılan metin:\n"
-                output_text += page_text + "\n\n"
-
-                # Bellek temizliği
-                self.log_signal.emit("- Bellek temizleniyor...")
-                del images, image, img_np, gray_image, thresh_image, columns
-                gc.collect()
-
-                # Progress
-                progress_percentage = int((page_num + 1) / total_pages * 100)
-                self.progress.emit(progress_percentage)
-                self.progress_value.emit(progress_percentage)
-                self.log_signal.emit(f"- Sayfa {page_num + 1} tamamlandı (%{progress_percentage})")
-
-            self.log_signal.emit("\nMetin analizi yapılıyor...")
-            parsed_data = self.parse_text(output_text)
-            
-            self.log_signal.emit("Veritabanına kaydediliyor...")
-            self.save_to_database(parsed_data)
-
-            txt_path = os.path.splitext(self.pdf_path)[0] + '_ocr_results.txt'
-            self.log_signal.emit(f"Sonuçlar dosyaya yazılıyor: {os.path.basename(txt_path)}")
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write(output_text)
-            
             self.log_signal.emit("İşlem başarıyla tamamlandı!")
             self.finished.emit(txt_path)
 
         except Exception as e:
             error_message = f"Hata: {e}\n{traceback.format_exc()}"
             self.log_signal.emit(f"\nHATA OLUŞTU:\n{error_message}")
+            self.log_signal.emit("Tamamlanan sayfalar kaydedildi; PDF yeniden seçildiğinde kaldığı yerden devam edilecek")
             print(error_message)
             self.finished.emit(error_message)
 
+    def emit_page_progress(self, page_num, done_pages, total_pages):
+        progress_percentage = int(done_pages / total_pages * 100)
+        self.progress.emit(progress_percentage)
+        self.progress_value.emit(progress_percentage)
+        self.log_signal.emit(f"- Sayfa {page_num + 1} tamamlandı (%{progress_percentage})")
+
     def split_into_columns(self, image):
-        height, width = image.shape
-        mid = width // 2
-        left_column = image[:, :mid]
-        right_column = image[:, mid:]
-        return [left_column, right_column]
+        return pages.split_into_columns(image)
 
     @staticmethod
     def clean_text(text):
         """Metindeki yasadışı karakterleri temizler."""
-        ILLEGAL_CHARACTERS_RE = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
-        return ILLEGAL_CHARACTERS_RE.sub('', text)
+        return ocr_steps.clean_text(text)
 
     @staticmethod
     def preprocess_text(text):
         """OCR hatalarını düzeltmek için metni ön işler."""
-        corrections = {
-            # OCR hataları düzeltmeleri (örneğin, 'l' yerine 'I' gibi)
-        }
-        for wrong, correct in corrections.items():
-            text = text.replace(wrong, correct)
-        return text
+        return ocr_steps.preprocess_text(text)
 
     # Metni parse eden fonksiyonlar
     def parse_text(self, text):
         """Metni parse eder ve verileri çıkarır."""
-        # Metni ilanlara böl
-        announcements = self.split_announcements(text)
-        parsed_announcements = []
-        for announcement in announcements:
-            data = self.parse_announcement(announcement)
-            parsed_announcements.append(data)
-        return parsed_announcements
+        return parser.parse_text(text)
 
     def split_announcements(self, text):
         """Metni ilanlara böler."""
-        pattern = r"(?:T\.C\.|TC)[ ]?.+?T[İI]CARET S[İI]C[İI]L[İI] M[ÜU]D[ÜU]RL[ÜU][ĞG][ÜU]['’]?[N]?[D]?EN"
-        matches = list(re.finditer(pattern, text, re.DOTALL | re.IGNORECASE))
-        announcements = []
-        for i in range(len(matches)):
-            start = matches[i].start()
-            if i + 1 < len(matches):
-                end = matches[i + 1].start()
-            else:
-                end = len(text)
-            announcement_text = text[start:end].strip()
-            announcements.append(announcement_text)
-        return announcements
+        return parser.split_announcements(text)
 
     def parse_announcement(self, announcement_text):
         """Her ilandan verileri çıkarır."""
-        data = {}
-
-        # Şehir
-        city_match = re.search(
-            r"(?:T\.C\.|TC)[ ]?(.+?)\s+T[İI][CÇ]ARET S[İI]C[İI]L[İI]\s+M[ÜU][DÐ][ÜU]RL[ÜU][ĞG][ÜU]['’]?[N]?[D]?EN",
-            announcement_text,
-            re.DOTALL | re.IGNORECASE
-        )
-        if city_match:
-            data['city'] = city_match.group(1).strip()
-
-        # İlan Sıra No
-        ilan_no_match = re.search(
-            r"İlan Sıra No\s*[:：]?\s*(\d+)",
-            announcement_text,
-            re.IGNORECASE
-        )
-        if ilan_no_match:
-            data['ilan_sira_no'] = ilan_no_match.group(1).strip()
-
-        # MERSİS No
-        mersis_no_match = re.search(
-            r"MERS[İI]S No\s*[:：]?\s*(\d+)",
-            announcement_text,
-            re.IGNORECASE
-        )
-        if mersis_no_match:
-            data['mersis_no'] = mersis_no_match.group(1).strip()
-
-        # Ticaret Sicil / Dosya No
-        ticaret_sicil_no_match = re.search(
-            r"Ticaret Sicil[ / Dosya]* No\s*[:：]?\s*(.+)",
-            announcement_text,
-            re.IGNORECASE
-        )
-        if ticaret_sicil_no_match:
-            data['ticaret_sicil_no'] = ticaret_sicil_no_match.group(1).strip()
-
-        # Ticaret Unvanı
-        ticaret_unvani_match = re.search(
-            r"Ticaret Unvan[ıi]\s*[:：]?\s*(.*?)(?:\n|$)([A-ZİĞÜŞÖÇ].+)",
-            announcement_text,
-            re.IGNORECASE
-        )
-        if ticaret_unvani_match:
-            first_line = ticaret_unvani_match.group(1).strip()
-            second_line = ticaret_unvani_match.group(2).strip()
-            if first_line:
-                data['ticaret_unvani'] = f"{first_line} {second_line}".strip()
-            else:
-                data['ticaret_unvani'] = second_line
-        else:
-            # Alternatif olarak, sadece bir satır sonraki ifadeyi al
-            ticaret_unvani_match = re.search(
-                r"Ticaret Unvan[ıi]\s*[:：]?\s*(.+)",
-                announcement_text,
-                re.IGNORECASE
-            )
-            if ticaret_unvani_match:
-                data['ticaret_unvani'] = ticaret_unvani_match.group(1).strip()
-
-        # Adres
-        adres_match = re.search(
-            r"Adres\s*[:：]?\s*(.+?)(?=\n\n|Yukarıda|Tescil Edilen Hususlar|$)",
-            announcement_text,
-            re.DOTALL | re.IGNORECASE
-        )
-        if adres_match:
-            data['adres'] = adres_match.group(1).strip()
-
-        # Tescil Edilen Hususlar
-        tescil_hususlar_match = re.search(
-            r"Tescil Edilen Hususlar\s*[:：]?\s*(.+?)(?:\n|$)",
-            announcement_text,
-            re.IGNORECASE
-        )
-        if tescil_hususlar_match:
-            data['tescil_edilen_hususlar'] = tescil_hususlar_match.group(1).strip()
-
-        # Tescile Delil Olan Belgeler
-        tescil_belgeler_match = re.search(
-            r"Tescile Delil Olan Belgeler\s*[:：]?\s*(.+?)(?=\n|$)",
-            announcement_text,
-            re.DOTALL | re.IGNORECASE
-        )
-        if tescil_belgeler_match:
-            data['tescile_delil_olan_belgeler'] = tescil_belgeler_match.group(1).strip()
-
-        # Detaylar
-        details_match = re.search(
-            r"(?:Tescil Edilen Hususlar.*?)(?:\n\n|\n)(.+)",
-            announcement_text,
-            re.DOTALL | re.IGNORECASE
-        )
-        if details_match:
-            data['details'] = details_match.group(1).strip()
-        else:
-            data['details'] = ''
-
-        # Şahıs Bilgilerini Çıkar
-        data['persons'] = self.parse_persons(announcement_text)
-
-        # Şirket ile ilgili maskelenmiş kimlik numarası ve ad-soyad varsa, bunları da persons'a ekle
-        company_persons = self.extract_company_persons(announcement_text)
-        if company_persons:
-            if 'persons' not in data:
-                data['persons'] = []
-            data['persons'].extend(company_persons)
-
-        # Özel durumlar için detaylı parça alma
-        if 'KONKORDATO' in announcement_text.upper():
-            data['konkordato'] = self.parse_konkordato_details(announcement_text)
-
-        if 'PAY DEVRİ' in announcement_text.upper():
-            data['pay_devri'] = self.parse_pay_devri_details(announcement_text)
-
-        return data
-
-    def parse_persons(self, announcement_text):
-        """Şahısların kimlik numaraları, isimleri ve adreslerini çıkarır."""
-        persons = []
-
-        # Regex deseni
-        pattern = r"Türkiye Cumhuriyeti Uyruklu\s+(\d{3}\*{4,6}\d{2,3} Kimlik No'lu),?\s*([A-ZÇŞĞÜÖİ\s/]+) adresinde ikamet eden,?\s*([A-ZÇŞĞÜÖİ\s']+)"
-        matches = re.findall(pattern, announcement_text, re.DOTALL | re.IGNORECASE)
-        for match in matches:
-            person_data = {
-                'kimlik_no': match[0].strip(),
-                'adres': match[1].strip(),
-                'isim': match[2].strip()
-            }
-            persons.append(person_data)
-
-        return persons
-
-    def extract_company_persons(self, announcement_text):
-        """Şirket ile ilgili maskelenmiş kimlik numarası ve ad-soyad bilgilerini çıkarır."""
-        persons = []
-
-        # Yönetim kurulu üyeleri ve diğer yetkilileri yakalamak için regex
-        pattern = r"(\d{3}\*{4,6}\d{2,3} Kimlik No'lu),?\s*([A-ZÇŞĞÜÖİ\s/]+) adresinde ikamet eden,?\s*([A-ZÇŞĞÜÖİ\s']+)"
-        matches = re.findall(pattern, announcement_text, re.DOTALL | re.IGNORECASE)
-        for match in matches:
-            person_data = {
-                'kimlik_no': match[0].strip(),
-                'adres': match[1].strip(),
-                'isim': match[2].strip()
-            }
-            persons.append(person_data)
-
-        # Ayrıca, 'Kimlik Numaralı' ifadesiyle verilen kişileri yakala
-        pattern2 = r"(\d{3}\*{4,6}\d{2,3} Kimlik Numaralı)\s+([A-ZÇŞĞÜÖİ\s']+) (\d[\d\.,]+ TL) sermaye karşılığı (\d+) adet payını hukuki ve mali yükümlülükleri ile (\d{3}\*{4,6}\d{2,3} Kimlik Numaralı) ([A-ZÇŞĞÜÖİ\s']+)'e devretmiştir"
-        matches2 = re.findall(pattern2, announcement_text, re.DOTALL | re.IGNORECASE)
-        for match in matches2:
-            person_data = {
-                'kimlik_no': match[0].strip(),
-                'isim': match[1].strip(),
-                'adres': ''
-            }
-            persons.append(person_data)
-
-        return persons
-
-    def parse_konkordato_details(self, announcement_text):
-        data = {}
-        # Mahkeme Kararı Tarihi
-        mahkeme_karari_tarihi_match = re.search(
-            r"\d+\. ASL[İI]YE HUKUK MAHKEMES[İI]'n[ıi]n (\d{1,2}\.\d{1,2}\.\d{4}) tarihli karar[ıi] ile",
-            announcement_text,
-            re.IGNORECASE
-        )
-        if mahkeme_karari_tarihi_match:
-            data['mahkeme_karari_tarihi'] = mahkeme_karari_tarihi_match.group(1)
-
-        # Başlangıç Tarihi
-        baslangic_tarihi_match = re.search(
-            r"Başlangıç Tarihi\s*[:：]?\s*(.+)",
-            announcement_text,
-            re.IGNORECASE
-        )
-        if baslangic_tarihi_match:
-            data['baslangic_tarihi'] = baslangic_tarihi_match.group(1).strip()
-
-        # Bitiş Tarihi
-        bitis_tarihi_match = re.search(
-            r"Bitiş Tarihi\s*[:：]?\s*(.+)",
-            announcement_text,
-            re.IGNORECASE
-        )
-        if bitis_tarihi_match:
-            data['bitis_tarihi'] = bitis_tarihi_match.group(1).strip()
-
-        # Konkordato Komiseri
-        komiser_match = re.search(
-            r"(\d{3}\*{4,6}\d{2,3} Kimlik No'lu),?\s*([A-ZÇŞĞÜÖİ\s/]+) adresinde ikamet eden,?\s*([A-ZÇŞĞÜÖİ\s']+);\s*(\d{1,2}\.\d{1,2}\.\d{4}) tarihine kadar Konkordato Komiseri olarak atanmıştır",
-            announcement_text,
-            re.DOTALL | re.IGNORECASE
-        )
-        if komiser_match:
-            data['komiser_kimlik_no'] = komiser_match.group(1).strip()
-            data['komiser_adres'] = komiser_match.group(2).strip()
-            data['komiser_adi'] = komiser_match.group(3).strip()
-            data['komiser_gorev_bitis_tarihi'] = komiser_match.group(4).strip()
-
-            # Konkordato komiserini persons listesine ekle
-            data.setdefault('persons', []).append({
-                'kimlik_no': data['komiser_kimlik_no'],
-                'isim': data['komiser_adi'],
-                'adres': data['komiser_adres']
-            })
-
-        return data
-
-    def parse_pay_devri_details(self, announcement_text):
-        data = {}
-
-        # Devir İşlemi
-        devir_eden_match = re.search(
-            r"Şirket Ortaklarından (\d{3}\*{4,6}\d{2,3} Kimlik Numaralı) ([A-ZÇŞĞÜÖİ\s']+) (\d[\d\.,]+ TL) sermaye karşılığı (\d+) adet payını hukuki ve mali yükümlülükleri ile (\d{3}\*{4,6}\d{2,3} Kimlik Numaralı) ([A-ZÇŞĞÜÖİ\s']+)'e devretmiştir",
-            announcement_text,
-            re.DOTALL | re.IGNORECASE
-        )
-        if devir_eden_match:
-            data['devir_eden_kimlik_no'] = devir_eden_match.group(1).strip()
-            data['devir_eden_adi'] = devir_eden_match.group(2).strip()
-            data['devredilen_tutar'] = devir_eden_match.group(3)
-            data['devredilen_pay_adedi'] = devir_eden_match.group(4)
-            data['devir_alici_kimlik_no'] = devir_eden_match.group(5).strip()
-            data['devir_alici_adi'] = devir_eden_match.group(6).strip()
-
-            # Devir eden ve alan kişileri persons tablosuna ekle
-            data.setdefault('persons', []).extend([
-                {
-                    'kimlik_no': data['devir_eden_kimlik_no'],
-                    'isim': data['devir_eden_adi'],
-                    'adres': ''
-                },
-                {
-                    'kimlik_no': data['devir_alici_kimlik_no'],
-                    'isim': data['devir_alici_adi'],
-                    'adres': ''
-                }
-            ])
-
-        # Yeni Ortaklık Yapısı
-        shareholding_matches = re.findall(
-            r"([A-ZÇŞĞÜÖİ\s']+)\s*:\s*Beheri ([\d\.,]+) Türk Lirası değerinde (\d+) adet paya karşılık gelen ([\d\.,]+) Türk Lirası",
-            announcement_text,
-            re.DOTALL | re.IGNORECASE
-        )
-        shareholders = []
-        for match in shareholding_matches:
-            shareholder = {
-                'adi': match[0].strip(),
-                'beher_pay_degeri': match[1],
-                'pay_adedi': match[2],
-                'toplam_tutar': match[3]
-            }
-            shareholders.append(shareholder)
-            # Ortakları persons tablosuna ekle
-            data.setdefault('persons', []).append({
-                'kimlik_no': '',  # Kimlik numarası yoksa boş bırakıyoruz
-                'isim': shareholder['adi'],
-                'adres': ''
-            })
-        data['shareholders'] = shareholders
-
-        return data
+        return parser.parse_announcement(announcement_text)
 
     # Veritabanına kayıt eden fonksiyon
     def save_to_database(self, parsed_announcements):
-        """Verileri veritabanına kaydeder."""
-        conn = sqlite3.connect('company_records.db')
-        cursor = conn.cursor()
-
-        # Tablo oluşturma
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS companies (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            mersis_no TEXT,
-            ticaret_sicil_no TEXT,
-            ticaret_unvani TEXT,
-            adres TEXT,
-            city TEXT
-        )
-        ''')
-
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS announcements (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company_id INTEGER,
-            ilan_sira_no TEXT,
-            tescil_edilen_hususlar TEXT,
-            tescile_delil_olan_belgeler TEXT,
-            details_text TEXT,
-            FOREIGN KEY(company_id) REFERENCES companies(id)
-        )
-        ''')
-
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS persons (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company_id INTEGER,
-            kimlik_no TEXT,
-            isim TEXT,
-            adres TEXT,
-            FOREIGN KEY(company_id) REFERENCES companies(id)
-        )
-        ''')
-
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS konkordato (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company_id INTEGER,
-            mahkeme_karari_tarihi TEXT,
-            baslangic_tarihi TEXT,
-            bitis_tarihi TEXT,
-            komiser_kimlik_no TEXT,
-            komiser_adres TEXT,
-            komiser_adi TEXT,
-            komiser_gorev_bitis_tarihi TEXT,
-            FOREIGN KEY(company_id) REFERENCES companies(id)
-        )
-        ''')
-
-        for data in parsed_announcements:
-            # Şirketi kaydet
-            cursor.execute('''
-            INSERT INTO companies (mersis_no, ticaret_sicil_no, ticaret_unvani, adres, city)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (
-                data.get('mersis_no'),
-                data.get('ticaret_sicil_no'),
-                data.get('ticaret_unvani'),
-                data.get('adres'),
-                data.get('city')
-            ))
-            company_id = cursor.lastrowid
-
-            # İlanı kaydet
-            cursor.execute('''
-            INSERT INTO announcements (company_id, ilan_sira_no, tescil_edilen_hususlar, tescile_delil_olan_belgeler, details_text)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (
-                company_id,
-                data.get('ilan_sira_no'),
-                data.get('tescil_edilen_hususlar'),
-                data.get('tescile_delil_olan_belgeler'),
-                data.get('details')
-            ))
-
-            # Şahısları kaydet
-            if 'persons' in data:
-                for person in data['persons']:
-                    cursor.execute('''
-                    INSERT INTO persons (company_id, kimlik_no, isim, adres)
-                    VALUES (?, ?, ?, ?)
-                    ''', (
-                        company_id,
-                        person.get('kimlik_no'),
-                        person.get('isim'),
-                        person.get('adres')
-                    ))
-
-            # Konkordato detaylarını kaydet
-            if 'konkordato' in data:
-                konkordato = data['konkordato']
-                cursor.execute('''
-                INSERT INTO konkordato (company_id, mahkeme_karari_tarihi, baslangic_tarihi, bitis_tarihi, komiser_kimlik_no, komiser_adres, komiser_adi, komiser_gorev_bitis_tarihi)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    company_id,
-                    konkordato.get('mahkeme_karari_tarihi'),
-                    konkordato.get('baslangic_tarihi'),
-                    konkordato.get('bitis_tarihi'),
-                    konkordato.get('komiser_kimlik_no'),
-                    konkordato.get('komiser_adres'),
-                    konkordato.get('komiser_adi'),
-                    konkordato.get('komiser_gorev_bitis_tarihi')
-                ))
-
-        conn.commit()
-        conn.close()
+        """Verileri veritabanına kaydeder.
+
+        Ortak bir yazıcı verildiyse ilanlar onun kuyruğuna eklenir; yoksa
+        doğrudan tek işlemde yazılır.
+        """
+        if self.db_writer is not None:
+            self.db_writer.put(parsed_announcements)
+        else:
+            database.save_to_database(parsed_announcements)
+
+# Log ve ilerlemenin ekrana yansıtılma aralığı
+UI_FLUSH_INTERVAL_MS = 200
+# Aynı anda işlenen en fazla PDF sayısı; her dosya kabaca bir çekirdek kullanır
+MAX_CONCURRENT_FILES = CPU_COUNT
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -581,13 +144,19 @@ class MainWindow(QMainWindow):
         self.progress_label.setVisible(False)
         layout.addWidget(self.progress_label)
 
-        # Log görüntüleme alanı
-        self.log_text = QTextEdit()
+        # İşlenmekte olan her dosya için ayrı ilerleme çubuğu
+        self.file_progress_layout = QVBoxLayout()
+        layout.addLayout(self.file_progress_layout)
+
+        # Log görüntüleme alanı; yalnızca son satırlar tutulur, tam log dosyadadır
+        self.log_buffer = LogBuffer()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(self.log_buffer.max_lines)
         self.log_text.setMinimumHeight(300)  # Minimum yükseklik
         # Stil direkt olarak palette kullanacak şekilde değiştirildi
         self.log_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 font-family: monospace;
                 font-size: 12px;
                 line-height: 1.4;
@@ -613,16 +182,50 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(container)
 
         self.output_file_path = None
-        self.threads = []
-        self.total_progress = 0
-        self.current_pdf_progress = 0
+        # Tüm dönüştürme iş parçacıkları veritabanına bu tek yazıcı üzerinden yazar
+        # Aşama ölçümleri JSON satırı olarak yazılır; OCR_PROMETHEUS_TEXTFILE tanımlıysa
+        # toplamlar node exporter için o dosyaya da yazılır
+        self.metrics = Metrics(DEFAULT_METRICS_PATH, os.environ.get('OCR_PROMETHEUS_TEXTFILE'))
+        self.db_writer = database.DatabaseWriter(metrics=self.metrics)
+        self.db_writer.start()
+        # Zamanlayıcı durumu: sırada bekleyen dosyalar, çalışan iş parçacıkları ve
+        # dosya başına ilerleme (0-100)
+        self.pending_paths = collections.deque()
+        self.running = {}
+        self.file_progress = {}
+        self.file_progress_bars = {}
+        self.failed_paths = []
+        self.total_files = 0
+
+        # İşçiler log ve ilerlemeyi doğrudan tampona bırakır; ekran yalnızca bu
+        # zamanlayıcıyla, birikenler tek parça halinde yazılarak güncellenir
+        self.latest_progress = {}
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush_updates)
+        self.flush_timer.start(UI_FLUSH_INTERVAL_MS)
 
     def add_log(self, message):
-        self.log_text.append(message)
-        # Otomatik olarak en alta kaydır
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        # Herhangi bir iş parçacığından çağrılabilir
+        self.log_buffer.append(message)
+
+    def queue_progress(self, thread, value):
+        # Herhangi bir iş parçacığından çağrılabilir; her dosya için yalnızca son değer tutulur
+        self.latest_progress[thread] = value
+
+    def flush_updates(self):
+        lines = self.log_buffer.drain_lines()
+        if lines:
+            self.log_text.appendPlainText("\n".join(lines))
+            # Otomatik olarak en alta kaydır
+            self.log_text.verticalScrollBar().setValue(
+                self.log_text.verticalScrollBar().maximum()
+            )
+
+        latest, self.latest_progress = self.latest_progress, {}
+        for thread, value in latest.items():
+            # Bitmiş bir dosyanın geç gelen ilerlemesi yok sayılır
+            if thread in self.running:
+                self.update_progress(thread, value)
 
     def select_pdf(self):
         pdf_paths, _ = QFileDialog.getOpenFileNames(self, "Bir veya daha fazla PDF dosyası seçin", "", "PDF files (*.pdf)")
@@ -634,62 +237,100 @@ class MainWindow(QMainWindow):
             self.convert_pdfs(pdf_paths)
 
     def convert_pdfs(self, pdf_paths):
-        # İlk dosyayı dönüştürmeye başla
+        # Dosyalar aynı anda en fazla MAX_CONCURRENT_FILES tanesi işlenecek şekilde sıraya alınır
         self.total_files = len(pdf_paths)
-        self.current_file_index = 0
-
-        # Toplam ilerlemeyi sıfırlıyoruz
-        self.total_progress = 0
-
-        # İlk PDF dönüştürme işlemi için yeni thread başlat
-        self.convert_pdf(pdf_paths[self.current_file_index], pdf_paths)
+        self.pending_paths = collections.deque(pdf_paths)
+        self.file_progress = {pdf_path: 0 for pdf_path in pdf_paths}
+        self.failed_paths = []
+        self.select_button.setEnabled(False)
+        self.open_file_button.setVisible(False)
+        self.add_log(f"{self.total_files} dosya, aynı anda en fazla {MAX_CONCURRENT_FILES} dosya işlenecek")
+        self.start_next()
+
+    def start_next(self):
+        # Başlatılan dosyalar çekirdekleri ve bellek sınırını, bu turdan sonra
+        # aynı anda çalışacak dosya sayısına göre paylaşır
+        concurrent_files = min(MAX_CONCURRENT_FILES, len(self.running) + len(self.pending_paths))
+        while self.pending_paths and len(self.running) < MAX_CONCURRENT_FILES:
+            self.convert_pdf(self.pending_paths.popleft(), concurrent_files)
+        self.update_status()
+
+    def convert_pdf(self, pdf_path, concurrent_files=1):
+        # Eşzamanlı dosyalarda OCR süreçlerde yapılır; Tesseract'ın OpenMP iş parçacıkları
+        # her işçi süreçte tek çekirdeğe sınırlanır ve dosyalar birbiriyle yarışmaz
+        ocr_workers, memory_cap, ocr_processes = file_resources(concurrent_files, CPU_COUNT)
+        thread = PDFConverterThread(pdf_path, db_writer=self.db_writer, metrics=self.metrics,
+                                    ocr_workers=ocr_workers, memory_cap=memory_cap, ocr_processes=ocr_processes)
+        name = os.path.basename(pdf_path)
+        # Log ve ilerleme sinyalleri işçi iş parçacığında doğrudan tampona yazılır;
+        # her mesaj için arayüz olay döngüsüne ayrı bir olay gönderilmez
+        thread.progress.connect(lambda value: self.queue_progress(thread, value), Qt.DirectConnection)
+        thread.finished.connect(lambda result: self.conversion_finished(result, thread))
+        # Eşzamanlı dosyaların satırları karışmasın diye her satıra dosya adı eklenir
+        thread.log_signal.connect(lambda message: self.add_log(f"[{name}] {message.strip()}"),
+                                  Qt.DirectConnection)
+        self.running[thread] = pdf_path
+
+        bar = QProgressBar()
+        bar.setFormat(f"{name}: %p%")
+        bar.setValue(0)
+        self.file_progress_layout.addWidget(bar)
+        self.file_progress_bars[pdf_path] = bar
 
-    def convert_pdf(self, pdf_path, pdf_paths):
-        thread = PDFConverterThread(pdf_path)
-        thread.progress.connect(self.update_progress)
-        thread.finished.connect(lambda result: self.conversion_finished(result, pdf_paths, thread))
-        thread.log_signal.connect(self.add_log)  # Log sinyalini bağla
         thread.start()
-        # Thread'i listeye ekliyoruz
-        self.threads.append(thread)
-
-        # Şu anki PDF'nin ilerlemesini sıfırlıyoruz
-        self.current_pdf_progress = 0
-
-        # Durum bilgisini güncelliyoruz
-        self.status_label.setText(f"İşlenen dosya: {os.path.basename(pdf_path)} ({self.current_file_index + 1}/{self.total_files})")
-
-    def update_progress(self, value):
-        # Şu anki PDF'nin ilerlemesini güncelliyoruz
-        self.current_pdf_progress = value
 
-        # Toplam ilerlemeyi hesaplıyoruz
-        total_progress = ((self.current_file_index + self.current_pdf_progress / 100) / self.total_files) * 100
+    def update_status(self):
+        done = self.total_files - len(self.pending_paths) - len(self.running)
+        status = f"{done}/{self.total_files} dosya tamamlandı, {len(self.running)} dosya işleniyor"
+        if self.failed_paths:
+            status += f", {len(self.failed_paths)} dosya hatalı"
+        self.status_label.setText(status)
+
+    def update_progress(self, thread, value):
+        # Dosyanın kendi ilerlemesi
+        pdf_path = self.running[thread]
+        self.file_progress[pdf_path] = value
+        self.file_progress_bars[pdf_path].setValue(value)
+
+        # Toplam ilerleme: tüm dosyaların ilerlemelerinin ortalaması
+        total_progress = sum(self.file_progress.values()) / self.total_files
         self.progress_bar.setValue(int(total_progress))
         self.progress_label.setText(f"%{int(total_progress)} Tamamlandı")
 
-    def conversion_finished(self, result, pdf_paths, thread):
-        # Thread'i listeden kaldırıyoruz
-        if thread in self.threads:
-            self.threads.remove(thread)
+    def conversion_finished(self, result, thread):
+        pdf_path = self.running.pop(thread, None)
+        if pdf_path is None:
+            return
+        # Sonuç sinyali run() bitmeden hemen önce gelir; iş parçacığı nesnesi
+        # bırakılmadan önce tamamen bitmesi beklenir
+        thread.wait()
+        self.file_progress_bars.pop(pdf_path).deleteLater()
+        # Hatalı dosya da işlenmiş sayılır; toplam ilerleme ilerlemeye devam eder
+        self.file_progress[pdf_path] = 100
 
         if result.endswith('.txt'):
             self.output_file_paths.append(result)
-            # Her dosya işlendiğinde durum bilgisini güncelliyoruz
-            # self.status_label.setText(f"Dönüştürme tamamlandı. Sonuç: {result}")
             self.output_file_path = result
-            # self.open_file_button.setVisible(True)
+        else:
+            # Bir dosyadaki hata sıradaki dosyaları durdurmaz
+            self.failed_paths.append(pdf_path)
+            self.add_log(f"[{os.path.basename(pdf_path)}] dosya atlandı, sıradaki dosyalara devam ediliyor")
+
+        total_progress = sum(self.file_progress.values()) / self.total_files
+        self.progress_bar.setValue(int(total_progress))
+        self.progress_label.setText(f"%{int(total_progress)} Tamamlandı")
+        self.start_next()
 
-            # Sonraki dosyaya geç
-            self.current_file_index += 1
-            if self.current_file_index < len(pdf_paths):
-                self.convert_pdf(pdf_paths[self.current_file_index], pdf_paths)
+        if not self.running and not self.pending_paths:
+            # Tüm dosyalar tamamlandı
+            if self.failed_paths:
+                failed = ", ".join(os.path.basename(path) for path in self.failed_paths)
+                self.status_label.setText(f"Dosyalar dönüştürüldü; {len(self.failed_paths)} dosya hatalı: {failed}")
             else:
-                # Tüm dosyalar tamamlandı
                 self.status_label.setText("Tüm dosyalar dönüştürüldü!")
+            self.select_button.setEnabled(True)
+            if self.output_file_paths:
                 self.open_file_button.setVisible(True)
-        else:
-            self.status_label.setText(f"Hata oluştu: {result}")
 
     def open_file(self):
         if hasattr(self, 'output_file_paths'):
@@ -701,6 +342,17 @@ class MainWindow(QMainWindow):
                 else:
                     subprocess.call(["xdg-open", file_path])
 
+    def closeEvent(self, event):
+        # Kuyrukta bekleyen ilanlar yazılmadan pencere kapanmasın
+        try:
+            self.db_writer.close()
+        except Exception as e:
+            print(f"Veritabanı yazıcısı hatası: {e}")
+        self.metrics.close()
+        self.flush_timer.stop()
+        self.log_buffer.close()
+        super().closeEvent(event)
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     
@@ -733,7 +385,7 @@ if __name__ == '__main__':
     QLabel {
         color: palette(text);
     }
-    QTextEdit {
+    QPlainTextEdit {
         background-color: palette(base);
         color: palette(text);
         border: 1px solid palette(mid);
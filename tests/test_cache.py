@@ -0,0 +1,60 @@
+import itertools
+
+import numpy as np
+
+from ocr_engine import cache as cache_module
+from ocr_engine.cache import OCRCache
+
+
+def test_key_depends_on_pixels_shape_and_parameters():
+    image = np.zeros((4, 6), dtype=np.uint8)
+    key = OCRCache.make_key(image, 'tur', 'tesserocr', 3)
+    assert OCRCache.make_key(image.copy(), 'tur', 'tesserocr', 3) == key
+    # Kopyasız görünüm de aynı anahtarı verir
+    assert OCRCache.make_key(np.zeros((8, 6), dtype=np.uint8)[:4], 'tur', 'tesserocr', 3) == key
+    changed = image.copy()
+    changed[0, 0] = 255
+    assert OCRCache.make_key(changed, 'tur', 'tesserocr', 3) != key
+    assert OCRCache.make_key(image.reshape(6, 4), 'tur', 'tesserocr', 3) != key
+    assert OCRCache.make_key(image, 'eng', 'tesserocr', 3) != key
+    assert OCRCache.make_key(image, 'tur', 'pytesseract', 3) != key
+    assert OCRCache.make_key(image, 'tur', 'tesserocr', 4) != key
+
+
+def test_get_put_and_stats(tmp_path):
+    cache = OCRCache(str(tmp_path / 'cache.db'))
+    assert cache.get('a') is None
+    cache.put('a', 'metin')
+    assert cache.get('a') == 'metin'
+    assert cache.stats() == (1, 1)
+    cache.close()
+    # Kayıtlar dosyada kalır
+    reopened = OCRCache(str(tmp_path / 'cache.db'))
+    assert reopened.get('a') == 'metin'
+    reopened.close()
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(cache_module.time, 'time', lambda: next(clock))
+    entry_size = len('x' * 100) + len('k0')
+    cache = OCRCache(str(tmp_path / 'cache.db'), max_bytes=entry_size * 3)
+    for key in ('k0', 'k1', 'k2'):
+        cache.put(key, 'x' * 100)
+    # k0 yeniden kullanıldı; en eski kayıt artık k1
+    assert cache.get('k0') is not None
+    cache.put('k3', 'x' * 100)
+    assert cache.get('k1') is None
+    assert cache.get('k0') is not None
+    assert cache.get('k3') is not None
+    assert cache.total_bytes <= entry_size * 3
+    cache.close()
+
+
+def test_put_same_key_twice_counts_it_once(tmp_path):
+    cache = OCRCache(str(tmp_path / 'cache.db'), max_bytes=10 ** 6)
+    cache.put('k', 'x' * 100)
+    cache.put('k', 'y' * 40)
+    assert cache.get('k') == 'y' * 40
+    assert cache.total_bytes == cache._stored_bytes() == len('y' * 40) + len('k')
+    cache.close()
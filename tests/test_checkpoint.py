@@ -0,0 +1,132 @@
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.gazette import generate_corpus
+from ocr_engine import convert
+from ocr_engine.checkpoint import CheckpointStore
+from ocr_engine.database import connect, write_announcements
+from ocr_engine.ner import Ner, NerEnricher
+
+
+class Crash(Exception):
+    pass
+
+
+@pytest.fixture(scope='module')
+def corpus(tmp_path_factory):
+    return generate_corpus(str(tmp_path_factory.mktemp('corpus')), page_count=4, columns=2, seed=5)
+
+
+def _fake_pipeline(pages, requested, crash_after=None):
+    """Sayfaları metin katmanından gelmiş gibi veren, istenirse yarıda çöken PagePipeline yerine geçen sınıf."""
+
+    class Pipeline:
+        def __init__(self, pdf_path, page_nums, **kwargs):
+            self.page_nums = list(page_nums)
+            requested.append(self.page_nums)
+
+        def __iter__(self):
+            for done, page_num in enumerate(self.page_nums):
+                if done == crash_after:
+                    raise Crash()
+                yield page_num, pages[page_num], 'text'
+
+        def cache_stats(self):
+            return 0, 0
+
+    return Pipeline
+
+
+def _convert(monkeypatch, corpus, tmp_path, conn, requested, crash_after=None, strip_keys=False):
+    pages = corpus['reference_texts']
+    monkeypatch.setattr(convert, 'count_pages', lambda pdf_path: len(pages))
+    monkeypatch.setattr(convert, 'PagePipeline', _fake_pipeline(pages, requested, crash_after))
+
+    def save(completed):
+        if strip_keys:
+            # MERSİS ve sicil numarası okunamamış ilanlar: yalnızca kaynak bilgisiyle tanınabilirler
+            completed = [{key: value for key, value in data.items() if key not in ('mersis_no', 'ticaret_sicil_no')}
+                         for data in completed]
+        write_announcements(conn, completed)
+
+    return convert.convert_pdf(corpus['pdf_path'], save=save, log=lambda message: None,
+                               checkpoint_path=str(tmp_path / 'checkpoints.db'), cache_path=None)
+
+
+def _counts(conn):
+    return {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('companies', 'announcements', 'persons')}
+
+
+@pytest.mark.parametrize('strip_keys', [False, True])
+def test_resumed_run_writes_each_announcement_once(monkeypatch, corpus, tmp_path, strip_keys):
+    clean_dir = tmp_path / 'clean'
+    clean_dir.mkdir()
+    clean = connect(str(clean_dir / 'db.sqlite'))
+    _convert(monkeypatch, corpus, clean_dir, clean, [], strip_keys=strip_keys)
+    expected = _counts(clean)
+    assert expected['announcements'] == len(corpus['announcements'])
+    clean.close()
+
+    conn = connect(str(tmp_path / 'db.sqlite'))
+    requested = []
+    with pytest.raises(Crash):
+        _convert(monkeypatch, corpus, tmp_path, conn, requested, crash_after=2, strip_keys=strip_keys)
+    assert 0 < _counts(conn)['announcements'] < expected['announcements']
+    # Çöken çalıştırma yarım sonuç dosyası bırakmaz
+    assert not os.path.exists(convert.results_path(corpus['pdf_path']) + '.part')
+
+    txt_path, total_pages, _ = _convert(monkeypatch, corpus, tmp_path, conn, requested, strip_keys=strip_keys)
+    # Kontrol noktasındaki sayfalar yeniden çıkarılmaz, ilanları yeniden yazılmaz
+    assert requested == [[0, 1, 2, 3], [2, 3]]
+    assert _counts(conn) == expected
+    with open(txt_path, encoding='utf-8') as f:
+        assert f.read().count('için çıkarılan metin:') == total_pages
+    conn.close()
+
+    # Tamamlanan belgenin sayfa metinleri kontrol noktasından silinir
+    store = CheckpointStore(str(tmp_path / 'checkpoints.db'))
+    assert store.load_pages(convert.file_hash(corpus['pdf_path'])) == {}
+    store.close()
+    conn = sqlite3.connect(str(tmp_path / 'checkpoints.db'))
+    assert conn.execute('SELECT status FROM checkpoint_documents').fetchall() == [('done',)]
+    conn.close()
+
+
+def test_crashed_run_discards_pending_ner(monkeypatch, corpus, tmp_path):
+    enrichers = []
+
+    class Enricher(NerEnricher):
+        def __init__(self, *args):
+            super().__init__(*args)
+            enrichers.append(self)
+
+        def _flush(self):
+            raise AssertionError("çöken çalıştırmada NER yapılmamalı")
+
+    pages = corpus['reference_texts']
+    monkeypatch.setattr(convert, 'count_pages', lambda pdf_path: len(pages))
+    monkeypatch.setattr(convert, 'PagePipeline', _fake_pipeline(pages, [], crash_after=2))
+    monkeypatch.setattr(convert, 'NerEnricher', Enricher)
+    with pytest.raises(Crash):
+        convert.convert_pdf(corpus['pdf_path'], save=lambda completed: None, log=lambda message: None,
+                            checkpoint_path=str(tmp_path / 'checkpoints.db'), cache_path=None,
+                            ner=Ner('sahte', batch_size=1000))
+    assert enrichers[0].pending == []
+
+
+def test_dpi_reaches_the_pipeline(monkeypatch, corpus, tmp_path):
+    options = []
+    pipeline = _fake_pipeline(corpus['reference_texts'], [])
+
+    def make_pipeline(pdf_path, page_nums, **kwargs):
+        options.append(kwargs['dpi'])
+        return pipeline(pdf_path, page_nums, **kwargs)
+
+    monkeypatch.setattr(convert, 'count_pages', lambda pdf_path: len(corpus['reference_texts']))
+    monkeypatch.setattr(convert, 'PagePipeline', make_pipeline)
+    convert.convert_pdf(corpus['pdf_path'], log=lambda message: None, dpi='auto',
+                        checkpoint_path=str(tmp_path / 'checkpoints.db'), cache_path=None)
+    assert options == ['auto']
@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+
+import pytest
+
+from ocr_engine.database import DatabaseWriter, connect, write_announcements
+
+
+def announcement(index, mersis_no=None, ticaret_sicil_no=None, city='ANKARA', persons=1):
+    data = {
+        'city': city,
+        'ilan_sira_no': str(100000 + index),
+        'ticaret_unvani': f"ŞİRKET {index} LİMİTED ŞİRKETİ",
+        'adres': 'Merkez Mah.',
+        'tescil_edilen_hususlar': 'YÖNETİM',
+        'details': f"ilan {index} ayrıntıları",
+        'persons': [{'kimlik_no': f"123*****{index:02d}", 'isim': f"KİŞİ {index} {n}", 'adres': 'ANKARA'}
+                    for n in range(persons)],
+    }
+    if mersis_no is not None:
+        data['mersis_no'] = mersis_no
+    if ticaret_sicil_no is not None:
+        data['ticaret_sicil_no'] = ticaret_sicil_no
+    return data
+
+
+def counts(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('companies', 'announcements', 'persons')}
+    finally:
+        conn.close()
+
+
+def test_writer_collects_from_many_threads(tmp_path):
+    db_path = str(tmp_path / 'db.sqlite')
+    writer = DatabaseWriter(db_path, batch_size=7, flush_interval=0.05)
+    writer.start()
+
+    def produce(first):
+        for index in range(first, first + 20):
+            writer.put([announcement(index, mersis_no=f"{index:016d}")])
+
+    threads = [threading.Thread(target=produce, args=(first,)) for first in (0, 20, 40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+    assert writer.announcement_count == 60
+    assert counts(db_path) == {'companies': 60, 'announcements': 60, 'persons': 60}
+
+
+def test_writer_error_is_raised_to_producer(tmp_path):
+    writer = DatabaseWriter(str(tmp_path / 'missing' / 'db.sqlite'), flush_interval=0.05)
+    writer.start()
+    with pytest.raises(sqlite3.OperationalError):
+        writer.put([announcement(0)])
+        writer.close()
+
+
+def test_write_is_one_transaction(tmp_path):
+    db_path = str(tmp_path / 'db.sqlite')
+    conn = connect(db_path)
+    broken = announcement(1, mersis_no='1')
+    # Bağlanamayan değer türü tüm işlemi geri aldırır
+    broken['details'] = object()
+    with pytest.raises(sqlite3.Error):
+        write_announcements(conn, [announcement(0, mersis_no='0'), broken])
+    conn.close()
+    assert counts(db_path) == {'companies': 0, 'announcements': 0, 'persons': 0}
+
+
+def _issue():
+    """MERSİS'li, yalnızca sicil numaralı ve aynı sicil numaralı farklı şehir şirketlerinden bir sayı."""
+    return [
+        announcement(0, mersis_no='0000000000000001', ticaret_sicil_no='111'),
+        announcement(1, ticaret_sicil_no='222', persons=2),
+        # Aynı şirketin aynı sayıdaki ikinci ilanı
+        announcement(2, ticaret_sicil_no='222'),
+        # Aynı sicil numarası başka bir sicil müdürlüğünde başka bir şirkettir
+        announcement(3, ticaret_sicil_no='222', city='İZMİR'),
+        announcement(4, ticaret_sicil_no='333', city=None),
+    ]
+
+
+def test_reingesting_an_issue_adds_nothing(tmp_path):
+    db_path = str(tmp_path / 'db.sqlite')
+    conn = connect(db_path)
+    write_announcements(conn, _issue())
+    first = counts(db_path)
+    assert first == {'companies': 4, 'announcements': 5, 'persons': 6}
+    write_announcements(conn, _issue())
+    # Ayrı parçalar halinde yeniden yazmak da aynı sonucu verir
+    for data in _issue():
+        write_announcements(conn, [data])
+    assert counts(db_path) == first
+    assert conn.execute('SELECT COUNT(*) FROM announcements_fts').fetchone()[0] == 5
+    assert conn.execute('SELECT COUNT(*) FROM persons_fts').fetchone()[0] == 6
+    conn.close()
+
+
+def test_sicil_matched_company_is_updated(tmp_path):
+    conn = connect(str(tmp_path / 'db.sqlite'))
+    write_announcements(conn, [announcement(0, ticaret_sicil_no='222')])
+    renamed = announcement(1, ticaret_sicil_no='222')
+    renamed['ticaret_unvani'] = 'YENİ UNVAN LİMİTED ŞİRKETİ'
+    write_announcements(conn, [renamed])
+    assert conn.execute('SELECT ticaret_unvani FROM companies').fetchall() == [('YENİ UNVAN LİMİTED ŞİRKETİ',)]
+    assert conn.execute("SELECT rowid FROM companies_fts WHERE companies_fts MATCH 'yeni'").fetchall() == [(1,)]
+    conn.close()
+
+
+def test_migration_merges_existing_sicil_duplicates(tmp_path):
+    from ocr_engine import database
+
+    db_path = str(tmp_path / 'db.sqlite')
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.create_function('tr_fold', 1, database.fold_turkish, deterministic=True)
+    # Yedek anahtardan önceki şema: her yeniden işleme yeni bir şirket satırı açıyordu
+    for statements in database.MIGRATIONS[:4]:
+        for statement in statements:
+            conn.execute(statement)
+    conn.execute('PRAGMA user_version = 4')
+    for company_id in (1, 2):
+        conn.execute("INSERT INTO companies (id, ticaret_sicil_no, city) VALUES (?, '222', 'ANKARA')", (company_id,))
+        conn.execute("INSERT INTO companies_fts (rowid, ticaret_unvani) VALUES (?, 'x')", (company_id,))
+        conn.execute("INSERT INTO announcements (id, company_id, ilan_sira_no) VALUES (?, ?, '5')",
+                     (company_id, company_id))
+        conn.execute("INSERT INTO announcements_fts (rowid, text) VALUES (?, 'x')", (company_id,))
+        conn.execute("INSERT INTO persons (id, company_id, kimlik_no, isim, adres) VALUES (?, ?, '1', 'A', 'B')",
+                     (company_id, company_id))
+        conn.execute("INSERT INTO persons_fts (rowid, isim) VALUES (?, 'a')", (company_id,))
+    conn.close()
+
+    conn = connect(db_path)
+    assert counts(db_path) == {'companies': 1, 'announcements': 1, 'persons': 1}
+    for table in ('companies_fts', 'announcements_fts', 'persons_fts'):
+        assert conn.execute(f'SELECT rowid FROM {table}').fetchall() == [(1,)]
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO companies (ticaret_sicil_no, city) VALUES ('222', 'ANKARA')")
+    conn.close()
+
+
+def _replayed(index, city, page_start):
+    """Şirket anahtarı okunamamış, kaynak bilgisi taşıyan bir ilan."""
+    data = announcement(index, city=city, persons=0)
+    data.update(details='', source_hash='pdf', page_start=page_start, page_end=page_start,
+                text_hash=f"metin-{index}")
+    return data
+
+
+def test_distinct_announcements_on_the_same_page_are_kept(tmp_path):
+    db_path = str(tmp_path / 'db.sqlite')
+    conn = connect(db_path)
+    write_announcements(conn, [_replayed(1, 'ANKARA', 3)])
+    # Aynı PDF'in aynı sayfasında başlayan, ayrıntısı boş başka bir ilan
+    write_announcements(conn, [_replayed(2, 'İZMİR', 3)])
+    assert counts(db_path)['announcements'] == 2
+    # Kontrol noktasından devamda ikisi yeniden gelirse hiçbiri yeniden yazılmaz
+    assert write_announcements(conn, [_replayed(1, 'ANKARA', 3), _replayed(2, 'İZMİR', 3)]) == 0
+    assert counts(db_path) == {'companies': 2, 'announcements': 2, 'persons': 0}
+    conn.close()
+
+
+def test_replay_key_does_not_hide_keyed_announcements(tmp_path):
+    db_path = str(tmp_path / 'db.sqlite')
+    conn = connect(db_path)
+    first = announcement(1, mersis_no='0000000000000001')
+    first.update(source_hash='pdf', text_hash='ayni')
+    write_announcements(conn, [first])
+    # Şirket ve sıra numarası olan ilan metin özetine bakılmadan kendi anahtarıyla yazılır
+    second = announcement(2, mersis_no='0000000000000002')
+    second.update(source_hash='pdf', text_hash='ayni')
+    write_announcements(conn, [second])
+    assert counts(db_path)['announcements'] == 2
+    conn.close()
+
+
+def test_company_persons_are_written_once(tmp_path):
+    db_path = str(tmp_path / 'db.sqlite')
+    conn = connect(db_path)
+    board = [{'kimlik_no': '123*****45', 'isim': 'ALİ VELİ', 'adres': 'ANKARA'}]
+    first = announcement(1, mersis_no='0000000000000001', persons=0)
+    # Aynı şahıs bir ilanda iki kez, sonraki ilanda yeniden (farklı adresle) geçer
+    first['persons'] = board * 2
+    second = announcement(2, mersis_no='0000000000000001', persons=0)
+    second['persons'] = [dict(board[0], adres='İZMİR'), {'kimlik_no': '456*****78', 'isim': 'AYŞE KAYA'}]
+    write_announcements(conn, [first])
+    write_announcements(conn, [second])
+    assert conn.execute('SELECT isim, adres FROM persons ORDER BY id').fetchall() == [
+        ('ALİ VELİ', 'ANKARA'), ('AYŞE KAYA', None)]
+    assert conn.execute('SELECT COUNT(*) FROM persons_fts').fetchone()[0] == 2
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO persons (company_id, kimlik_no, isim) VALUES (1, '123*****45', 'ALİ VELİ')")
+    conn.close()
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from ocr_engine.database import connect, write_announcements
+from ocr_engine.export import PERSON_FIELDS, _normalize, export_database, open_exporter
+
+ANNOUNCEMENT = {
+    'city': 'ANKARA', 'ilan_sira_no': '7', 'mersis_no': '0000000000000007', 'ticaret_unvani': 'DENEME A.Ş.',
+    'details': 'Pay devri yapılmıştır.', 'source_hash': 'abc', 'page_start': 2, 'page_end': 3,
+    'persons': [
+        {'kimlik_no': '123*****45', 'isim': 'AYŞE YILMAZ', 'adres': 'ANKARA'},
+        {'kimlik_no': '', 'isim': 'Mehmet Kaya', 'adres': '', 'ner_label': 'PERSON'},
+    ],
+    'pay_devri': {'devir_eden_kimlik_no': '1', 'devir_eden_adi': 'A',
+                  'shareholders': [{'adi': 'B', 'pay_adedi': '10'}]},
+}
+
+
+def _read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_jsonl_writes_in_batches(tmp_path):
+    path = str(tmp_path / 'ilanlar.jsonl')
+    with open_exporter(path, batch_size=2) as exporter:
+        exporter.write([dict(ANNOUNCEMENT, ilan_sira_no=str(index)) for index in range(5)])
+        assert exporter.record_count == 4
+    assert exporter.record_count == 5
+    records = _read_jsonl(path)
+    assert [record['ilan_sira_no'] for record in records] == ['0', '1', '2', '3', '4']
+    assert records[0] == dict(ANNOUNCEMENT, ilan_sira_no='0')
+
+
+def test_parquet_record_keeps_person_fields():
+    record = _normalize(ANNOUNCEMENT)
+    # JSONL'de yazılan şahıs alanlarının hepsi Parquet şemasında da vardır
+    assert {key for person in ANNOUNCEMENT['persons'] for key in person} <= set(PERSON_FIELDS)
+    assert record['persons'] == [
+        {'kimlik_no': '123*****45', 'isim': 'AYŞE YILMAZ', 'adres': 'ANKARA', 'ner_label': None},
+        {'kimlik_no': '', 'isim': 'Mehmet Kaya', 'adres': '', 'ner_label': 'PERSON'},
+    ]
+    assert record['konkordato'] is None
+    assert record['pay_devri']['shareholders'] == [
+        {'adi': 'B', 'beher_pay_degeri': None, 'pay_adedi': '10', 'toplam_tutar': None}]
+
+
+def test_parquet_matches_jsonl(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    jsonl_path, parquet_path = str(tmp_path / 'ilanlar.jsonl'), str(tmp_path / 'ilanlar.parquet')
+    for path in (jsonl_path, parquet_path):
+        with open_exporter(path, batch_size=2) as exporter:
+            exporter.write([ANNOUNCEMENT] * 3)
+    rows = pq.read_table(parquet_path).to_pylist()
+    assert len(rows) == 3
+    assert rows[0]['persons'] == _normalize(_read_jsonl(jsonl_path)[0])['persons']
+
+
+def test_export_database(tmp_path):
+    db_path = str(tmp_path / 'db.sqlite')
+    conn = connect(db_path)
+    write_announcements(conn, [ANNOUNCEMENT, dict(ANNOUNCEMENT, ilan_sira_no='8', pay_devri={'shareholders': []},
+                                                  persons=[])])
+    conn.close()
+    path = str(tmp_path / 'ilanlar.jsonl')
+    assert export_database(path, db_path, batch_size=1) == 2
+    first, second = _read_jsonl(path)
+    assert (first['ilan_sira_no'], first['page_start'], first['source_hash']) == ('7', 2, 'abc')
+    # Şahıslar şirkete bağlı tutulur; NER etiketi veritabanında saklanmaz
+    assert [person['isim'] for person in second['persons']] == ['AYŞE YILMAZ', 'Mehmet Kaya']
+    assert first['pay_devri']['shareholders'][0]['pay_adedi'] == '10'
@@ -0,0 +1,57 @@
+import numpy as np
+
+from ocr_engine.layout import crop_regions, detect_layout
+
+
+def _text_block(image, y0, y1, x0, x1):
+    """Satır satır kesikli mürekkep (harfler arası boşluklu); 3 piksel yazı, 3 piksel boşluk."""
+    for y in range(y0, y1, 6):
+        image[y:y + 3, x0:x1:3] = 0
+
+
+def _page(height=1000, width=800):
+    return np.full((height, width), 255, dtype=np.uint8)
+
+
+def test_blank_page_has_no_regions():
+    assert detect_layout(_page()) == []
+
+
+def test_two_columns_in_reading_order():
+    image = _page()
+    _text_block(image, 100, 900, 60, 380)
+    _text_block(image, 100, 600, 420, 740)
+    boxes = detect_layout(image)
+    assert len(boxes) == 2
+    (left_y0, left_y1, left_x0, left_x1), (right_y0, right_y1, right_x0, right_x1) = boxes
+    assert left_x1 <= right_x0
+    assert left_x0 <= 60 and left_x1 >= 380
+    assert right_x0 <= 420 and right_x1 >= 740
+    assert left_y0 <= 100 and left_y1 >= 897
+    assert right_y1 < left_y1
+
+
+def test_vertical_rule_is_not_a_column():
+    image = _page()
+    _text_block(image, 100, 900, 60, 380)
+    _text_block(image, 100, 900, 420, 740)
+    # Sütun ayırıcı çizgi
+    image[100:900, 398:401] = 0
+    assert len(detect_layout(image)) == 2
+
+
+def test_wide_vertical_gap_splits_column_into_blocks():
+    image = _page()
+    _text_block(image, 100, 300, 60, 740)
+    _text_block(image, 500, 700, 60, 740)
+    boxes = detect_layout(image)
+    assert len(boxes) == 2
+    assert boxes[0][1] <= boxes[1][0]
+
+
+def test_crop_regions_returns_views():
+    image = _page()
+    _text_block(image, 100, 900, 60, 380)
+    regions = crop_regions(image, detect_layout(image))
+    assert len(regions) == 1
+    assert np.shares_memory(regions[0], image)
@@ -0,0 +1,49 @@
+import threading
+
+from ocr_engine.logbuffer import LogBuffer
+
+
+def test_drain_returns_new_lines_once(tmp_path):
+    log = LogBuffer(str(tmp_path / 'log.txt'), max_lines=10)
+    log.append('bir')
+    log.append('iki')
+    assert log.drain() == (['bir', 'iki'], 0)
+    assert log.drain() == ([], 0)
+    log.close()
+
+
+def test_overflow_keeps_last_lines_and_full_log_file(tmp_path):
+    path = tmp_path / 'log.txt'
+    log = LogBuffer(str(path), max_lines=3)
+    for index in range(5):
+        log.append(f"satır {index}")
+    # Ekrana yalnızca son satırlar gider, atlananlar başta not edilir
+    assert log.drain_lines() == [f"... 2 satır atlandı (tam log: {path})", 'satır 2', 'satır 3', 'satır 4']
+    assert log.drain_lines() == []
+    log.close()
+    assert path.read_text(encoding='utf-8').splitlines() == [f"satır {index}" for index in range(5)]
+
+
+def test_append_from_many_threads():
+    log = LogBuffer(None, max_lines=100)
+
+    def write(thread_index):
+        for index in range(50):
+            log.append(f"{thread_index}-{index}")
+
+    threads = [threading.Thread(target=write, args=(thread_index,)) for thread_index in range(8)]
+    for thread in threads:
+        thread.start()
+    drained = []
+    skipped = 0
+    while any(thread.is_alive() for thread in threads):
+        lines, count = log.drain()
+        drained += lines
+        skipped += count
+    for thread in threads:
+        thread.join()
+    lines, count = log.drain()
+    # Hiçbir satır hem atlanıp hem gösterilmez, hiçbiri kaybolmaz
+    assert len(drained) + len(lines) + skipped + count == 8 * 50
+    assert len(set(drained + lines)) == len(drained + lines)
+    log.close()
@@ -0,0 +1,104 @@
+import json
+import re
+
+import numpy as np
+import pytest
+
+from ocr_engine import metrics as metrics_module
+from ocr_engine.metrics import METRIC_PREFIX, Metrics, timed, timed_iter
+
+
+class Boom(Exception):
+    pass
+
+
+def _events(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_timed_writes_one_record_per_call(tmp_path, monkeypatch):
+    clock = iter([10.0, 10.25, 20.0, 20.5])
+    monkeypatch.setattr(metrics_module.time, 'perf_counter', lambda: next(clock))
+    path = str(tmp_path / 'metrics.jsonl')
+    metrics = Metrics(path)
+    with timed(metrics, 'ocr', pdf='a.pdf', page=3) as fields:
+        fields['pixels'] = 1200
+        fields['nbytes'] = 64
+    with pytest.raises(Boom):
+        # Hata veren aşama da kaydedilir
+        with timed(metrics, 'ocr', pdf='a.pdf', page=4):
+            raise Boom()
+    metrics.close()
+
+    first, second = _events(path)
+    assert {key: first[key] for key in ('stage', 'seconds', 'pixels', 'bytes', 'pdf', 'page')} == {
+        'stage': 'ocr', 'seconds': 0.25, 'pixels': 1200, 'bytes': 64, 'pdf': 'a.pdf', 'page': 3}
+    assert set(first) == {'ts', 'pid', 'stage', 'seconds', 'pixels', 'bytes', 'rss', 'pdf', 'page'}
+    assert (second['seconds'], second['page'], second['pixels']) == (0.5, 4, 0)
+    assert metrics.snapshot() == {'ocr': [2, 0.75, 0.5, 1200, 64]}
+
+
+def test_timed_without_metrics_yields_fields():
+    with timed(None, 'ocr', page=1) as fields:
+        fields['pixels'] = 5
+    assert fields == {'page': 1, 'pixels': 5}
+
+
+def test_timed_iter_records_image_sizes(tmp_path):
+    path = str(tmp_path / 'metrics.jsonl')
+    metrics = Metrics(path)
+    pages = [(page_num, np.zeros((4, 5), dtype=np.uint8)) for page_num in range(2)]
+    assert list(timed_iter(metrics, 'rasterize', iter(pages), pdf='a.pdf')) == pages
+    metrics.close()
+    assert [(event['page'], event['pixels'], event['bytes']) for event in _events(path)] == [(0, 20, 20), (1, 20, 20)]
+
+
+def test_gauges_go_to_the_sink(tmp_path):
+    path = str(tmp_path / 'metrics.jsonl')
+    metrics = Metrics(path)
+    metrics.gauge('queue_depth', 3, queue='ocr')
+    metrics.close()
+    event, = _events(path)
+    assert (event['gauge'], event['value'], event['queue']) == ('queue_depth', 3, 'ocr')
+
+
+def test_merge_adds_worker_totals():
+    metrics = Metrics()
+    metrics.record('ocr', 1.0, pixels=10)
+    metrics.merge({'ocr': [2, 3.0, 2.5, 20, 4], 'parse': [1, 0.5, 0.5, 0, 100]})
+    assert metrics.snapshot() == {'ocr': [3, 4.0, 2.5, 30, 4], 'parse': [1, 0.5, 0.5, 0, 100]}
+    assert metrics.summary()[0].startswith('ocr: 3 kez, toplam 4.00 sn')
+
+
+def test_prometheus_exposition(tmp_path):
+    path = tmp_path / 'ocr.prom'
+    metrics = Metrics(prometheus_path=str(path))
+    metrics.record('ocr', 1.5, pixels=100, nbytes=10)
+    metrics.record('parse', 0.25)
+    metrics.gauge('queue_depth', 2, queue='ocr')
+    metrics.gauge('buffers', 1)
+    metrics.close()
+
+    text = path.read_text(encoding='utf-8')
+    assert text.endswith('\n')
+    lines = text.splitlines()
+    assert f'# TYPE {METRIC_PREFIX}_stage_calls_total counter' in lines
+    assert f'{METRIC_PREFIX}_stage_calls_total{{stage="ocr"}} 1' in lines
+    assert f'{METRIC_PREFIX}_stage_seconds_total{{stage="ocr"}} 1.5' in lines
+    assert f'{METRIC_PREFIX}_stage_pixels_total{{stage="ocr"}} 100' in lines
+    assert f'{METRIC_PREFIX}_stage_bytes_total{{stage="parse"}} 0' in lines
+    assert f'# TYPE {METRIC_PREFIX}_stage_max_seconds gauge' in lines
+    assert f'{METRIC_PREFIX}_queue_depth{{queue="ocr"}} 2' in lines
+    assert f'{METRIC_PREFIX}_buffers 1' in lines
+    # Her örnek satırı "ad{etiketler} değer" biçimindedir ve türü önceden bildirilmiştir
+    declared = set()
+    for line in lines:
+        if line.startswith('# TYPE '):
+            declared.add(line.split()[2])
+        elif not line.startswith('# HELP '):
+            match = re.fullmatch(r'([a-z_]+)(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? (-?[0-9.e+]+)', line)
+            assert match, line
+            assert match.group(1) in declared
+    # Geçici dosya kalmaz
+    assert [entry.name for entry in tmp_path.iterdir()] == ['ocr.prom']
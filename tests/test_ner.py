@@ -0,0 +1,74 @@
+import collections
+import os
+
+import pytest
+
+from ocr_engine import ner
+from ocr_engine.ner import Ner, NerEnricher
+
+Entity = collections.namedtuple('Entity', 'text label_')
+Doc = collections.namedtuple('Doc', 'ents')
+
+
+class FakeNlp:
+    """Büyük harfle başlayan kelime çiftlerini PERSON, 'A.Ş.' ile bitenleri ORG sayan model."""
+
+    def pipe(self, texts, batch_size):
+        for text in texts:
+            words = text.split()
+            ents = [Entity(f"{first} {second}", 'ORG' if second == 'A.Ş.' else 'PERSON')
+                    for first, second in zip(words, words[1:]) if first.istitle() and second[0].isupper()]
+            yield Doc(ents)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    loads = []
+
+    def get_nlp(model):
+        loads.append(os.getpid())
+        return FakeNlp()
+
+    monkeypatch.setattr(ner, 'get_nlp', get_nlp)
+    yield loads
+    for pool in ner._pools.values():
+        pool.shutdown()
+    ner._pools.clear()
+
+
+def _announcements(count):
+    return [{'ticaret_unvani': 'Deneme A.Ş.', 'details': f"Ali Veli{index} ile Deneme A.Ş. ve Beta A.Ş.",
+             'persons': [{'kimlik_no': '1', 'isim': 'ALİ VELİ0', 'adres': ''}]} for index in range(count)]
+
+
+def test_merge_skips_known_names_and_other_labels():
+    data = _announcements(1)[0]
+    added = ner.merge_entities(data, [('Ali  Veli0', 'PERSON'), ('Deneme A.Ş.', 'ORG'), ('Ankara', 'LOC'),
+                                      ('Beta A.Ş.', 'ORG'), ('beta a.ş.', 'ORG')])
+    assert added == 1
+    assert data['persons'][1:] == [{'kimlik_no': '', 'isim': 'Beta A.Ş.', 'adres': '', 'ner_label': 'ORG'}]
+
+
+@pytest.mark.parametrize('n_process', [1, 2])
+def test_enricher_flushes_in_batches(fake_model, n_process):
+    batches = []
+    enricher = NerEnricher(batches.append, Ner('sahte', batch_size=4, n_process=n_process))
+    for data in _announcements(10):
+        enricher.put([data])
+    enricher.close()
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert enricher.entity_count == 1 + 9 * 2
+    names = [[person['isim'] for person in data['persons']] for batch in batches for data in batch]
+    assert names[0] == ['ALİ VELİ0', 'Beta A.Ş.']
+    assert names[3] == ['ALİ VELİ0', 'Ali Veli3', 'Beta A.Ş.']
+
+
+def test_process_pool_is_reused_across_flushes(fake_model):
+    enricher = NerEnricher(lambda batch: None, Ner('sahte', batch_size=2, n_process=2))
+    enricher.put(_announcements(2))
+    pool = ner._pools[('sahte', 2)]
+    enricher.put(_announcements(4))
+    enricher.close()
+    assert list(ner._pools.values()) == [pool]
+    # Model ana süreçte hiç yüklenmez; işçiler havuzla birlikte yaşar
+    assert fake_model == []
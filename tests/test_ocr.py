@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from ocr_engine import ocr
+from ocr_engine.cache import OCRCache
+from ocr_engine.ocr import TwoTier
+
+
+class FakeBackend:
+    """Satırları sabit güvenlerle döndüren, yeniden okunan kırpıntıları kaydeden arka uç."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.crops = []
+
+    def recognize_lines(self, image):
+        return self.lines
+
+    def image_to_string(self, image):
+        self.crops.append(image.shape)
+        return f"doğru {len(self.crops)}\n"
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    fast = FakeBackend([(1, 'hızlı 1', 95.0, (0, 0, 50, 10)),
+                        (1, 'hızlı 2', 40.0, (10, 20, 60, 30)),
+                        (2, 'hızlı 3', 90.0, (0, 40, 50, 50)),
+                        (2, 'hızlı 4', 79.0, (0, 90, 100, 100))])
+    accurate = FakeBackend([])
+
+    def get_backend(engine='auto', lang='tur', psm=ocr.DEFAULT_PSM, tessdata=None, oem=None):
+        return fast if psm == ocr.FAST_PSM else accurate
+
+    monkeypatch.setattr(ocr, 'get_backend', get_backend)
+    return fast, accurate
+
+
+def test_two_tier_rereads_only_low_confidence_lines(backends):
+    _, accurate = backends
+    stats = {}
+    column = np.zeros((100, 100), dtype=np.uint8)
+    text = ocr.two_tier_text(column, two_tier=TwoTier(threshold=80), stats=stats)
+    assert text == 'hızlı 1\ndoğru 1\n\nhızlı 3\ndoğru 2\n'
+    # Kırpıntılar satır kutusu ve çevresindeki paydır; sütun sınırında kesilir
+    assert accurate.crops == [(18, 58), (14, 100)]
+    assert stats == {'lines': 4, 'reocr_lines': 2, 'reocr_pixels': 18 * 58 + 14 * 100}
+
+
+def test_cache_hit_does_not_create_a_backend(monkeypatch, tmp_path):
+    def get_backend(*args, **kwargs):
+        raise AssertionError("önbellekteki sütun için arka uç oluşturulmamalı")
+
+    monkeypatch.setattr(ocr, 'get_backend', get_backend)
+    column = np.zeros((10, 10), dtype=np.uint8)
+    cache = OCRCache(str(tmp_path / 'cache.db'))
+    for two_tier, name in ((None, 'pytesseract'), (TwoTier(), 'pytesseract-two-tier-80-None')):
+        psm = ocr.DEFAULT_PSM if two_tier is None else ocr.FAST_PSM
+        cache.put(cache.make_key(column, 'tur', name, psm), 'önbellekten')
+        assert ocr.ocr_column(column, engine='pytesseract', cache=cache, two_tier=two_tier) == 'önbellekten'
+    cache.close()
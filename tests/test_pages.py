@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+import pytest
+
+from ocr_engine import pages
+from ocr_engine.pages import DEFAULT_DPI, MAX_DPI, MIN_DPI, PROBE_DPI, dpi_for_text_height, estimate_text_height
+
+
+def test_read_ppm_reads_gray_and_rgb_images_from_one_stream():
+    stream = io.BytesIO(b'P5\n# pdftoppm\n3 2\n255\n' + bytes(range(6)) + b'P6 1 2 255\n' + bytes(range(6)))
+    gray = pages._read_ppm(stream)
+    assert gray.shape == (2, 3) and gray.tolist() == [[0, 1, 2], [3, 4, 5]]
+    rgb = pages._read_ppm(stream)
+    assert rgb.shape == (2, 1, 3) and rgb.tolist() == [[[0, 1, 2]], [[3, 4, 5]]]
+    assert pages._read_ppm(stream) is None
+
+
+def test_read_ppm_rejects_16_bit_and_truncated_images():
+    with pytest.raises(IOError):
+        pages._read_ppm(io.BytesIO(b'P5 2 1 65535\n' + bytes(4)))
+    with pytest.raises(IOError):
+        pages._read_ppm(io.BytesIO(b'P5 2 2 255\n' + bytes(3)))
+
+
+def _text_image(line_height, width=80, height=100):
+    """``line_height`` piksel yüksekliğinde iki metin satırı ve tek piksellik bir çizgi içeren sayfa."""
+    image = np.full((height, width), 255, dtype=np.uint8)
+    image[10:10 + line_height] = 0
+    image[40:40 + line_height] = 0
+    image[80] = 0
+    return image
+
+
+def test_estimate_text_height():
+    assert estimate_text_height(np.full((50, 40), 255, dtype=np.uint8), PROBE_DPI) is None
+    assert estimate_text_height(_text_image(8), PROBE_DPI) == 8
+    # Aynı satırlar iki kat çözünürlükte yarı punto demektir
+    assert estimate_text_height(_text_image(16), 144) == 8
+
+
+def test_dpi_for_text_height():
+    assert dpi_for_text_height(None) == DEFAULT_DPI
+    # 24 piksel / 8 punto = 216 DPI, 25'in katına yuvarlanır
+    assert dpi_for_text_height(8) == 225
+    assert dpi_for_text_height(1) == MAX_DPI
+    assert dpi_for_text_height(100) == MIN_DPI
+
+
+def test_auto_dpi_is_chosen_per_page_as_pages_are_consumed(monkeypatch):
+    line_heights = {0: 8, 1: 8, 2: 6, 3: 6}
+    events = []
+
+    def render_runs(pdf_path, runs, gray):
+        for first, last, dpi in runs:
+            events.append(('open', first, last, dpi))
+            try:
+                for page_num in range(first, last + 1):
+                    events.append(('page', page_num, dpi))
+                    image = _text_image(line_heights[page_num]) if dpi == PROBE_DPI else np.zeros((1, dpi))
+                    yield page_num, image
+            finally:
+                events.append(('close', first, dpi))
+
+    monkeypatch.setattr(pages, '_render_runs', render_runs)
+    rendered = pages.iter_pages('x.pdf', [0, 1, 2, 3], dpi='auto')
+    page_num, image = next(rendered)
+    # İlk sayfa yalnızca kendi ön görüntülemesinden sonra üretilir
+    assert (page_num, image.shape[1]) == (0, 225)
+    assert events == [('open', 0, 3, PROBE_DPI), ('page', 0, PROBE_DPI), ('open', 0, 3, 225), ('page', 0, 225)]
+    assert [(page_num, image.shape[1]) for page_num, image in rendered] == [(1, 225), (2, 300), (3, 300)]
+    # DPI değişince süreç kapatılıp yeni DPI'la kalan sayfalardan açılır
+    assert [event for event in events if event[0] != 'page'] == [
+        ('open', 0, 3, PROBE_DPI), ('open', 0, 3, 225), ('close', 0, 225), ('open', 2, 3, 300),
+        ('close', 0, PROBE_DPI), ('close', 2, 300)]
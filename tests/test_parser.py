@@ -0,0 +1,118 @@
+import pytest
+
+from benchmarks.bench_parser import LegacyParser
+from benchmarks.gazette import generate_corpus
+from ocr_engine.parser import format_page, parse_announcement, parse_persons, parse_text, split_announcements
+
+HEADER = "T.C. ANKARA TİCARET SİCİLİ MÜDÜRLÜĞÜ'NDEN\n"
+
+PAY_DEVRI = HEADER + """İlan Sıra No: 100001
+MERSİS No: 0123456789012345
+Ticaret Sicil No: 45678
+Ticaret Unvanı: ÖRNEK GIDA SANAYİ VE TİCARET
+LİMİTED ŞİRKETİ
+Adres: Merkez Mah. Çiçek Sok. No:5 ÇANKAYA / Ankara
+
+Tescil Edilen Hususlar: PAY DEVRİ
+Tescile Delil Olan Belgeler: Pay Devir Sözleşmesi
+Şirket Ortaklarından 123*****45 Kimlik Numaralı ALİ YILMAZ 2.500,00 TL sermaye karşılığı 100 adet payını \
+hukuki ve mali yükümlülükleri ile 456*****78 Kimlik Numaralı AYŞE KAYA'e devretmiştir.
+Yeni Ortaklık Yapısı:
+AYŞE KAYA : Beheri 25,00 Türk Lirası değerinde 100 adet paya karşılık gelen 2500,00 Türk Lirası
+"""
+
+KONKORDATO = HEADER + """İlan Sıra No: 100002
+MERSİS No: 1111111111111111
+Ticaret Sicil No: 99999
+Ticaret Unvanı: ATLAS ENERJİ ANONİM ŞİRKETİ
+Adres: Yeşilyurt Mah. İnönü Sok. No:1 MERKEZ / Ankara
+
+Tescil Edilen Hususlar: KONKORDATO
+3. ASLİYE HUKUK MAHKEMESİ'nin 01.02.2024 tarihli kararı ile şirket hakkında geçici mühlet verilmiştir.
+Başlangıç Tarihi: 01.02.2024
+Bitiş Tarihi: 01.05.2025
+321*****54 Kimlik No'lu, İZMİR adresinde ikamet eden, ZEYNEP ÇELİK; 01.05.2025 tarihine kadar \
+Konkordato Komiseri olarak atanmıştır.
+"""
+
+
+def _legacy(announcement):
+    """Eski ayrıştırıcının sonucu, iki kez verdiği uyruk önekli şahıslar tekilleştirilmiş olarak."""
+    data = LegacyParser().parse_announcement(announcement)
+    persons = []
+    for person in data.get('persons', []):
+        if person not in persons:
+            persons.append(person)
+    data['persons'] = persons
+    return data
+
+
+def _corpus_text(tmp_path, seed):
+    corpus = generate_corpus(str(tmp_path), page_count=3, columns=2, seed=seed)
+    return ''.join(format_page(page_num, text) for page_num, text in enumerate(corpus['reference_texts']))
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_matches_legacy_parser_on_synthetic_gazette(tmp_path, seed):
+    legacy = LegacyParser()
+    text = _corpus_text(tmp_path, seed)
+    announcements = split_announcements(text)
+    assert announcements == legacy.split_announcements(text)
+    assert len(announcements) > 5
+    for announcement in announcements:
+        assert parse_announcement(announcement) == _legacy(announcement)
+
+
+@pytest.mark.parametrize('text', [PAY_DEVRI, KONKORDATO], ids=['pay_devri', 'konkordato'])
+def test_matches_legacy_parser_on_fixtures(text):
+    assert parse_announcement(text) == _legacy(text)
+
+
+def test_fixture_fields():
+    data = parse_announcement(PAY_DEVRI)
+    assert data['city'] == 'ANKARA'
+    assert data['ilan_sira_no'] == '100001'
+    assert data['mersis_no'] == '0123456789012345'
+    assert data['ticaret_unvani'] == 'ÖRNEK GIDA SANAYİ VE TİCARET LİMİTED ŞİRKETİ'
+    assert data['pay_devri']['devir_eden_adi'] == 'ALİ YILMAZ'
+    assert data['pay_devri']['devir_alici_adi'] == 'AYŞE KAYA'
+    konkordato = parse_announcement(KONKORDATO)['konkordato']
+    assert konkordato['mahkeme_karari_tarihi'] == '01.02.2024'
+    assert konkordato['komiser_adi'] == 'ZEYNEP ÇELİK'
+
+
+def test_parse_text_splits_on_headers():
+    results = parse_text("önsöz\n" + PAY_DEVRI + "\n" + KONKORDATO)
+    assert [data['ilan_sira_no'] for data in results] == ['100001', '100002']
+
+
+# Eski ayrıştırıcıdan bilinçli farklar (bkz. ocr_engine/parser.py)
+
+CONSECUTIVE_CITIZENS = (
+    HEADER + "Tescil Edilen Hususlar: YÖNETİM\n"
+    "Türkiye Cumhuriyeti Uyruklu 123*****45 Kimlik No'lu, ANKARA adresinde ikamet eden, ALİ VELİ "
+    "Türkiye Cumhuriyeti Uyruklu 456*****78 Kimlik No'lu, İSTANBUL adresinde ikamet eden, AYŞE KAYA\n"
+)
+
+
+def test_consecutive_citizens_are_all_kept():
+    persons = parse_persons(CONSECUTIVE_CITIZENS)
+    assert [person['kimlik_no'] for person in persons] == ["123*****45 Kimlik No'lu", "456*****78 Kimlik No'lu"]
+    assert persons[1] == {'kimlik_no': "456*****78 Kimlik No'lu", 'adres': 'İSTANBUL', 'isim': 'AYŞE KAYA'}
+    # Eski ayrıştırıcı ikinci şahsı atlıyordu; ilk şahıs iki ayrıştırıcıda aynı
+    legacy_persons = LegacyParser().parse_persons(CONSECUTIVE_CITIZENS)
+    assert legacy_persons == persons[:1]
+
+
+def test_address_label_at_end_of_text_is_omitted():
+    text = HEADER + "Adres:"
+    assert 'adres' not in parse_announcement(text)
+    assert LegacyParser().parse_announcement(text)['adres'] == ':'
+
+
+def test_citizen_persons_are_listed_once():
+    persons = parse_announcement(CONSECUTIVE_CITIZENS + KONKORDATO[len(HEADER):])['persons']
+    assert len(persons) == len({tuple(sorted(person.items())) for person in persons}) == 3
+    assert persons[2]['isim'] == 'ZEYNEP ÇELİK'
+    legacy_persons = LegacyParser().parse_announcement(CONSECUTIVE_CITIZENS)['persons']
+    assert legacy_persons[0] == legacy_persons[1]
@@ -0,0 +1,214 @@
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ocr_engine import pipeline
+from ocr_engine.pipeline import PagePipeline
+
+PAGES = list(range(12))
+
+
+class Boom(Exception):
+    pass
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Aşama fonksiyonlarını sayfa numarasını görüntü genişliğinde taşıyan hafif sürümlerle değiştirir.
+
+    Çift sayfaların metin katmanı vardır; tekler görüntülenip OCR'dan geçer.
+    OCR rastgele bekleyerek sayfaları sırasız bitirir.
+    """
+    failures = {}
+    rendered = []
+
+    def fail(stage, page_num):
+        if failures.get(stage) == page_num:
+            raise Boom(f"{stage} {page_num}")
+
+    def page_text_layer(pdf_path, page_num):
+        fail('text_layer', page_num)
+        return f"metin {page_num}" if page_num % 2 == 0 else None
+
+    def iter_pages(pdf_path, page_nums, dpi):
+        for page_num in page_nums:
+            fail('rasterize', page_num)
+            rendered.append(page_num)
+            yield page_num, np.zeros((4, 10 + page_num), dtype=np.uint8)
+
+    def threshold_page(image, out=None):
+        if out is None:
+            return image
+        out[:] = image
+        return out
+
+    def split_into_columns(binary):
+        return [binary]
+
+    def detect_layout(binary):
+        return [(0, binary.shape[0], 0, binary.shape[1])]
+
+    def ocr_columns(columns, lang, engine, cache, two_tier, stats):
+        page_num = columns[0].shape[1] - 10
+        time.sleep(random.random() * 0.01)
+        fail('ocr', page_num)
+        return f"ocr {page_num}"
+
+    for name, function in (('page_text_layer', page_text_layer), ('iter_pages', iter_pages),
+                           ('threshold_page', threshold_page), ('split_into_columns', split_into_columns),
+                           ('detect_layout', detect_layout),
+                           ('ocr_columns', ocr_columns)):
+        monkeypatch.setattr(pipeline, name, function)
+    return failures, rendered
+
+
+def _pipeline_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('PagePipeline-')]
+
+
+def _expected(page_nums, mode='hybrid'):
+    return [(page_num, f"metin {page_num}", 'text') if mode == 'hybrid' and page_num % 2 == 0
+            else (page_num, f"ocr {page_num}", 'ocr') for page_num in page_nums]
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_pages_come_out_in_order(stages, workers):
+    _, rendered = stages
+    results = list(PagePipeline('x.pdf', PAGES, ocr_workers=workers, preprocess_workers=workers, queue_size=2))
+    assert results == _expected(PAGES)
+    assert rendered == [page_num for page_num in PAGES if page_num % 2]
+    assert not _pipeline_threads()
+
+
+def test_ocr_mode_and_page_subset(stages):
+    page_nums = [9, 3, 4, 5]
+    assert list(PagePipeline('x.pdf', page_nums, mode='ocr', ocr_workers=3)) == _expected(page_nums, 'ocr')
+
+
+@pytest.mark.parametrize('stage', ['text_layer', 'rasterize', 'ocr'])
+def test_stage_error_reaches_consumer(stages, stage):
+    failures, _ = stages
+    failures[stage] = 6 if stage == 'text_layer' else 7
+    results = []
+    with pytest.raises(Boom, match=stage):
+        for item in PagePipeline('x.pdf', PAGES, ocr_workers=3):
+            results.append(item)
+    # Hatadan önceki sayfalar sırasıyla verilmiştir; hat durur ve iş parçacıkları kapanır
+    assert results == _expected(PAGES)[:len(results)]
+    assert not _pipeline_threads()
+
+
+def test_memory_cap_bounds_pages_in_flight(stages):
+    page_pipeline = PagePipeline('x.pdf', PAGES, mode='ocr', ocr_workers=4, memory_cap=1)
+    assert list(page_pipeline) == _expected(PAGES, 'ocr')
+    # Tek başına sınırı aşan sayfa yalnızca hat boşken kabul edilir
+    assert page_pipeline.budget.peak == max(4 * (10 + page_num) * 2 for page_num in PAGES)
+    assert page_pipeline.budget.in_use == 0
+
+
+def test_abandoned_iteration_stops_threads(stages):
+    results = PagePipeline('x.pdf', PAGES, ocr_workers=2)
+    iterator = iter(results)
+    assert next(iterator) == _expected(PAGES)[0]
+    iterator.close()
+    assert not _pipeline_threads()
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="İşçi süreçler değiştirilmiş aşama fonksiyonlarını yalnızca fork ile devralır")
+def test_ocr_processes_use_shared_buffers(stages):
+    page_pipeline = PagePipeline('x.pdf', PAGES, ocr_workers=2, queue_size=1, ocr_processes=True)
+    assert list(page_pipeline) == _expected(PAGES)
+    count, shared_bytes, _, created, reused = page_pipeline.buffers.stats()
+    assert (count, shared_bytes) == (0, 0)
+    assert created <= 2 + 1 + 2 and created + reused == len(PAGES) // 2
+
+
+def test_batch_chunks_go_through_the_pipeline(stages, tmp_path):
+    from ocr_engine.batch import process_chunk
+    from ocr_engine.checkpoint import CheckpointStore
+
+    checkpoint_path = str(tmp_path / 'checkpoints.db')
+    pdf_path, results, cache_counts, _ = process_chunk('x.pdf', PAGES[3:9], checkpoint_path=checkpoint_path,
+                                                       pdf_hash='abc')
+    assert (pdf_path, results, cache_counts) == ('x.pdf', _expected(PAGES[3:9]), (0, 0))
+    store = CheckpointStore(checkpoint_path)
+    assert store.load_pages('abc') == {page_num: (text, source) for page_num, text, source in results}
+    store.close()
+    assert not _pipeline_threads()
+
+
+def test_failed_batch_leaves_no_partial_files(stages, monkeypatch, tmp_path):
+    from ocr_engine import batch
+
+    failures, _ = stages
+    failures['ocr'] = 9
+    monkeypatch.setattr(batch, 'count_pages', lambda pdf_path: len(PAGES))
+    monkeypatch.setattr(batch, 'file_hash', os.path.basename)
+    pdf_path = str(tmp_path / 'a.pdf')
+    export_path = str(tmp_path / 'ilanlar.jsonl')
+    with pytest.raises(Boom):
+        batch.run_batch([pdf_path], workers=1, chunk_size=4, db_path=str(tmp_path / 'ilanlar.db'),
+                        export_path=export_path, log=lambda message: None)
+    assert sorted(os.listdir(tmp_path)) == ['ilanlar.db']
+    assert not [thread for thread in threading.enumerate() if thread.name == 'DatabaseWriter']
+
+
+def test_worker_module_does_not_import_numpy():
+    # İşçi süreç başlatılırken yalnızca batch yüklenir; NumPy ilk sayfa işlenirken yüklenir
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, ocr_engine.batch; print('numpy' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True,
+                          check=True).stdout.strip() == 'False'
+
+
+@pytest.mark.parametrize('mode', ['hybrid', 'ocr'])
+def test_hybrid_uses_text_layer_only_when_usable(stages, monkeypatch, mode):
+    from ocr_engine import textlayer
+
+    good = "İstanbul Ticaret Sicili Müdürlüğü'nden ilan olunur. " * 10
+    layers = {0: good, 1: '', 2: '|/ .; ,- ' * 40, 3: good}
+    calls = []
+
+    def extract_text_layer(pdf_path, page_num):
+        calls.append(page_num)
+        return layers[page_num]
+
+    monkeypatch.setattr(pipeline, 'page_text_layer', textlayer.page_text_layer)
+    monkeypatch.setattr(textlayer, 'extract_text_layer', extract_text_layer)
+    pages = list(PagePipeline('x.pdf', [0, 1, 2, 3], mode=mode))
+    if mode == 'hybrid':
+        assert [(page_num, source) for page_num, _, source in pages] == [
+            (0, 'text'), (1, 'ocr'), (2, 'ocr'), (3, 'text')]
+        assert pages[0][1] == good + '\n\n'
+        assert calls == [0, 1, 2, 3]
+    else:
+        assert [source for _, _, source in pages] == ['ocr'] * 4
+        assert calls == []
+
+
+def test_file_resources_split_workers_and_memory():
+    assert pipeline.file_resources(1, ocr_workers=8, memory_cap=800) == (8, 800, False)
+    assert pipeline.file_resources(0, ocr_workers=8, memory_cap=800) == (8, 800, False)
+    assert pipeline.file_resources(3, ocr_workers=8, memory_cap=900) == (2, 300, True)
+    assert pipeline.file_resources(16, ocr_workers=8, memory_cap=800) == (1, 50, True)
+
+
+def _omp_thread_limit():
+    return os.environ.get('OMP_THREAD_LIMIT')
+
+
+def test_thread_limit_is_set_only_in_ocr_workers(monkeypatch):
+    from concurrent.futures import ProcessPoolExecutor
+
+    monkeypatch.delenv('OMP_THREAD_LIMIT', raising=False)
+    with ProcessPoolExecutor(max_workers=1, initializer=pipeline._init_worker) as pool:
+        assert pool.submit(_omp_thread_limit).result() == '1'
+    assert 'OMP_THREAD_LIMIT' not in os.environ
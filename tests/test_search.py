@@ -0,0 +1,43 @@
+from ocr_engine.database import connect, write_announcements
+from ocr_engine.search import build_match_query, search
+
+
+def _database(tmp_path):
+    conn = connect(str(tmp_path / 'db.sqlite'))
+    write_announcements(conn, [
+        {'city': 'İSTANBUL', 'ilan_sira_no': '1', 'mersis_no': '0000000000000001',
+         'ticaret_unvani': 'IŞIK ÇİÇEKÇİLİK LİMİTED ŞİRKETİ', 'details': 'Şirketin ünvanı değiştirilmiştir.',
+         'persons': [{'kimlik_no': '1', 'isim': 'ŞÜKRÜ GÜNEŞ', 'adres': 'İSTANBUL'}]},
+        {'city': 'ANKARA', 'ilan_sira_no': '2', 'mersis_no': '0000000000000002',
+         'ticaret_unvani': 'ANKARA İNŞAAT ANONİM ŞİRKETİ', 'details': 'Ankara şubesinde sermaye artırımı tescil edilmiştir.',
+         'persons': [{'kimlik_no': '2', 'isim': 'AYŞE YILMAZ', 'adres': 'ANKARA'}]},
+    ])
+    return conn
+
+
+def test_match_query_folds_turkish_and_uses_prefixes():
+    assert build_match_query('Işık  Çiçek-') == '"isik"* "cicek"*'
+    assert build_match_query(' -- ') == ''
+
+
+def test_search_each_kind_without_diacritics(tmp_path):
+    conn = _database(tmp_path)
+    companies = search(conn, 'isik cicek', kind='companies')
+    assert [(row['kind'], row['key']) for row in companies] == [('companies', '0000000000000001')]
+    persons = search(conn, 'sukru', kind='persons')
+    assert [(row['key'], row['ticaret_unvani']) for row in persons] == [('ŞÜKRÜ GÜNEŞ', 'IŞIK ÇİÇEKÇİLİK LİMİTED ŞİRKETİ')]
+    announcements = search(conn, 'SERMAYE', kind='announcements')
+    assert [row['key'] for row in announcements] == ['2']
+    assert '[sermaye]' in announcements[0]['snippet']
+    conn.close()
+
+
+def test_search_all_merges_kinds_and_applies_limit(tmp_path):
+    conn = _database(tmp_path)
+    rows = search(conn, 'ankara', limit=10)
+    assert {row['kind'] for row in rows} == {'announcements', 'companies'}
+    assert [row['score'] for row in rows] == sorted(row['score'] for row in rows)
+    assert len(search(conn, 'ankara', limit=1)) == 1
+    assert search(conn, 'bulunmayan') == []
+    assert search(conn, '') == []
+    conn.close()
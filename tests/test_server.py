@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from ocr_engine import server
+from ocr_engine.server import JobServer
+
+PDF = b'%PDF-1.4 deneme'
+
+
+async def request(port, method, target, body=None, headers=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    headers = dict(headers or {})
+    if body is not None:
+        headers.setdefault('Content-Length', str(len(body)))
+    head = f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n"
+    head += ''.join(f"{key}: {value}\r\n" for key, value in headers.items()) + "\r\n"
+    writer.write(head.encode('latin-1') + (body or b''))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, payload = response.partition(b'\r\n\r\n')
+    return int(status_line.split()[1]), json.loads(payload)
+
+
+def run_server(monkeypatch, tmp_path, scenario, **options):
+    """Sunucuyu gerçek dönüştürme yerine ``release`` olayını bekleyen sahte bir akışla çalıştırır."""
+    release = threading.Event()
+
+    def convert_pdf(pdf_path, save=None, progress=None, **kwargs):
+        progress(0, 1, 2)
+        if not release.wait(10):
+            raise RuntimeError('test zaman aşımı')
+        with open(pdf_path, 'rb') as f:
+            if f.read().endswith(b'bozuk'):
+                raise ValueError('bozuk PDF')
+        save([{'ilan_sira_no': '1', 'ticaret_unvani': 'DENEME LİMİTED ŞİRKETİ'}])
+        return pdf_path + '.txt', 2, 1
+
+    monkeypatch.setattr(server, 'convert_pdf', convert_pdf)
+
+    async def main():
+        job_server = JobServer(port=0, jobs_dir=str(tmp_path / 'jobs'), log=lambda message: None, **options)
+        await job_server.start()
+        try:
+            await scenario(job_server.port, release)
+        finally:
+            release.set()
+            await job_server.close()
+
+    asyncio.run(main())
+
+
+async def wait_for_status(port, job_id, status):
+    for _ in range(200):
+        code, payload = await request(port, 'GET', f"/jobs/{job_id}")
+        assert code == 200
+        if payload['status'] == status:
+            return payload
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"iş {status} durumuna geçmedi: {payload}")
+
+
+def test_job_lifecycle(monkeypatch, tmp_path):
+    async def scenario(port, release):
+        code, payload = await request(port, 'POST', '/jobs?name=gazete.pdf', PDF)
+        assert code == 202
+        job_id = payload['job_id']
+        assert payload['announcements_url'] == f"/jobs/{job_id}/announcements"
+
+        running = await wait_for_status(port, job_id, 'running')
+        assert (running['name'], running['progress']) == ('gazete.pdf', 50)
+        code, payload = await request(port, 'GET', f"/jobs/{job_id}/announcements")
+        assert code == 409
+
+        release.set()
+        done = await wait_for_status(port, job_id, 'done')
+        assert (done['progress'], done['announcement_count']) == (100, 1)
+        code, payload = await request(port, 'GET', f"/jobs/{job_id}/announcements")
+        assert code == 200
+        assert payload['announcements'] == [{'ilan_sira_no': '1', 'ticaret_unvani': 'DENEME LİMİTED ŞİRKETİ'}]
+
+    run_server(monkeypatch, tmp_path, scenario)
+
+
+def test_failed_job_reports_error(monkeypatch, tmp_path):
+    async def scenario(port, release):
+        code, payload = await request(port, 'POST', '/jobs', PDF + b' bozuk')
+        assert code == 202
+        release.set()
+        failed = await wait_for_status(port, payload['job_id'], 'failed')
+        assert failed['error'] == 'bozuk PDF'
+        code, _ = await request(port, 'GET', f"/jobs/{payload['job_id']}/announcements")
+        assert code == 409
+
+    run_server(monkeypatch, tmp_path, scenario)
+
+
+def test_rejected_requests(monkeypatch, tmp_path):
+    async def scenario(port, release):
+        assert (await request(port, 'POST', '/jobs', b'duz metin'))[0] == 400
+        assert (await request(port, 'POST', '/jobs?mode=hizli', PDF))[0] == 400
+        assert (await request(port, 'POST', '/jobs'))[0] == 411
+        assert (await request(port, 'POST', '/jobs', PDF + b'x' * 64))[0] == 413
+        assert (await request(port, 'GET', '/jobs'))[0] == 405
+        assert (await request(port, 'GET', '/baska'))[0] == 404
+        assert (await request(port, 'GET', '/jobs/' + '0' * 32))[0] == 404
+        assert (await request(port, 'DELETE', '/jobs/' + '0' * 32))[0] == 405
+
+    run_server(monkeypatch, tmp_path, scenario, max_upload=64)
+
+
+def test_full_queue_is_rejected(monkeypatch, tmp_path):
+    async def scenario(port, release):
+        code, payload = await request(port, 'POST', '/jobs', PDF)
+        assert code == 202
+        await wait_for_status(port, payload['job_id'], 'running')
+        assert (await request(port, 'POST', '/jobs', PDF))[0] == 202
+        code, payload = await request(port, 'POST', '/jobs', PDF)
+        assert code == 503
+        assert 'error' in payload
+        # Reddedilen yükleme diske yazılmaz
+        assert len(list((tmp_path / 'jobs').iterdir())) == 2
+
+    run_server(monkeypatch, tmp_path, scenario, max_jobs=1, queue_size=1)
+
+
+def test_upload_is_removed_when_queue_fills_during_write(monkeypatch, tmp_path):
+    async def main():
+        job_server = JobServer(jobs_dir=str(tmp_path), queue_size=1, log=lambda message: None)
+        write_upload = job_server._write_upload
+
+        def fill_queue_while_writing(pdf_path, body):
+            write_upload(pdf_path, body)
+            job_server.queue.put_nowait(None)
+
+        monkeypatch.setattr(job_server, '_write_upload', fill_queue_while_writing)
+        with pytest.raises(server.HTTPError) as error:
+            await job_server.submit(PDF, 'a.pdf', 'hybrid')
+        assert error.value.status == 503
+        assert list(tmp_path.iterdir()) == []
+        assert job_server.jobs == {}
+
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from ocr_engine import shm
+from ocr_engine.shm import BUFFER_ALIGN, PageBufferPool, attach_page
+
+
+@pytest.fixture(autouse=True)
+def attachments():
+    yield shm._attached
+    for segment, _ in shm._attached.values():
+        segment.close()
+    shm._attached.clear()
+
+
+def _attach(page):
+    # Görünüm hemen bırakılır; bağlantı kapatılabilsin
+    return int(attach_page(page).sum())
+
+
+def test_pages_reuse_buffers_and_share_pixels():
+    with PageBufferPool(2) as pool:
+        page, view = pool.acquire((100, 200))
+        view[:] = 3
+        assert _attach(page) == 3 * 100 * 200
+        pool.release(page)
+        smaller, _ = pool.acquire((50, 50))
+        assert smaller.name == page.name
+        assert smaller.serial == page.serial + 1
+        count, total, peak, created, reused = pool.stats()
+        assert (count, total, created, reused) == (1, BUFFER_ALIGN, 1, 1)
+
+
+def test_replaced_segment_is_detached(attachments):
+    with PageBufferPool(1) as pool:
+        small, _ = pool.acquire((10, 10))
+        _attach(small)
+        pool.release(small)
+        # Sınırdayken yetmeyen bölüt silinip yerine büyüğü açılır
+        large, view = pool.acquire((BUFFER_ALIGN + 1, 1))
+        assert large.name != small.name and large.live == (large.name,)
+        _attach(large)
+        assert list(attachments) == [large.name]
+        pool.release(large)
+
+
+def test_newer_segment_survives_an_older_handle(attachments):
+    with PageBufferPool(2) as pool:
+        first, _ = pool.acquire((10, 10))
+        second, _ = pool.acquire((10, 10))
+        assert (first.live, second.live) == ((first.name,), (first.name, second.name))
+        # Sonra verilen tanıtıcı önce işlenir; eski tanıtıcı onun bölütünü kapatmaz
+        _attach(second)
+        _attach(first)
+        assert set(attachments) == {first.name, second.name}
+
+
+def test_attachments_are_bounded(monkeypatch, attachments):
+    monkeypatch.setattr(shm, 'MAX_ATTACHED', 2)
+    pools = [PageBufferPool(1) for _ in range(3)]
+    try:
+        # Havuz bilgisi taşımayan tanıtıcılarda yalnızca sayı sınırı uygulanır
+        pages = [pool.acquire((4, 4))[0]._replace(live=()) for pool in pools]
+        for page in pages:
+            np.testing.assert_array_equal(attach_page(page).shape, (4, 4))
+        assert list(attachments) == [page.name for page in pages[1:]]
+    finally:
+        for pool in pools:
+            pool.close()
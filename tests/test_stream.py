@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from benchmarks.gazette import generate_corpus
+from ocr_engine.parser import AnnouncementStream, format_page, parse_text
+
+SOURCE_FIELDS = ('page_start', 'page_end', 'source_hash', 'text_hash')
+
+
+@pytest.fixture(scope='module')
+def pages(tmp_path_factory):
+    corpus = generate_corpus(str(tmp_path_factory.mktemp('corpus')), page_count=4, columns=2, seed=3)
+    return corpus['reference_texts']
+
+
+def _strip_source(announcements):
+    return [{key: value for key, value in data.items() if key not in SOURCE_FIELDS} for data in announcements]
+
+
+def _stream(pages, order, **kwargs):
+    stream = AnnouncementStream(**kwargs)
+    announcements = []
+    for page_num in order:
+        announcements.extend(stream.add_page(page_num, pages[page_num]))
+    announcements.extend(stream.close())
+    return announcements
+
+
+def test_stream_matches_parse_text(pages):
+    written = []
+    announcements = _stream(pages, range(len(pages)), page_sink=written.append, source_hash='abc')
+    full_text = ''.join(format_page(page_num, text) for page_num, text in enumerate(pages))
+    assert ''.join(written) == full_text
+    assert _strip_source(announcements) == parse_text(full_text)
+    assert all(data['source_hash'] == 'abc' for data in announcements)
+
+
+def test_out_of_order_pages_give_same_result(pages):
+    order = list(range(len(pages)))
+    random.Random(0).shuffle(order)
+    assert _stream(pages, order) == _stream(pages, range(len(pages)))
+
+
+def test_announcements_complete_as_pages_arrive(pages):
+    stream = AnnouncementStream()
+    first = stream.add_page(0, pages[0])
+    # İlk sayfadaki, sonrasında başlık görülen ilanlar beklemeden çıkar
+    assert first
+    assert stream.add_page(2, pages[2]) == []
+    assert stream.add_page(1, pages[1])
+
+
+def test_page_ranges(pages):
+    announcements = _stream(pages, range(len(pages)))
+    for data in announcements:
+        assert 1 <= data['page_start'] <= data['page_end'] <= len(pages)
+        assert data['ilan_sira_no'] in pages[data['page_start'] - 1] or data['page_start'] < data['page_end']
+    # Sayfa sınırını aşan en az bir ilan var ve sayfalar sıralı
+    assert any(data['page_start'] < data['page_end'] for data in announcements)
+    starts = [data['page_start'] for data in announcements]
+    assert starts == sorted(starts)
@@ -0,0 +1,30 @@
+import pytest
+
+from ocr_engine import textlayer
+from ocr_engine.textlayer import MIN_TEXT_CHARS, is_usable_text, page_text_layer
+
+TURKISH = ("İstanbul Ticaret Sicili Müdürlüğü'nden: Şirketin yönetim kurulu üyeliğine "
+           "Ahmet Çelik seçilmiş, ortaklar kurulu kararıyla sermaye artırımı tescil edilmiştir. ") * 3
+
+
+@pytest.mark.parametrize('text, usable', [
+    ('', False),
+    (' \n\t\f ' * 100, False),
+    # Kısa ama düzgün metin: boş ya da neredeyse boş sayfa
+    ('Türkiye Ticaret Sicili Gazetesi', False),
+    # Taranmış sayfanın bozuk OCR katmanı: harf içermeyen glifler
+    ('|/ .; ,- )( 1 ~ ^ ` \' " ' * 40, False),
+    # Kodlanamayan karakterlerin oranı çok yüksek
+    (TURKISH[:MIN_TEXT_CHARS] + '�' * 10, False),
+    (TURKISH, True),
+    (TURKISH.upper(), True),
+])
+def test_is_usable_text(text, usable):
+    assert is_usable_text(text) is usable
+
+
+def test_page_text_layer_cleans_usable_text(monkeypatch):
+    layers = {0: TURKISH + '\x0c', 1: '\x0c'}
+    monkeypatch.setattr(textlayer, 'extract_text_layer', lambda pdf_path, page_num: layers[page_num])
+    assert page_text_layer('x.pdf', 0) == TURKISH + '\n\n'
+    assert page_text_layer('x.pdf', 1) is None
@@ -0,0 +1,54 @@
+import pytest
+
+from ocr_engine import watch
+
+
+class StopWatching(Exception):
+    pass
+
+
+def test_forgets_deleted_files_and_retries_them_when_they_return(monkeypatch, tmp_path):
+    folder = tmp_path / 'gelen'
+    folder.mkdir()
+    (folder / 'a.pdf').write_bytes(b'%PDF a')
+    (folder / 'b.pdf').write_bytes(b'%PDF b')
+    calls = []
+
+    def convert_pdf(pdf_path, **kwargs):
+        calls.append(pdf_path.rsplit('/', 1)[-1])
+        if pdf_path.endswith('b.pdf') and calls.count('b.pdf') == 1:
+            raise RuntimeError('bozuk sayfa')
+        return pdf_path + '.txt', 1, 0
+
+    # Her tarama arasındaki beklemede klasör değiştirilir
+    steps = [
+        lambda: None,
+        lambda: [(folder / name).unlink() for name in ('a.pdf', 'b.pdf')],
+        lambda: (folder / 'b.pdf').write_bytes(b'%PDF b'),
+        lambda: None,
+    ]
+
+    def sleep(interval):
+        if not steps:
+            raise StopWatching()
+        steps.pop(0)()
+
+    monkeypatch.setattr(watch, 'convert_pdf', convert_pdf)
+    monkeypatch.setattr(watch.time, 'sleep', sleep)
+    with pytest.raises(StopWatching):
+        watch.watch_folder(str(folder), db_path=str(tmp_path / 'db.sqlite'), log=lambda message: None)
+    # Hatalı b.pdf klasörde kaldığı sürece yeniden denenmez; silinip geri konunca yeniden işlenir
+    assert calls == ['a.pdf', 'b.pdf', 'b.pdf']
+
+
+def test_once_skips_processed_content_under_new_name(monkeypatch, tmp_path):
+    folder = tmp_path / 'gelen'
+    folder.mkdir()
+    (folder / 'a.pdf').write_bytes(b'%PDF a')
+    calls = []
+    monkeypatch.setattr(watch, 'convert_pdf', lambda pdf_path, **kwargs: calls.append(pdf_path) or ('', 1, 0))
+    db_path = str(tmp_path / 'db.sqlite')
+    assert watch.watch_folder(str(folder), db_path=db_path, once=True, log=lambda message: None) == 1
+    (folder / 'a.pdf').rename(folder / 'kopya.pdf')
+    assert watch.watch_folder(str(folder), db_path=db_path, once=True, log=lambda message: None) == 0
+    assert len(calls) == 1